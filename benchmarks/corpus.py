@@ -0,0 +1,450 @@
+# benchmarks/corpus.py
+
+"""
+Deterministic synthetic corpus of student submissions with known plagiarism.
+
+Run from the repository root to write a corpus to a directory:
+
+    python -m benchmarks.corpus /tmp/corpus --documents 200 --words 1500 --plagiarism-rate 0.3
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+FORMATS = ('txt', 'docx', 'pdf', 'code')
+FORMAT_EXTENSIONS = {'txt': '.txt', 'docx': '.docx', 'pdf': '.pdf', 'code': '.py'}
+
+SYLLABLES = (
+    "ka la ma na pa ra sa ta ba da ga ha ja ki li mi ni pi ri si ti bi di gi "
+    "ko lo mo no po ro so to bo do go ku lu mu nu pu ru su tu bu du gu en an in on un"
+).split()
+VOCABULARY_SIZE = 5000
+# Exponent of the Zipf distribution of the word frequencies
+ZIPF_EXPONENT = 1.1
+
+# Statements of the generated Python functions; {target} and {operand} are variables, {value} a constant
+CODE_STATEMENTS = (
+    "{target} = {operand} {operator} {value}",
+    "{target} = {target} {operator} {operand}",
+    "if {operand} {comparison} {value}:\n    {target} = {operand} {operator} {value}",
+    "if {target} {comparison} {operand}:\n    {target} = {value}\nelse:\n    {target} = {operand}",
+    "for {loop} in range({value}):\n    {target} = {target} {operator} {loop}",
+    "while {target} {comparison} {value}:\n    {target} = {target} {operator} {value}",
+    "{target} = [{loop} {operator} {value} for {loop} in range({operand})]",
+    "{target} = max({target}, {operand}, {value})",
+)
+CODE_OPERATORS = ('+', '-', '*', '//', '%')
+CODE_COMPARISONS = ('<', '>', '<=', '>=', '==', '!=')
+# Variables of a generated function: its parameters, locals and loop variable are placeholders {0} to {4}
+CODE_VARIABLES = 5
+# Approximate number of words (tokens) of a generated function
+CODE_FUNCTION_WORDS = 30
+
+PDF_LINE_CHARACTERS = 90
+PDF_LINES_PER_PAGE = 50
+
+class CorpusGenerator:
+    """
+    CorpusGenerator writes a reproducible corpus of text, DOCX, PDF and source code documents.
+
+    Words are drawn from a synthetic vocabulary with a Zipf distribution, so the word
+    frequencies look like natural language. A share of the documents (the plagiarism rate)
+    copies a contiguous block of sentences (or functions, for code) from an earlier document
+    of the same kind, with a few words substituted or identifiers renamed. The copied pairs
+    are listed in the manifest, so the detection rate of an engine can be checked. The same
+    seed always produces the same corpus.
+    """
+    def __init__(self, documents=100, words=1000, length_spread=0.5, plagiarism_rate=0.3, copy_ratio=0.6,
+                 edit_rate=0.05, formats=FORMATS, seed=0):
+        """
+        Initializes the CorpusGenerator.
+
+        Args:
+            documents (int, optional): Number of documents.
+            words (int, optional): Mean number of words of a document.
+            length_spread (float, optional): Relative spread of the document lengths around the mean,
+                e.g. 0.5 for lengths between 0.5 and 1.5 times the mean.
+            plagiarism_rate (float, optional): Share of the documents copied from an earlier document.
+            copy_ratio (float, optional): Share of the source document copied into a plagiarized document.
+            edit_rate (float, optional): Share of the copied words substituted by other words.
+            formats (tuple, optional): Formats of the documents, assigned in turn (see FORMATS).
+            seed (int, optional): Seed of the random generator.
+
+        Raises:
+            ValueError: If a format is not supported.
+        """
+        unknown = [name for name in formats if name not in FORMATS]
+        if unknown:
+            raise ValueError(f"Unsupported corpus formats: {', '.join(unknown)}")
+        self.documents = documents
+        self.words = words
+        self.length_spread = length_spread
+        self.plagiarism_rate = plagiarism_rate
+        self.copy_ratio = copy_ratio
+        self.edit_rate = edit_rate
+        self.formats = tuple(formats)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.vocabulary = self.build_vocabulary()
+        ranks = range(1, len(self.vocabulary) + 1)
+        self.cumulative_weights = list(itertools.accumulate(1 / rank ** ZIPF_EXPONENT for rank in ranks))
+
+    def build_vocabulary(self):
+        """
+        Builds a vocabulary of distinct pronounceable words.
+
+        Returns:
+            list: VOCABULARY_SIZE words, the most frequent first.
+        """
+        words = []
+        seen = set()
+        while len(words) < VOCABULARY_SIZE:
+            word = ''.join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(1, 4)))
+            if word not in seen:
+                seen.add(word)
+                words.append(word)
+        return words
+
+    def draw_words(self, count):
+        """
+        Draws words following the Zipf distribution of the vocabulary.
+
+        Args:
+            count (int): Number of words.
+
+        Returns:
+            list: The drawn words.
+        """
+        return self.rng.choices(self.vocabulary, cum_weights=self.cumulative_weights, k=count)
+
+    def sentences(self, words):
+        """
+        Generates sentences totalling about a number of words.
+
+        Args:
+            words (int): Number of words to generate.
+
+        Returns:
+            list: Sentences, each starting with a capital and ending with a period.
+        """
+        sentences = []
+        while words > 0:
+            length = min(words, self.rng.randint(6, 18))
+            sentence = self.draw_words(length)
+            sentences.append(' '.join(sentence).capitalize() + '.')
+            words -= length
+        return sentences
+
+    def functions(self, words):
+        """
+        Generates Python functions totalling about a number of words.
+
+        Each function is a random sequence of statements over a few variables, kept as a
+        template whose variables (the function name is {5}) can be renamed in copies.
+
+        Args:
+            words (int): Number of words to generate.
+
+        Returns:
+            list: (template, names) of each function, names holding the identifiers of the template placeholders.
+        """
+        functions = []
+        for _ in range(max(1, words // CODE_FUNCTION_WORDS)):
+            lines = ["def {5}({0}, {1}):", "    {2} = {0}", "    {3} = {1}"]
+            for _ in range(self.rng.randint(2, 5)):
+                statement = self.rng.choice(CODE_STATEMENTS).format(
+                    target=self.rng.choice(("{2}", "{3}")), operand=self.rng.choice(("{0}", "{1}", "{2}")),
+                    operator=self.rng.choice(CODE_OPERATORS), comparison=self.rng.choice(CODE_COMPARISONS),
+                    value=self.rng.randint(1, 999), loop="{4}"
+                )
+                lines.extend("    " + line for line in statement.split("\n"))
+            lines.append("    return {2}" if self.rng.random() < 0.5 else "    return {2} + {3}")
+            functions.append(("\n".join(lines) + "\n", self.identifiers()))
+        return functions
+
+    def identifiers(self):
+        """
+        Draws the identifiers of a function.
+
+        Returns:
+            list: CODE_VARIABLES distinct variable names followed by the function name.
+        """
+        names = []
+        while len(names) < CODE_VARIABLES + 1:
+            name = '_'.join(self.draw_words(2))
+            if name not in names:
+                names.append(name)
+        return names
+
+    def edit_sentence(self, sentence):
+        """
+        Substitutes a share (the edit rate) of the words of a copied sentence.
+
+        Args:
+            sentence (str): The sentence to copy.
+
+        Returns:
+            str: The edited copy.
+        """
+        words = sentence.rstrip('.').lower().split()
+        words = [self.draw_words(1)[0] if self.rng.random() < self.edit_rate else word for word in words]
+        return ' '.join(words).capitalize() + '.'
+
+    def rename_function(self, function):
+        """
+        Renames the identifiers of a copied function, keeping its structure and constants.
+
+        Args:
+            function (tuple): (template, names) of the function to copy.
+
+        Returns:
+            tuple: (template, names) of the renamed copy.
+        """
+        template, _ = function
+        return template, self.identifiers()
+
+    def copy_block(self, units, ratio):
+        """
+        Picks a contiguous block of sentences or functions.
+
+        Args:
+            units (list): Sentences or functions of the source document.
+            ratio (float): Share of the units to copy.
+
+        Returns:
+            list: The copied units.
+        """
+        count = min(len(units), max(1, round(len(units) * ratio)))
+        start = self.rng.randint(0, len(units) - count)
+        return units[start:start + count]
+
+    def generate(self, directory):
+        """
+        Writes the corpus and its manifest (manifest.json) to a directory.
+
+        Args:
+            directory (str): Directory of the corpus, created if needed.
+
+        Returns:
+            dict: The manifest, with the generator parameters, the "files" (path, format, words, source)
+                and the plagiarized "pairs" (indices of the source and the copy in "files").
+        """
+        os.makedirs(directory, exist_ok=True)
+        units_by_document, kinds, files, pairs = [], [], [], []
+        for index in range(self.documents):
+            output_format = self.formats[index % len(self.formats)]
+            kind = 'code' if output_format == 'code' else 'text'
+            words = max(10, round(self.words * self.rng.uniform(1 - self.length_spread, 1 + self.length_spread)))
+            generate_units = self.functions if kind == 'code' else self.sentences
+
+            sources = [previous for previous in range(index) if kinds[previous] == kind]
+            source = self.rng.choice(sources) if sources and self.rng.random() < self.plagiarism_rate else None
+            if source is None:
+                units = generate_units(words)
+            else:
+                copied = self.copy_block(units_by_document[source], self.copy_ratio)
+                edit = self.rename_function if kind == 'code' else self.edit_sentence
+                copied = [edit(unit) for unit in copied]
+                own = generate_units(max(10, words - round(words * self.copy_ratio)))
+                position = self.rng.randint(0, len(own))
+                units = own[:position] + copied + own[position:]
+                pairs.append((source, index))
+
+            units_by_document.append(units)
+            kinds.append(kind)
+            path = os.path.join(directory, f"doc{index:05d}{FORMAT_EXTENSIONS[output_format]}")
+            self.write(path, output_format, units)
+            files.append({"path": path, "format": output_format, "words": words, "source": source})
+
+        manifest = {
+            "parameters": {
+                "documents": self.documents, "words": self.words, "length_spread": self.length_spread,
+                "plagiarism_rate": self.plagiarism_rate, "copy_ratio": self.copy_ratio,
+                "edit_rate": self.edit_rate, "formats": list(self.formats), "seed": self.seed,
+            },
+            "files": files,
+            "pairs": pairs,
+        }
+        with open(os.path.join(directory, "manifest.json"), 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        return manifest
+
+    def write(self, path, output_format, units):
+        """
+        Writes a document in the given format.
+
+        Args:
+            path (str): Path of the file to write.
+            output_format (str): One of FORMATS.
+            units (list): Sentences, or (template, names) functions for code.
+        """
+        if output_format == 'code':
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('\n\n'.join(template.format(*names) for template, names in units))
+            return
+        paragraphs = [' '.join(units[start:start + 5]) for start in range(0, len(units), 5)]
+        if output_format == 'docx':
+            write_docx(path, paragraphs)
+        elif output_format == 'pdf':
+            write_pdf(path, paragraphs)
+        else:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('\n\n'.join(paragraphs))
+
+def write_docx(path, paragraphs):
+    """
+    Writes a minimal .docx package with one paragraph per text.
+
+    Args:
+        path (str): Path of the file to write.
+        paragraphs (list): Texts of the paragraphs.
+    """
+    body = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>' for text in paragraphs)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{body}</w:body></w:document>'
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    relationships = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', content_types)
+        package.writestr('_rels/.rels', relationships)
+        package.writestr('word/document.xml', document)
+
+def wrap_line(text, width):
+    """
+    Splits a text into lines of at most width characters, at word boundaries.
+
+    Args:
+        text (str): The text to split.
+        width (int): Maximum number of characters of a line.
+
+    Returns:
+        list: The lines.
+    """
+    lines, line = [], ''
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+def write_pdf(path, paragraphs):
+    """
+    Writes a minimal PDF file (Helvetica text, PDF_LINES_PER_PAGE lines per page).
+
+    Args:
+        path (str): Path of the file to write.
+        paragraphs (list): Texts of the paragraphs (ASCII).
+    """
+    lines = []
+    for text in paragraphs:
+        lines.extend(wrap_line(text, PDF_LINE_CHARACTERS))
+        lines.append('')
+    pages = [lines[start:start + PDF_LINES_PER_PAGE] for start in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    kids = ' '.join(f"{4 + 2 * index} 0 R" for index in range(len(pages)))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode('ascii'),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, page_lines in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * index} 0 R "
+            f"/Resources << /Font << /F1 3 0 R >> >> >>".encode('ascii')
+        )
+        commands = ["BT /F1 10 Tf 12 TL 50 750 Td"]
+        for line in page_lines:
+            escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            commands.append(f"({escaped}) Tj T*")
+        commands.append("ET")
+        stream = '\n'.join(commands).encode('ascii')
+        objects.append(b"<< /Length " + str(len(stream)).encode('ascii') + b" >>\nstream\n" + stream + b"\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, content in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode('ascii') + content + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('ascii')
+    output += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('ascii')
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('ascii')
+    with open(path, 'wb') as file:
+        file.write(output)
+
+def add_corpus_arguments(parser):
+    """
+    Adds the corpus generator options to an argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to extend.
+    """
+    parser.add_argument("--documents", type=int, default=100, help="Number of documents")
+    parser.add_argument("--words", type=int, default=1000, help="Mean number of words per document")
+    parser.add_argument("--length-spread", type=float, default=0.5, help="Relative spread of the document lengths")
+    parser.add_argument("--plagiarism-rate", type=float, default=0.3, help="Share of the documents copied from another one")
+    parser.add_argument("--copy-ratio", type=float, default=0.6, help="Share of the source copied into a plagiarized document")
+    parser.add_argument("--edit-rate", type=float, default=0.05, help="Share of the copied words substituted")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=FORMATS, help="Formats of the documents, assigned in turn")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator")
+
+def generator_from_arguments(args):
+    """
+    Builds a CorpusGenerator from the options added by add_corpus_arguments().
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Returns:
+        CorpusGenerator: The configured generator.
+    """
+    return CorpusGenerator(
+        documents=args.documents, words=args.words, length_spread=args.length_spread,
+        plagiarism_rate=args.plagiarism_rate, copy_ratio=args.copy_ratio, edit_rate=args.edit_rate,
+        formats=args.formats, seed=args.seed
+    )
+
+def main(argv=None):
+    """
+    Writes a corpus to the directory given on the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Default is sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Generates a synthetic corpus with known plagiarism")
+    parser.add_argument("directory", help="Directory to write the corpus to")
+    add_corpus_arguments(parser)
+    args = parser.parse_args(argv)
+    manifest = generator_from_arguments(args).generate(args.directory)
+    print(f"{len(manifest['files'])} documents, {len(manifest['pairs'])} plagiarized pairs written to {args.directory}")
+
+if __name__ == "__main__":
+    main()
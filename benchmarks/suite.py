@@ -0,0 +1,257 @@
+# benchmarks/suite.py
+
+"""
+Benchmark of every pipeline stage on a synthetic corpus, written to a JSON report.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --documents 200 --engines sequence winnowing tfidf --report report.json
+
+Reports of different commits (or engines) can be compared stage by stage.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.corpus import add_corpus_arguments, generator_from_arguments
+from controller.plagiarism_controller import PlagiarismController
+from model.file_reader import FileReader
+from model.similarity_engines import ENGINES
+from utils.constants import THRESHOLD_DEFAULT, MAX_REDUCTION_DEFAULT, ENGINE_DEFAULT
+from utils.localization import Localization
+
+REPORT_VERSION = 1
+
+def measure(function, trace_memory=True, reset=None):
+    """
+    Runs a stage and measures it. The stage runs a second time under tracemalloc for its peak
+    memory, since tracing slows it down. Memory allocated by worker processes is not traced.
+
+    Args:
+        function (callable): The stage, called without arguments.
+        trace_memory (bool, optional): Whether to measure the peak memory. Default is True.
+        reset (callable, optional): Called before each run, e.g. to clear the caches the stage fills,
+            so the traced run does the same work as the timed one. Default is None.
+
+    Returns:
+        tuple: (result, measures)
+            - result: The return value of the first run.
+            - measures (dict): "seconds" (wall time), "cpu_seconds" (CPU time of this process)
+              and "peak_mb" (peak traced allocations, None without tracing).
+    """
+    if reset is not None:
+        reset()
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    result = function()
+    measures = {
+        "seconds": time.perf_counter() - start_wall,
+        "cpu_seconds": time.process_time() - start_cpu,
+        "peak_mb": None,
+    }
+    if trace_memory:
+        if reset is not None:
+            reset()
+        tracemalloc.start()
+        try:
+            function()
+            measures["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return result, measures
+
+def stage_record(stage, measures, items, unit, **extra):
+    """
+    Builds the report entry of a stage.
+
+    Args:
+        stage (str): Name of the stage.
+        measures (dict): Measures returned by measure().
+        items (int): Number of items processed by the stage.
+        unit (str): What an item is, e.g. "documents" or "pairs".
+        **extra: Additional fields of the entry.
+
+    Returns:
+        dict: The entry, with the throughput (items per second) and the latency per item in milliseconds.
+    """
+    seconds = measures["seconds"]
+    record = {"stage": stage, "items": items, "unit": unit}
+    record.update(measures)
+    record["throughput"] = items / seconds if seconds > 0 else None
+    record["latency_ms"] = seconds * 1000 / items if items else None
+    record.update(extra)
+    return record
+
+def detection(similarity_matrix, pairs, threshold):
+    """
+    Compares the similarities of the known plagiarized pairs with those of the other pairs.
+
+    Args:
+        similarity_matrix (SimilarityMatrix): Similarities of the corpus documents, in manifest order.
+        pairs (list): (source, copy) document indices of the plagiarized pairs.
+        threshold (float): Similarity percentage from which a pair is flagged.
+
+    Returns:
+        dict: "recall" (share of the plagiarized pairs flagged), "false_positives" (other pairs flagged),
+            "plagiarized_mean" (mean similarity of the plagiarized pairs) and "other_max" (highest similarity
+            of the other pairs), None where there are no such pairs.
+    """
+    percentages = np.nan_to_num(similarity_matrix.percentages())
+    known = np.zeros(len(percentages), dtype=bool)
+    if pairs:
+        pairs = np.asarray(pairs, dtype=np.int64)
+        known[similarity_matrix.pair_index(pairs.min(axis=1), pairs.max(axis=1))] = True
+    flagged = percentages >= threshold
+    return {
+        "recall": float(flagged[known].mean()) if known.any() else None,
+        "false_positives": int((flagged & ~known).sum()),
+        "plagiarized_mean": float(percentages[known].mean()) if known.any() else None,
+        "other_max": float(percentages[~known].max()) if (~known).any() else None,
+    }
+
+def git_commit():
+    """
+    Returns the commit of the repository being benchmarked.
+
+    Returns:
+        str: The commit hash, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(args, directory):
+    """
+    Generates the corpus and benchmarks every stage.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments.
+        directory (str): Directory for the corpus and the exported results.
+
+    Returns:
+        dict: The report.
+    """
+    localization = Localization("en")
+    manifest = generator_from_arguments(args).generate(os.path.join(directory, "corpus"))
+    paths = [entry["path"] for entry in manifest["files"]]
+    trace_memory = not args.no_memory
+    stages = []
+
+    # Reading, without the extraction cache so every file is extracted
+    reader = FileReader(localization)
+    contents, measures = measure(lambda: {path: reader.read_file(path) for path in paths}, trace_memory)
+    size_mb = sum(os.path.getsize(path) for path in paths) / 2 ** 20
+    stages.append(stage_record("read", measures, len(paths), "documents", megabytes=size_mb))
+
+    pair_count = len(paths) * (len(paths) - 1) // 2
+    for engine in args.engines:
+        # A new controller per engine, and its featurizer cleared before every run of the stages that fill it,
+        # so no engine or run benefits from the featurization cached by another
+        controller = PlagiarismController(localization, cache_path=None)
+        for path, content in contents.items():
+            controller.files_content.add(path, content)
+        checker = controller.plagiarism_checker
+
+        (similarity_matrix, df_reduction), measures = measure(lambda: checker.process_plagiarism(
+            contents, args.threshold, args.max_reduction, use_candidates=args.candidates, engine=engine,
+            workers=args.workers, report_floor=args.report_floor if checker.supports_report_floor(engine) else None
+        ), trace_memory, controller.featurizer.clear)
+        stages.append(stage_record(
+            "score", measures, pair_count, "pairs", engine=engine,
+            **detection(similarity_matrix, manifest["pairs"], args.threshold)
+        ))
+
+        mapping, measures = measure(
+            lambda: controller.cluster_files_by_content(controller.files_content), trace_memory, controller.featurizer.clear
+        )
+        stages.append(stage_record("cluster", measures, len(paths), "documents", engine=engine))
+
+        _, measures = measure(lambda: similarity_matrix.to_frame(localization, mapping), trace_memory)
+        stages.append(stage_record("table", measures, pair_count, "rows", engine=engine))
+
+        output_file = os.path.join(directory, f"results_{engine}.xlsx")
+        error, measures = measure(
+            lambda: controller.save_results_to_excel(similarity_matrix, df_reduction.copy(), output_file, mapping), trace_memory
+        )
+        if error:
+            raise RuntimeError(f"Export failed: {error}")
+        stages.append(stage_record("export", measures, pair_count, "rows", engine=engine))
+
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "threshold": args.threshold, "max_reduction": args.max_reduction, "workers": args.workers,
+            "candidates": args.candidates, "report_floor": args.report_floor,
+        },
+        "corpus": dict(manifest["parameters"], pairs=pair_count, plagiarized_pairs=len(manifest["pairs"])),
+        "stages": stages,
+    }
+
+def print_report(report):
+    """
+    Prints the stages of a report as a table.
+
+    Args:
+        report (dict): Report returned by run_suite().
+    """
+    print(f"{'stage':8} {'engine':10} {'seconds':>9} {'cpu s':>9} {'items':>9} {'per second':>12} {'ms/item':>9} {'peak MB':>9}")
+    for record in report["stages"]:
+        peak = "-" if record["peak_mb"] is None else f"{record['peak_mb']:.1f}"
+        throughput = "-" if record["throughput"] is None else f"{record['throughput']:.1f}"
+        latency = "-" if record["latency_ms"] is None else f"{record['latency_ms']:.3f}"
+        print(
+            f"{record['stage']:8} {record.get('engine', ''):10} {record['seconds']:9.3f} {record['cpu_seconds']:9.3f} "
+            f"{record['items']:9} {throughput:>12} {latency:>9} {peak:>9}"
+        )
+
+def main(argv=None):
+    """
+    Runs the benchmark suite and writes its report.
+
+    Args:
+        argv (list, optional): Command-line arguments. Default is sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark of the plagiarism checking pipeline on a synthetic corpus")
+    add_corpus_arguments(parser)
+    parser.add_argument("--engines", nargs="+", default=[ENGINE_DEFAULT], choices=list(ENGINES), help="Similarity engines to benchmark")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD_DEFAULT, help="Similarity threshold (%%)")
+    parser.add_argument("--max-reduction", type=float, default=MAX_REDUCTION_DEFAULT, help="Maximum score deduction")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes used to score the pairs")
+    parser.add_argument("--report-floor", type=float, help="Minimum similarity (%%) worth an exact score, for the engines that support it")
+    parser.add_argument("--candidates", action="store_true", help="Skip unlikely pairs using MinHash/LSH")
+    parser.add_argument("--no-memory", action="store_true", help="Do not measure the peak memory (runs every stage once)")
+    parser.add_argument("--report", help="Path of the JSON report (default: printed only)")
+    parser.add_argument("--keep", help="Directory to keep the corpus and exported results in (default: a temporary directory)")
+    args = parser.parse_args(argv)
+
+    if args.keep:
+        report = run_suite(args, args.keep)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            report = run_suite(args, directory)
+
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+        print(f"Report written to {args.report}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
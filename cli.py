@@ -0,0 +1,129 @@
+# cli.py
+
+import argparse
+import glob
+import os
+import sys
+from controller.plagiarism_controller import PlagiarismController
+from model.result_export import EXPORT_FORMATS
+from model.similarity_engines import ENGINES
+from utils.constants import PROGRAMMING_EXTENSIONS, THRESHOLD_DEFAULT, MAX_REDUCTION_DEFAULT, ENGINE_DEFAULT, WORKERS_DEFAULT
+from utils.constants import PIPELINE_STAGES, EXTRACTION_CACHE_PATH
+from utils.localization import Localization
+from utils.stage_timer import PROFILERS, StageTimer, report_path
+
+# Extensions picked up when a directory is given as input
+SUPPORTED_EXTENSIONS = ['.txt', '.docx', '.pdf'] + PROGRAMMING_EXTENSIONS
+OUTPUT_FORMATS = list(EXPORT_FORMATS)
+
+def collect_files(inputs):
+    """
+    Expands the command-line inputs into a sorted list of file paths.
+
+    Args:
+        inputs (list): Directories (searched recursively for supported files), glob patterns or file paths.
+
+    Returns:
+        list: Unique file paths, sorted.
+    """
+    files = set()
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for root, _, names in os.walk(entry):
+                for name in names:
+                    if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                        files.add(os.path.join(root, name))
+        else:
+            files.update(path for path in glob.glob(entry, recursive=True) if os.path.isfile(path))
+    return sorted(files)
+
+def build_parser():
+    """
+    Builds the argument parser of the command-line interface.
+
+    Returns:
+        argparse.ArgumentParser: The configured parser.
+    """
+    parser = argparse.ArgumentParser(
+        description="Spark - Student Plagiarism Assignment Review Kit (headless batch mode)"
+    )
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns or files to compare")
+    parser.add_argument("-o", "--output", required=True,
+                        help="Path to the output file; rows are written unsorted as the pairs are scored, "
+                             "sorted by similarity only with --state")
+    parser.add_argument("-t", "--threshold", default=str(THRESHOLD_DEFAULT), help="Similarity threshold (%%)")
+    parser.add_argument("-r", "--max-reduction", default=str(MAX_REDUCTION_DEFAULT), help="Maximum score deduction")
+    parser.add_argument("-w", "--workers", default=str(WORKERS_DEFAULT), help="Number of worker processes used to score the pairs")
+    parser.add_argument("--report-floor", help="Minimum similarity (%%) worth an exact score; pairs that cannot reach it are pruned (sequence engine only)")
+    parser.add_argument("-e", "--engine", default=ENGINE_DEFAULT, choices=list(ENGINES), help="Similarity engine")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, help="Output format (default: taken from the output extension)")
+    parser.add_argument("--candidates", action="store_true", help="Skip unlikely pairs using MinHash/LSH")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=True,
+                        help="Reuse the texts extracted from PDF and DOCX files in earlier runs (default: %(default)s)")
+    parser.add_argument("--state", help="Run state file; unchanged files already in it are not compared again, new and changed files are scored "
+                             "and files no longer selected are removed from it")
+    parser.add_argument("--lang", default="en", choices=["en", "id"], help="Language of the messages and result columns")
+    parser.add_argument("--profile", choices=PROFILERS, help="Profile the stages with cProfile or tracemalloc (results in the timing report)")
+    parser.add_argument("--profile-stage", action="append", choices=PIPELINE_STAGES, help="Stage to profile (repeatable, default: every stage)")
+    return parser
+
+def main(argv=None):
+    """
+    Runs a plagiarism check from the command line without starting the GUI.
+
+    Args:
+        argv (list, optional): Command-line arguments. Default is sys.argv[1:].
+
+    Returns:
+        int: Exit status, 0 on success.
+    """
+    args = build_parser().parse_args(argv)
+    localization = Localization(args.lang)
+
+    output_format = args.format or os.path.splitext(args.output)[1].lstrip('.').lower()
+    if output_format not in OUTPUT_FORMATS:
+        print(localization.get("error_output_format").format(formats=", ".join(OUTPUT_FORMATS)), file=sys.stderr)
+        return 2
+
+    files = collect_files(args.inputs)
+    controller = PlagiarismController(localization, EXTRACTION_CACHE_PATH if args.cache else None)
+    stage_timer = StageTimer(args.profile, args.profile_stage)
+
+    try:
+        result, error = controller.run_plagiarism_process(
+            files, args.threshold, args.max_reduction, args.output,
+            use_candidates=args.candidates, engine=args.engine, workers_value=args.workers,
+            report_floor_value=args.report_floor, state_file=args.state, output_format=output_format,
+            stage_timer=stage_timer
+        )
+    except ValueError as e:
+        result, error = None, str(e)
+    if error:
+        print(localization.get(error), file=sys.stderr)
+        return 1
+
+    similarity_matrix, df_reduction, file_cluster_mapping, stage_timer = result
+    if similarity_matrix is not None:
+        # Runs with a state file keep their similarity matrix and are saved once complete
+        error = controller.save_results(similarity_matrix, df_reduction, args.output, file_cluster_mapping, output_format)
+        if error:
+            print(f"{localization.get('error_saving_file')} {localization.get(error)}", file=sys.stderr)
+            return 1
+
+    file_count = len(controller.files_content)
+    print(localization.get("cli_summary").format(files=len(files), pairs=file_count * (file_count - 1) // 2))
+    print(f"{localization.get('output_saved_successfully')} {args.output}")
+    for report in (controller.get_pruning_report(), controller.get_cache_report(), controller.get_state_report(), stage_timer.report(localization)):
+        if report:
+            print(report)
+
+    timing_file = report_path(args.output)
+    try:
+        stage_timer.write_json(timing_file)
+        print(f"{localization.get('timing_report_saved')} {timing_file}")
+    except OSError as e:
+        print(f"{localization.get('error_timing_report')} {e}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
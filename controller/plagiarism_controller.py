@@ -1,32 +1,118 @@
 # /controller/plagiarism_controller.py
 
+import hashlib
 import json
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from model.file_reader import FileReader
+from model.extraction_cache import ExtractionCache
+from model.file_ingestion import FileIngestor
+from model.document_featurizer import DocumentFeaturizer, pretokenized
+from model.document_store import DocumentStore
 from model.plagiarism_checker import PlagiarismChecker
+from model.result_export import ResultExporter, REDUCTION_KEYS, column_types, companion_path
+from model.run_state import RunState
+from model.similarity_engines import ENGINES
+from model.suffix_engine import SuffixAutomatonEngine
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-from utils.constants import THRESHOLD_DEFAULT, MAX_REDUCTION_DEFAULT
-from sklearn.cluster import KMeans
+from utils.constants import THRESHOLD_DEFAULT, MAX_REDUCTION_DEFAULT, ENGINE_DEFAULT, WORKERS_DEFAULT
+from utils.constants import EXTRACTION_CACHE_PATH, EXTRACTION_CACHE_MAX_BYTES, MATCH_BLOCK_CACHE_SIZE
+from utils.constants import CLUSTER_BATCH_SIZE, CLUSTER_MAX_FEATURES, LSH_BOUND_RATIO
+from utils.stage_timer import StageTimer
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import pairwise_distances_argmin
 import os
 
 class PlagiarismController:
     """
     PlagiarismController is responsible for handling the plagiarism checking process.
     """
-    def __init__(self, localization):
+    def __init__(self, localization, cache_path=EXTRACTION_CACHE_PATH):
         """
         PlagiarismController constructor that accepts a localization object for translating messages.
 
         Args:
             localization (object): Localization object for fetching localized messages.
+            cache_path (str, optional): Path of the extraction cache database, or None to read every file
+                without caching. Default is EXTRACTION_CACHE_PATH.
         """
         self.localization = localization
-        self.file_reader = FileReader(self.localization)
-        self.plagiarism_checker = PlagiarismChecker(self.localization)
-        self.files_content = {}
+        self.extraction_cache = self.open_extraction_cache(cache_path)
+        self.file_reader = FileReader(self.localization, self.extraction_cache)
         self.indonesian_stop_words = self.load_indonesian_stop_words()
+        # Shared preprocessing of the documents, used by both the similarity engines and the clustering
+        self.featurizer = DocumentFeaturizer(ENGLISH_STOP_WORDS.union(self.indonesian_stop_words))
+        self.plagiarism_checker = PlagiarismChecker(self.localization, self.featurizer)
+        # Documents of the current run, texts spilled to disk and looked up by path, ID or basename
+        self.files_content = DocumentStore()
+        self.cluster_model = None
+        # Match blocks computed for the comparison window, keyed by the hashes of both contents (LRU order)
+        self.match_block_cache = OrderedDict()
+        self.match_block_lock = threading.Lock()
+        # Timings of the stages of the last run
+        self.stage_timer = None
+        # Whether the last run scored every pair again because its state had other scoring settings,
+        # and otherwise the number of files it added to, rescored in and removed from its state
+        self.state_reset = False
+        self.state_changes = None
+
+    def open_extraction_cache(self, cache_path):
+        """
+        Opens the persistent cache of extracted file texts.
+
+        Args:
+            cache_path (str): Path of the cache database, or None to disable the cache.
+
+        Returns:
+            ExtractionCache: The opened cache, or None if it is disabled or cannot be created (e.g. read-only home directory).
+        """
+        if cache_path is None:
+            return None
+        try:
+            return ExtractionCache(cache_path, EXTRACTION_CACHE_MAX_BYTES)
+        except (OSError, sqlite3.Error):
+            return None
+
+    def get_pruning_report(self):
+        """
+        Builds a message with the number of pairs each pruning tier eliminated in the last run.
+
+        Returns:
+            str: Localized pruning report, or an empty string if no reporting floor was used.
+        """
+        stats = self.plagiarism_checker.pruning_stats
+        if not stats:
+            return ""
+        return self.localization.get("pruning_report").format(**stats)
+
+    def get_state_report(self):
+        """
+        Builds a message with the changes the last run made to its run state.
+
+        Returns:
+            str: Localized state report, or an empty string if the run had no state to extend.
+        """
+        if self.state_reset:
+            return self.localization.get("state_reset_report")
+        if self.state_changes is None:
+            return ""
+        return self.localization.get("state_report").format(**self.state_changes)
+
+    def get_cache_report(self):
+        """
+        Builds a message with the extraction cache hits and misses of the last run.
+
+        Returns:
+            str: Localized cache report, or an empty string if the cache is disabled.
+        """
+        if self.extraction_cache is None:
+            return ""
+        return self.localization.get("cache_report").format(**self.extraction_cache.stats())
 
     def load_indonesian_stop_words(self):
         """
@@ -49,44 +135,132 @@ class PlagiarismController:
         except json.JSONDecodeError as e:
             raise ValueError(f"Error decoding JSON from stop words file: {e}")
 
-    def process_files(self, file_paths, threshold, max_reduction):
+    def process_files(self, file_paths, threshold, max_reduction, use_candidates=False, engine=ENGINE_DEFAULT, workers=WORKERS_DEFAULT, report_floor=None, keep_state=False, row_sink=None, stage_timer=None):
         """
         Processes the selected files for plagiarism checking.
+        The files are read concurrently by a FileIngestor and streamed to the plagiarism checker as they are ready.
+        The time spent waiting for the files is recorded as the "read" stage, the rest as the "score" stage.
 
         Args:
             file_paths (list): List of file paths to be processed.
             threshold (float): Minimum similarity percentage to trigger score reduction.
             max_reduction (float): Maximum allowed score reduction.
+            use_candidates (bool, optional): Whether to compare only the pairs found by the MinHash/LSH candidate stage.
+            engine (str, optional): Name of the similarity engine used to score the pairs.
+            workers (int, optional): Number of worker processes used to score the pairs.
+            report_floor (float, optional): Minimum similarity percentage worth an exact score.
+            keep_state (bool, optional): Whether the checker keeps a RunState so the run can be extended later.
+            row_sink (callable, optional): Function receiving the similarity rows in chunks as the pairs are scored,
+                instead of collecting them into a similarity matrix.
+            stage_timer (StageTimer, optional): Timer recording the stages. Default is a new StageTimer.
+                The timer is kept in self.stage_timer.
 
         Returns:
-            tuple: (df_similarity, df_reduction, error_files)
-                - df_similarity (pd.DataFrame): DataFrame containing similarity percentages between files.
+            tuple: (similarity_matrix, df_reduction, error_files)
+                - similarity_matrix (SimilarityMatrix): Similarities between files, or None with a row sink.
                 - df_reduction (pd.DataFrame): DataFrame containing the percentage of score reduction per file.
                 - error_files (dict): Dictionary containing files that failed to be processed along with their errors.
         """
-        self.files_content = {}
+        self.stage_timer = stage_timer = stage_timer if stage_timer is not None else StageTimer()
+        self.files_content.clear()
         error_files = {}
+        if self.extraction_cache is not None:
+            self.extraction_cache.reset_stats()
 
-        # Read all selected files
-        for path in file_paths:
-            try:
-                content = self.file_reader.read_file(path)
-                self.files_content[path] = content
-            except IOError as e:
-                error_files[path] = self.localization.get("file_read_error").format(path=path, error=str(e))
-
-        # Check if at least two files were successfully read
-        if len(self.files_content) < 2:
+        # Read the selected files and process plagiarism as they arrive
+        # (reading is listed before scoring in the timings, although it is timed within it)
+        stage_timer.record('read')
+        try:
+            with stage_timer.stage('score'):
+                similarity_matrix, df_reduction = self.plagiarism_checker.process_plagiarism(
+                    stage_timer.timed('read', self.read_files(file_paths, error_files)), threshold, max_reduction,
+                    use_candidates=use_candidates, engine=engine, workers=workers, report_floor=report_floor,
+                    keep_state=keep_state, row_sink=row_sink
+                )
+        except ValueError:
+            # Check if at least two files were successfully read
+            if len(self.files_content) >= 2:
+                raise
             if len(error_files) == len(file_paths):
                 raise ValueError(self.localization.get("all_files_failed"))
             raise ValueError(self.localization.get("two_files_required"))
 
-        # Process plagiarism using PlagiarismChecker
-        df_similarity, df_reduction = self.plagiarism_checker.process_plagiarism(
-            self.files_content, threshold, max_reduction
-        )
+        file_count = len(self.files_content)
+        stage_timer.count('score', file_count * (file_count - 1) // 2)
+        return similarity_matrix, df_reduction, error_files
 
-        return df_similarity, df_reduction, error_files
+    def extend_files(self, state, file_paths, threshold, max_reduction, workers=WORKERS_DEFAULT, stage_timer=None):
+        """
+        Adds new files to a previous run and scores only the pairs that involve them.
+        The stages are recorded as in process_files().
+
+        Args:
+            state (RunState): State of the previous run, updated in place.
+            file_paths (list): List of the new file paths.
+            threshold (float): Minimum similarity percentage to trigger score reduction.
+            max_reduction (float): Maximum allowed score reduction.
+            workers (int, optional): Number of worker processes used to score the pairs.
+            stage_timer (StageTimer, optional): Timer recording the stages. Default is a new StageTimer.
+                The timer is kept in self.stage_timer.
+
+        Returns:
+            tuple: (similarity_matrix, df_reduction, error_files) for all files of the run.
+        """
+        self.stage_timer = stage_timer = stage_timer if stage_timer is not None else StageTimer()
+        old_count = len(state.file_names)
+        self.files_content.clear()
+        for index, filename in enumerate(state.file_names):
+            self.files_content.add(filename, state.text(index))
+        error_files = {}
+        if self.extraction_cache is not None:
+            self.extraction_cache.reset_stats()
+
+        stage_timer.record('read')
+        with stage_timer.stage('score'):
+            similarity_matrix, df_reduction = self.plagiarism_checker.extend_plagiarism(
+                state, stage_timer.timed('read', self.read_files(file_paths, error_files)), threshold, max_reduction,
+                workers=workers
+            )
+        file_count = len(state.file_names)
+        stage_timer.count('score', file_count * (file_count - 1) // 2 - old_count * (old_count - 1) // 2)
+        return similarity_matrix, df_reduction, error_files
+
+    def hash_files(self, file_paths):
+        """
+        Hashes the content of files, so a run state can tell which of its files changed.
+
+        Args:
+            file_paths (list): List of file paths.
+
+        Returns:
+            dict: Hexadecimal SHA-256 digest of each file, None for a file that cannot be read.
+        """
+        hashes = {}
+        for path in file_paths:
+            try:
+                hashes[path] = ExtractionCache.file_hash(path)
+            except OSError:
+                hashes[path] = None
+        return hashes
+
+    def read_files(self, file_paths, error_files):
+        """
+        Streams the successfully read files while recording read errors.
+        Each file read is also added to the document store self.files_content.
+
+        Args:
+            file_paths (list): List of file paths to be read.
+            error_files (dict): Dictionary filled with the files that failed to be read along with their errors.
+
+        Yields:
+            tuple: (path, content) of every file read successfully, in input order.
+        """
+        for path, content, error in FileIngestor(self.file_reader).iter_files(file_paths):
+            if error is not None:
+                error_files[path] = self.localization.get("file_read_error").format(path=path, error=str(error))
+                continue
+            self.files_content.add(path, content)
+            yield path, content
 
     def get_file_content(self, filename):
         """
@@ -101,62 +275,196 @@ class PlagiarismController:
         Raises:
             KeyError: If the file is not found.
         """
-        # Search for the file by its basename
-        for path, content in self.files_content.items():
-            if os.path.basename(path) == filename:
-                return content
-        raise KeyError(self.localization.get("file_not_found").format(filename=filename))
+        try:
+            return self.files_content.by_basename(filename)
+        except KeyError:
+            raise KeyError(self.localization.get("file_not_found").format(filename=filename))
+
+    def get_match_blocks(self, file1, file2):
+        """
+        Retrieves the match blocks of a pair of files.
+
+        The blocks produced by the similarity engine are reused when available. Otherwise they are
+        computed from the file contents with the suffix automaton engine, which finds all maximal
+        shared substrings in linear time, and kept in a bounded LRU cache keyed by the hashes of
+        both contents. This method is safe to call from a background thread.
+
+        Args:
+            file1 (str): Name of the first file.
+            file2 (str): Name of the second file.
+
+        Returns:
+            list: Matched spans (start1, end1, start2, end2) in character offsets.
+        """
+        match_blocks = self.plagiarism_checker.match_blocks
+        if (file1, file2) in match_blocks:
+            return match_blocks[(file1, file2)]
+        if (file2, file1) in match_blocks:
+            return [(start1, end1, start2, end2) for start2, end2, start1, end1 in match_blocks[(file2, file1)]]
+
+        content1, content2 = self.get_file_content(file1), self.get_file_content(file2)
+        key = (self.content_hash(content1), self.content_hash(content2))
+        with self.match_block_lock:
+            if key in self.match_block_cache:
+                self.match_block_cache.move_to_end(key)
+                return self.match_block_cache[key]
+            if key[::-1] in self.match_block_cache:
+                self.match_block_cache.move_to_end(key[::-1])
+                return [(start1, end1, start2, end2) for start2, end2, start1, end1 in self.match_block_cache[key[::-1]]]
+
+        blocks = SuffixAutomatonEngine().matching_blocks(content1, content2)
+        with self.match_block_lock:
+            self.match_block_cache[key] = blocks
+            while len(self.match_block_cache) > MATCH_BLOCK_CACHE_SIZE:
+                self.match_block_cache.popitem(last=False)
+        return blocks
+
+    @staticmethod
+    def content_hash(content):
+        """
+        Computes the SHA-256 hash of a file content.
+
+        Args:
+            content (str): The file content.
+
+        Returns:
+            str: Hexadecimal digest of the content.
+        """
+        return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
 
     def cluster_files_by_content(self, files_content, n_clusters=5):
         """
         Clusters files based on their content.
 
+        The terms of each file (words without English and Indonesian stop words) come from the
+        shared DocumentFeaturizer, so files already processed are not tokenized again.
+        Corpora up to CLUSTER_BATCH_SIZE files are clustered with KMeans over their full TF-IDF
+        vocabulary. Larger corpora are clustered with MiniBatchKMeans, which keeps the memory used
+        per iteration bounded by the batch size, over a vocabulary capped at CLUSTER_MAX_FEATURES
+        terms and stored as float32.
+
         Args:
-            files_content (dict): Dictionary containing file paths and their content.
+            files_content (Mapping): Mapping of file paths to their content, e.g. the DocumentStore of the run.
             n_clusters (int): The desired number of clusters.
 
         Returns:
             dict: Mapping of the file basename to the cluster number.
         """
-        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-
-        # Menggabungkan stop words Bahasa Inggris dan Bahasa Indonesia
-        combined_stop_words = list(ENGLISH_STOP_WORDS.union(self.indonesian_stop_words))
-
-        # Langkah 1: Vectorize the content of each file menggunakan TF-IDF dengan stop words gabungan
-        vectorizer = TfidfVectorizer(stop_words=combined_stop_words)
+        # Langkah 1: Vectorize the terms of each file (tanpa stop words Bahasa Inggris dan Bahasa Indonesia) menggunakan TF-IDF
         file_paths = list(files_content.keys())  # Full file paths
-        contents = list(files_content.values())
+        large = len(file_paths) > CLUSTER_BATCH_SIZE
+        if large:
+            vectorizer = TfidfVectorizer(analyzer=pretokenized, max_features=CLUSTER_MAX_FEATURES, dtype=np.float32)
+        else:
+            vectorizer = TfidfVectorizer(analyzer=pretokenized)
+        contents = [self.featurizer.terms(content) for content in files_content.values()]
 
         # Mengonversi konten file menjadi representasi numerik
         tfidf_matrix = vectorizer.fit_transform(contents)
 
         # Langkah 2: Melakukan clustering dengan KMeans
-        unique_points = len(set(tuple(row.toarray()[0]) for row in tfidf_matrix))  # Number of unique points
+        unique_points = self.count_unique_rows(tfidf_matrix)  # Number of unique points
         if n_clusters > unique_points:
             n_clusters = unique_points
             
-        kmeans = KMeans(n_clusters=n_clusters, random_state=0)
+        if large:
+            kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=CLUSTER_BATCH_SIZE, random_state=0, n_init=3)
+        else:
+            kmeans = KMeans(n_clusters=n_clusters, random_state=0)
         kmeans.fit(tfidf_matrix)
+        # Kept as plain data, so it can be stored in a run state without pickling scikit-learn objects
+        self.cluster_model = {
+            "vocabulary": {term: int(index) for term, index in vectorizer.vocabulary_.items()},
+            "idf": vectorizer.idf_,
+            "centers": kmeans.cluster_centers_,
+        }
 
         # Langkah 3: Hasil clustering (basename file_name -> cluster_number)
         file_cluster_mapping = {os.path.basename(file_paths[i]): kmeans.labels_[i] for i in range(len(file_paths))}
 
         return file_cluster_mapping
+
+    @staticmethod
+    def count_unique_rows(matrix):
+        """
+        Counts the distinct rows of a sparse matrix by hashing their stored indices and values,
+        without converting any row to a dense array.
+
+        Args:
+            matrix (scipy.sparse.csr_matrix): The matrix whose rows are compared.
+
+        Returns:
+            int: Number of distinct rows.
+        """
+        matrix = matrix.tocsr()
+        matrix.sum_duplicates()
+        indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+        digests = set()
+        for row in range(matrix.shape[0]):
+            start, end = indptr[row], indptr[row + 1]
+            digest = hashlib.blake2b(indices[start:end].tobytes(), digest_size=16)
+            digest.update(data[start:end].tobytes())
+            digests.add(digest.digest())
+        return len(digests)
+
+    def assign_clusters(self, files_content, cluster_model):
+        """
+        Assigns files to the clusters of a previously fitted clustering model.
+
+        Args:
+            files_content (dict): Dictionary containing file paths and their content.
+            cluster_model (dict): TF-IDF "vocabulary" and "idf" weights and KMeans "centers" fitted by
+                cluster_files_by_content.
+
+        Returns:
+            dict: Mapping of the file basename to the cluster number.
+        """
+        if not files_content:
+            return {}
+        vectorizer = TfidfVectorizer(analyzer=pretokenized, vocabulary=cluster_model["vocabulary"], dtype=cluster_model["centers"].dtype)
+        vectorizer.idf_ = cluster_model["idf"]
+        # The nearest center, as KMeans.predict
+        labels = pairwise_distances_argmin(
+            vectorizer.transform([self.featurizer.terms(content) for content in files_content.values()]), cluster_model["centers"]
+        )
+        return {os.path.basename(path): label for path, label in zip(files_content.keys(), labels)}
     
-    def run_plagiarism_process(self, files, threshold_value, reduction_value, output_file):
+    def run_plagiarism_process(self, files, threshold_value, reduction_value, output_file, use_candidates=False, engine=ENGINE_DEFAULT, workers_value=None, report_floor_value=None, state_file=None, output_format=None, stage_timer=None):
         """
         Runs the plagiarism checking process with the selected files.
 
+        With a state file, the run is persisted so later runs with the same state file only
+        score the files that are not part of it yet against the files that are. The selected
+        files define the run: files of the state whose content changed are scored again, and
+        files no longer selected are removed from the state and the results. A state created
+        with other scoring settings is replaced by a full run.
+
+        With an output format and no state file, the results are exported while the pairs are
+        scored (see export_plagiarism_process()), and the similarity matrix of the result is None.
+
+        The wall time, CPU time and item count of each stage (reading, scoring, clustering, saving
+        the state, exporting) are recorded by a StageTimer returned with the result. Results saved
+        later with save_results() add their export to the same timer.
+
+        The document features cached by the featurizer are released at the end of the run.
+
         Args:
             files (list): List of file paths to be processed.
             threshold_value (str): Threshold value for similarity percentage.
             reduction_value (str): Maximum reduction value for score.
             output_file (str): Path to the output file.
+            use_candidates (bool, optional): Whether to compare only the pairs found by the MinHash/LSH candidate stage.
+            engine (str, optional): Name of the similarity engine used to score the pairs.
+            workers_value (str, optional): Number of worker processes used to score the pairs.
+            report_floor_value (str, optional): Minimum similarity percentage worth an exact score.
+            state_file (str, optional): Path to the run state file, created if it does not exist yet.
+            output_format (str, optional): Format to export the results to while they are computed, see EXPORT_FORMATS.
+            stage_timer (StageTimer, optional): Timer recording the stages, e.g. with a profiler.
+                Default is a new StageTimer.
 
         Returns:
             tuple: (result, error)
-                - result (tuple): Tuple containing the DataFrames and file-cluster mapping.
+                - result (tuple): (similarity_matrix, df_reduction, file_cluster_mapping, stage_timer).
                 - error (str): Error message if an error occurred.
         """
         try:
@@ -169,49 +477,267 @@ class PlagiarismController:
         except ValueError:
             return None, "error_max_reduction_number"
 
+        try:
+            workers = int(workers_value) if workers_value else WORKERS_DEFAULT
+        except ValueError:
+            return None, "error_workers_number"
+        if workers < 1:
+            return None, "error_workers_number"
+
+        try:
+            report_floor = float(report_floor_value) if report_floor_value else None
+        except ValueError:
+            return None, "error_report_floor_number"
+
+        state = None
+        self.state_reset = False
+        self.state_changes = None
+        if state_file and os.path.exists(state_file):
+            try:
+                state = RunState.load(state_file)
+            except (OSError, ValueError):
+                return None, "error_state_file"
+            if not state.matches(engine, use_candidates, report_floor, LSH_BOUND_RATIO, threshold):
+                # Pairs scored with other settings cannot be mixed with new ones: score every pair again
+                state = None
+                self.state_reset = True
+
         if not files or len(files) < 2:
             return None, "error_select_two_files"
         
         if not output_file:
             return None, "error_select_output"
 
-        # Plagiarism and clustering process
-        df_similarity, df_reduction, error_files = self.process_files(files, threshold, max_reduction)
+        if engine not in ENGINES:
+            return None, "error_unknown_engine"
+
+        if report_floor and not PlagiarismChecker.supports_report_floor(engine):
+            # The other engines have no bounds to prune with, so the floor would be silently ignored
+            return None, "error_report_floor_engine"
+
+        stage_timer = stage_timer if stage_timer is not None else StageTimer()
+        try:
+            if output_format is not None and not state_file:
+                return self.export_plagiarism_process(
+                    files, threshold, max_reduction, output_file, output_format, use_candidates, engine, workers, report_floor,
+                    stage_timer
+                )
+
+            # The selection defines the run: files that changed or are no longer selected leave the state,
+            # and the changed ones are scored again with the new files
+            file_hashes = {}
+            if state_file:
+                with stage_timer.stage('read'):
+                    file_hashes = self.hash_files(files)
+
+            # Plagiarism and clustering process
+            if state is not None:
+                changed = [path for path in state.file_names if path in file_hashes and state.file_hashes.get(path) != file_hashes[path]]
+                removed = [path for path in state.file_names if path not in file_hashes]
+                state.remove_documents(changed + removed)
+                known_files = set(state.file_names)
+                new_files = [path for path in files if path not in known_files]
+                self.state_changes = {"added": len(new_files) - len(changed), "rescored": len(changed), "removed": len(removed)}
+                similarity_matrix, df_reduction, error_files = self.extend_files(
+                    state, new_files, threshold, max_reduction, workers, stage_timer
+                )
+            else:
+                similarity_matrix, df_reduction, error_files = self.process_files(
+                    files, threshold, max_reduction, use_candidates, engine, workers, report_floor, keep_state=bool(state_file),
+                    stage_timer=stage_timer
+                )
+
+            if error_files:
+                error_messages = "\n".join([f"{os.path.basename(k)}: {v}" for k, v in error_files.items()])
+                return None, f"{self.localization.get('error_reading_files')}:\n{error_messages}"
+
+            files_content = self.files_content
+            if state is not None and state.cluster_model is not None:
+                # Keep the clusters of the previous run and only assign the new files to them
+                new_content = {path: files_content[path] for path in new_files if path in files_content}
+                with stage_timer.stage('cluster', len(new_content)):
+                    file_cluster_mapping = dict(state.file_cluster_mapping)
+                    file_cluster_mapping.update(self.assign_clusters(new_content, state.cluster_model))
+            else:
+                with stage_timer.stage('cluster', len(files_content)):
+                    file_cluster_mapping = self.cluster_files_by_content(files_content)
+
+            if state_file:
+                state = state if state is not None else self.plagiarism_checker.run_state
+                if state.cluster_model is None:
+                    state.cluster_model = self.cluster_model
+                state.file_cluster_mapping = file_cluster_mapping
+                state.file_hashes = {path: file_hashes.get(path) for path in state.file_names}
+                try:
+                    with stage_timer.stage('save_state', len(state.file_names)):
+                        state.save(state_file)
+                except OSError:
+                    return None, "error_state_file"
+
+            return (similarity_matrix, df_reduction, file_cluster_mapping, stage_timer), None
+        finally:
+            # The features of the documents are not needed once the run is scored and clustered
+            self.featurizer.clear()
+    
+    def export_plagiarism_process(self, files, threshold, max_reduction, output_file, output_format, use_candidates=False, engine=ENGINE_DEFAULT, workers=WORKERS_DEFAULT, report_floor=None, stage_timer=None):
+        """
+        Runs the plagiarism checking process and writes the similarity rows to the output file as the pairs are scored.
+
+        The rows are never collected into a DataFrame, so the memory used does not grow with the
+        number of pairs. The clusters are computed once all files are read, before the first rows
+        are written. If some files cannot be read, the output files are removed.
+
+        Args:
+            files (list): List of file paths to be processed.
+            threshold (float): Minimum similarity percentage to trigger score reduction.
+            max_reduction (float): Maximum allowed score reduction.
+            output_file (str): Path to the output file.
+            output_format (str): Output format, see EXPORT_FORMATS.
+            use_candidates (bool, optional): Whether to compare only the pairs found by the MinHash/LSH candidate stage.
+            engine (str, optional): Name of the similarity engine used to score the pairs.
+            workers (int, optional): Number of worker processes used to score the pairs.
+            report_floor (float, optional): Minimum similarity percentage worth an exact score.
+            stage_timer (StageTimer, optional): Timer recording the stages, the rows written being counted
+                in the "export" stage. Default is a new StageTimer.
+
+        Returns:
+            tuple: (result, error)
+                - result (tuple): (None, df_reduction, file_cluster_mapping, stage_timer), the similarity rows
+                  being in the output file.
+                - error (str): Error message if an error occurred.
+        """
+        # The status column is only needed when some pairs may not be scored, as in SimilarityMatrix.has_status()
+        with_status = use_candidates or bool(report_floor)
+        similarity_keys = ("file_1", "file_2", "similarity_percent", "status") if with_status else ("file_1", "file_2", "similarity_percent")
+        similarity_columns = [self.localization.get(key) for key in similarity_keys] + ['Cluster']
+        reduction_columns = [self.localization.get("file_name"), self.localization.get("score_reduction_percentage"), 'Cluster']
+        try:
+            exporter = ResultExporter(
+                output_file, output_format, similarity_columns, reduction_columns,
+                column_types(similarity_keys + ("cluster",)), column_types(REDUCTION_KEYS)
+            )
+        except ImportError:
+            return None, "error_parquet_unavailable"
+        except (OSError, ValueError) as e:
+            return None, str(e)
+
+        stage_timer = stage_timer if stage_timer is not None else StageTimer()
+        file_cluster_mapping = {}
+
+        def write_rows(similarities):
+            if not file_cluster_mapping:
+                # Every file has been read once the first rows are scored
+                with stage_timer.stage('cluster', len(self.files_content)):
+                    file_cluster_mapping.update(self.cluster_files_by_content(self.files_content))
+            with stage_timer.stage('export', len(similarities)):
+                exporter.write_similarity([
+                    (file1, file2, similarity, status)[:len(similarity_keys)] + (file_cluster_mapping.get(file1, 'N/A'),)
+                    for file1, file2, similarity, status in similarities
+                ])
+
+        try:
+            _, df_reduction, error_files = self.process_files(
+                files, threshold, max_reduction, use_candidates, engine, workers, report_floor, row_sink=write_rows,
+                stage_timer=stage_timer
+            )
+        except Exception:
+            self.discard_export(exporter)
+            raise
 
         if error_files:
+            self.discard_export(exporter)
             error_messages = "\n".join([f"{os.path.basename(k)}: {v}" for k, v in error_files.items()])
             return None, f"{self.localization.get('error_reading_files')}:\n{error_messages}"
 
-        files_content = self.files_content
-        file_cluster_mapping = self.cluster_files_by_content(files_content)
+        try:
+            with stage_timer.stage('export'):
+                df_reduction['Cluster'] = df_reduction[self.localization.get("file_name")].map(file_cluster_mapping)
+                exporter.write_frame('reduction', df_reduction)
+                exporter.close()
+        except Exception as e:
+            self.discard_export(exporter)
+            return None, str(e)
 
-        df_similarity['Cluster'] = df_similarity['File 1'].apply(lambda x: file_cluster_mapping.get(os.path.basename(x), 'N/A'))
+        return (None, df_reduction, file_cluster_mapping, stage_timer), None
 
-        return (df_similarity, df_reduction, file_cluster_mapping), None
-    
-    def save_results_to_excel(self, df_similarity, df_reduction, output_file, file_cluster_mapping):
+    @staticmethod
+    def discard_export(exporter):
         """
-        Saves the plagiarism checking results to an Excel file.
+        Closes an unfinished export without finishing it and removes the files it created.
+
+        Args:
+            exporter (ResultExporter): The export to discard.
+        """
+        paths = [exporter.output_file]
+        if exporter.output_format != 'xlsx':
+            paths.append(companion_path(exporter.output_file, 'score_deduction'))
+        try:
+            exporter.discard()
+        except Exception:
+            pass
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def save_results(self, similarity_matrix, df_reduction, output_file, file_cluster_mapping, output_format='xlsx'):
+        """
+        Saves the plagiarism checking results, writing the tables in chunks.
+
+        The similarity rows are built from the matrix one chunk at a time, highest similarity first,
+        so the whole similarity table never exists in memory. XLSX files hold both tables, the
+        similarity table being split across sheets when it exceeds Excel's row limit. CSV and
+        Parquet outputs write the score deduction table to a "_score_deduction" file next to the
+        output file. The time spent is recorded as the "export" stage of the last run's StageTimer.
 
         Args:
-            df_similarity (pd.DataFrame): DataFrame containing similarity percentages between files.
+            similarity_matrix (SimilarityMatrix): Similarities between files.
             df_reduction (pd.DataFrame): DataFrame containing score reduction percentages per file.
-            output_file (str): Path to the output Excel file.
+            output_file (str): Path to the output file.
             file_cluster_mapping (dict): Mapping of the file basename to the cluster number.
+            output_format (str, optional): Output format, see EXPORT_FORMATS. Default is "xlsx".
 
         Returns:
             str: Error message if an error occurred, otherwise None.
         """
+        exporter = None
         try:
-            if 'File Name' not in df_reduction.columns:
-                return None, "error_excel_result"
-            
-            df_reduction['Cluster'] = df_reduction['File Name'].map(file_cluster_mapping)
+            file_name_column = self.localization.get("file_name")
+            if file_name_column not in df_reduction.columns:
+                return "error_excel_result"
+
+            df_reduction['Cluster'] = df_reduction[file_name_column].map(file_cluster_mapping)
+
+            stage_timer = self.stage_timer if self.stage_timer is not None else StageTimer()
+            with stage_timer.stage('export', len(similarity_matrix)):
+                similarity_columns = similarity_matrix.columns(self.localization, cluster=True)
+                exporter = ResultExporter(
+                    output_file, output_format, similarity_columns, list(df_reduction.columns),
+                    column_types(similarity_matrix.column_keys(cluster=True)), column_types(REDUCTION_KEYS)
+                )
+                exporter.write_frame('reduction', df_reduction)
+                for chunk in similarity_matrix.iter_tables(self.localization, file_cluster_mapping):
+                    exporter.write_frame('similarity', chunk)
+                exporter.close()
 
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                df_reduction.to_excel(writer, sheet_name='Score Deduction', index=False)
-                df_similarity.to_excel(writer, sheet_name='Similarity', index=False)
-            
             return None
+        except ImportError:
+            return "error_parquet_unavailable"
         except Exception as e:
+            if exporter is not None:
+                self.discard_export(exporter)
             return str(e)
+
+    def save_results_to_excel(self, similarity_matrix, df_reduction, output_file, file_cluster_mapping):
+        """
+        Saves the plagiarism checking results to an Excel file.
+
+        Args:
+            similarity_matrix (SimilarityMatrix): Similarities between files.
+            df_reduction (pd.DataFrame): DataFrame containing score reduction percentages per file.
+            output_file (str): Path to the output Excel file.
+            file_cluster_mapping (dict): Mapping of the file basename to the cluster number.
+
+        Returns:
+            str: Error message if an error occurred, otherwise None.
+        """
+        return self.save_results(similarity_matrix, df_reduction, output_file, file_cluster_mapping, 'xlsx')
@@ -0,0 +1,257 @@
+# model/code_tokenizer.py
+
+import os
+import re
+import string
+import zlib
+import numpy as np
+from utils.constants import PROGRAMMING_EXTENSIONS
+
+C_KEYWORDS = {
+    'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do', 'double', 'else', 'enum', 'extern',
+    'float', 'for', 'goto', 'if', 'int', 'long', 'register', 'return', 'short', 'signed', 'sizeof', 'static',
+    'struct', 'switch', 'typedef', 'union', 'unsigned', 'void', 'volatile', 'while', 'include', 'define',
+}
+CPP_KEYWORDS = C_KEYWORDS | {
+    'bool', 'catch', 'class', 'delete', 'false', 'friend', 'inline', 'namespace', 'new', 'nullptr', 'operator',
+    'private', 'protected', 'public', 'template', 'this', 'throw', 'true', 'try', 'typename', 'using', 'virtual',
+}
+JAVA_KEYWORDS = {
+    'abstract', 'boolean', 'break', 'byte', 'case', 'catch', 'char', 'class', 'continue', 'default', 'do',
+    'double', 'else', 'extends', 'false', 'final', 'finally', 'float', 'for', 'if', 'implements', 'import',
+    'instanceof', 'int', 'interface', 'long', 'new', 'null', 'package', 'private', 'protected', 'public',
+    'return', 'short', 'static', 'super', 'switch', 'this', 'throw', 'throws', 'true', 'try', 'void', 'while',
+}
+JS_KEYWORDS = {
+    'async', 'await', 'break', 'case', 'catch', 'class', 'const', 'continue', 'default', 'delete', 'do', 'else',
+    'export', 'extends', 'false', 'finally', 'for', 'function', 'if', 'import', 'in', 'instanceof', 'let', 'new',
+    'null', 'of', 'return', 'super', 'switch', 'this', 'throw', 'true', 'try', 'typeof', 'undefined', 'var',
+    'while', 'yield',
+}
+PYTHON_KEYWORDS = {
+    'False', 'None', 'True', 'and', 'as', 'assert', 'async', 'await', 'break', 'class', 'continue', 'def', 'del',
+    'elif', 'else', 'except', 'finally', 'for', 'from', 'global', 'if', 'import', 'in', 'is', 'lambda',
+    'nonlocal', 'not', 'or', 'pass', 'raise', 'return', 'try', 'while', 'with', 'yield', 'self',
+}
+PHP_KEYWORDS = {
+    'array', 'as', 'break', 'case', 'catch', 'class', 'const', 'continue', 'default', 'do', 'echo', 'else',
+    'elseif', 'extends', 'false', 'for', 'foreach', 'function', 'if', 'include', 'new', 'null', 'private',
+    'protected', 'public', 'require', 'return', 'static', 'switch', 'this', 'true', 'try', 'while',
+}
+RUBY_KEYWORDS = {
+    'and', 'begin', 'break', 'case', 'class', 'def', 'do', 'else', 'elsif', 'end', 'ensure', 'false', 'for',
+    'if', 'in', 'module', 'next', 'nil', 'not', 'or', 'puts', 'rescue', 'return', 'self', 'then', 'true',
+    'unless', 'until', 'when', 'while', 'yield',
+}
+GO_KEYWORDS = {
+    'break', 'case', 'chan', 'const', 'continue', 'default', 'defer', 'else', 'false', 'for', 'func', 'go',
+    'goto', 'if', 'import', 'interface', 'map', 'nil', 'package', 'range', 'return', 'select', 'struct',
+    'switch', 'true', 'type', 'var',
+}
+RUST_KEYWORDS = {
+    'as', 'break', 'const', 'continue', 'crate', 'else', 'enum', 'false', 'fn', 'for', 'if', 'impl', 'in',
+    'let', 'loop', 'match', 'mod', 'move', 'mut', 'pub', 'ref', 'return', 'self', 'Self', 'static', 'struct',
+    'trait', 'true', 'type', 'use', 'where', 'while',
+}
+KOTLIN_KEYWORDS = {
+    'as', 'break', 'class', 'continue', 'do', 'else', 'false', 'for', 'fun', 'if', 'import', 'in', 'interface',
+    'is', 'null', 'object', 'package', 'return', 'super', 'this', 'throw', 'true', 'try', 'val', 'var', 'when',
+    'while',
+}
+SWIFT_KEYWORDS = {
+    'break', 'case', 'class', 'continue', 'default', 'defer', 'do', 'else', 'enum', 'extension', 'false', 'for',
+    'func', 'guard', 'if', 'import', 'in', 'let', 'nil', 'protocol', 'return', 'self', 'struct', 'switch',
+    'true', 'var', 'where', 'while',
+}
+SQL_KEYWORDS = {
+    'all', 'and', 'as', 'asc', 'by', 'create', 'delete', 'desc', 'distinct', 'drop', 'from', 'group', 'having',
+    'in', 'insert', 'into', 'is', 'join', 'key', 'left', 'like', 'limit', 'not', 'null', 'on', 'or', 'order',
+    'primary', 'right', 'select', 'set', 'table', 'union', 'update', 'values', 'where',
+}
+
+C_COMMENTS = (('//',), (('/*', '*/'),))
+
+# Comment syntax (line markers, block delimiters), keywords and keyword case sensitivity per extension
+LANGUAGES = {
+    '.c': C_COMMENTS + (C_KEYWORDS, True),
+    '.h': C_COMMENTS + (CPP_KEYWORDS, True),
+    '.cpp': C_COMMENTS + (CPP_KEYWORDS, True),
+    '.hpp': C_COMMENTS + (CPP_KEYWORDS, True),
+    '.java': C_COMMENTS + (JAVA_KEYWORDS, True),
+    '.js': C_COMMENTS + (JS_KEYWORDS, True),
+    '.go': C_COMMENTS + (GO_KEYWORDS, True),
+    '.rs': C_COMMENTS + (RUST_KEYWORDS, True),
+    '.kt': C_COMMENTS + (KOTLIN_KEYWORDS, True),
+    '.swift': C_COMMENTS + (SWIFT_KEYWORDS, True),
+    '.py': (('#',), (), PYTHON_KEYWORDS, True),
+    '.rb': (('#',), (('=begin', '=end'),), RUBY_KEYWORDS, True),
+    '.php': (('//', '#'), (('/*', '*/'),), PHP_KEYWORDS, False),
+    '.sql': (('--',), (('/*', '*/'),), SQL_KEYWORDS, False),
+    '.css': ((), (('/*', '*/'),), set(), True),
+    '.html': ((), (('<!--', '-->'),), set(), True),
+}
+
+# Multi-character operators, longest first so the lexer prefers them over their prefixes
+OPERATORS = [
+    '>>>=', '<<=', '>>=', '**=', '//=', '===', '!==', '...', '>>>', '<=>', '->', '=>', '::', '++', '--', '&&',
+    '||', '==', '!=', '<=', '>=', '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '<<', '>>', '**', '//', ':=',
+]
+
+IDENTIFIER, NUMBER, STRING = 'ID', 'NUM', 'STR'
+
+# Canonical tokens are rendered as CJK ideographs: one alphanumeric character per token
+TOKEN_CHAR_BASE = 0x4E00
+TOKEN_SPACE = 0x5200
+
+def _build_vocabulary():
+    """
+    Assigns a fixed id to every canonical token the lexer knows about.
+
+    Returns:
+        dict: Mapping of canonical token to its id.
+    """
+    keywords = set()
+    for _, _, language_keywords, case_sensitive in LANGUAGES.values():
+        keywords.update(language_keywords if case_sensitive else (keyword.lower() for keyword in language_keywords))
+    tokens = [IDENTIFIER, NUMBER, STRING] + sorted(keywords) + OPERATORS + list(string.punctuation)
+    vocabulary = {}
+    for token in tokens:
+        vocabulary.setdefault(token, len(vocabulary))
+    return vocabulary
+
+VOCABULARY = _build_vocabulary()
+
+class CodeTokenizer:
+    """
+    CodeTokenizer turns source code into a stream of canonical tokens.
+
+    Comments and whitespace are dropped, identifiers become ID, numbers NUM and string
+    literals STR, while keywords and operators are kept as they are. Renaming variables,
+    editing comments or reformatting the code therefore does not change the stream.
+    Streams are compact integer arrays with the character span of every token. They are
+    cached per document content by DocumentFeaturizer.
+    """
+    def __init__(self):
+        """
+        Initializes the CodeTokenizer. The lexer of each language is compiled on first use.
+        """
+        self.patterns = {}
+
+    @staticmethod
+    def is_code_file(filename):
+        """
+        Checks whether a file is a source code file, by its extension.
+
+        Args:
+            filename (str): Name or path of the file.
+
+        Returns:
+            bool: True if the extension is listed in PROGRAMMING_EXTENSIONS.
+        """
+        return os.path.splitext(filename)[1].lower() in PROGRAMMING_EXTENSIONS
+
+    def pattern(self, extension):
+        """
+        Builds (once) the lexer regular expression of a language.
+
+        Args:
+            extension (str): File extension of the language, e.g. '.py'.
+
+        Returns:
+            re.Pattern: Pattern whose named groups are comment, string, number, word and operator.
+        """
+        if extension not in self.patterns:
+            line_comments, block_comments, _, _ = LANGUAGES[extension]
+            comments = [re.escape(opening) + r'.*?' + re.escape(closing) for opening, closing in block_comments]
+            comments += [re.escape(marker) + r'[^\n]*' for marker in line_comments]
+            parts = []
+            if comments:
+                parts.append(r'(?P<comment>' + '|'.join(comments) + r')')
+            parts += [
+                r'(?P<string>"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`)',
+                r'(?P<number>\.?\d[\w.]*)',
+                r'(?P<word>[^\W\d][\w$]*|\$[\w$]*)',
+                r'(?P<operator>' + '|'.join(re.escape(operator) for operator in OPERATORS) + r'|[^\s\w])',
+            ]
+            self.patterns[extension] = re.compile('|'.join(parts), re.DOTALL)
+        return self.patterns[extension]
+
+    def tokenize(self, text, extension):
+        """
+        Converts source code into its canonical token stream.
+
+        Args:
+            text (str): The source code.
+            extension (str): File extension of the language, e.g. '.py'.
+
+        Returns:
+            dict: Token ids ("tokens", uint16) and the start and end offsets of every token in the text ("starts", "ends").
+        """
+        extension = extension.lower()
+        _, _, keywords, case_sensitive = LANGUAGES[extension]
+        tokens, starts, ends = [], [], []
+        for match in self.pattern(extension).finditer(text):
+            kind, value = match.lastgroup, match.group()
+            if kind == 'comment':
+                continue
+            if kind == 'string':
+                token = STRING
+            elif kind == 'number':
+                token = NUMBER
+            elif kind == 'word':
+                word = value if case_sensitive else value.lower()
+                token = word if word in keywords else IDENTIFIER
+            else:
+                token = value
+            tokens.append(self.token_id(token))
+            starts.append(match.start())
+            ends.append(match.end())
+
+        return {
+            "tokens": np.array(tokens, dtype=np.uint16),
+            "starts": np.array(starts, dtype=np.int32),
+            "ends": np.array(ends, dtype=np.int32),
+        }
+
+    @staticmethod
+    def token_id(token):
+        """
+        Returns the id of a canonical token. Tokens outside the vocabulary are hashed into the remaining ids.
+
+        Args:
+            token (str): Canonical token.
+
+        Returns:
+            int: Token id, below TOKEN_SPACE.
+        """
+        if token in VOCABULARY:
+            return VOCABULARY[token]
+        return len(VOCABULARY) + zlib.crc32(token.encode('utf-8')) % (TOKEN_SPACE - len(VOCABULARY))
+
+    @staticmethod
+    def token_text(stream):
+        """
+        Renders a token stream as a string with one character per token, so the text-based engines can compare it.
+
+        Args:
+            stream (dict): Token stream returned by tokenize().
+
+        Returns:
+            str: The token text.
+        """
+        return (stream["tokens"].astype(np.uint32) + TOKEN_CHAR_BASE).tobytes().decode('utf-32-le')
+
+    @staticmethod
+    def char_span(stream, start, end):
+        """
+        Converts a span of tokens into the matching span of the original text.
+
+        Args:
+            stream (dict): Token stream returned by tokenize().
+            start (int): Index of the first token.
+            end (int): Index after the last token, greater than start.
+
+        Returns:
+            tuple: (start, end) character offsets in the original text.
+        """
+        return int(stream["starts"][start]), int(stream["ends"][end - 1])
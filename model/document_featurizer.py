@@ -0,0 +1,249 @@
+# model/document_featurizer.py
+
+import hashlib
+import os
+import re
+import sys
+from collections import OrderedDict
+import numpy as np
+from model.code_tokenizer import CodeTokenizer
+from utils.constants import FEATURIZER_CACHE_MAX_BYTES
+
+# Same words as the default token pattern of scikit-learn's vectorizers, on lowercased text
+WORD_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+def pretokenized(document):
+    """
+    Analyzer for scikit-learn vectorizers whose documents are already lists of terms.
+
+    Args:
+        document (list): The terms of a document.
+
+    Returns:
+        list: The same terms.
+    """
+    return document
+
+def approximate_size(value):
+    """
+    Estimates the memory used by a cached feature.
+
+    Args:
+        value (object): A string, a list of strings, a numpy array or a dictionary of those.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value.values())
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+class FeatureCache:
+    """
+    FeatureCache is an LRU cache of per-document features computed on first use, keyed by
+    document index and bounded by the approximate size of the features it holds.
+
+    Scoring pairs tile by tile only touches the documents of two ranges at a time, so those
+    stay cached while the tile is scored and the memory used does not grow with the corpus.
+    """
+    def __init__(self, compute, max_bytes=FEATURIZER_CACHE_MAX_BYTES):
+        """
+        Initializes the FeatureCache.
+
+        Args:
+            compute (callable): Function returning the features of a document index.
+            max_bytes (int, optional): Approximate maximum size of the cached features. Default is FEATURIZER_CACHE_MAX_BYTES.
+        """
+        self.compute = compute
+        self.max_bytes = max_bytes
+        self.features = OrderedDict()
+        self.sizes = {}
+        self.cached_bytes = 0
+
+    def get(self, index):
+        """
+        Returns the features of a document, computing them on first use.
+
+        Args:
+            index (int): Index of the document.
+
+        Returns:
+            object: The features. The most recent ones are kept even if they alone exceed max_bytes.
+        """
+        if index in self.features:
+            self.features.move_to_end(index)
+            return self.features[index]
+        value = self.compute(index)
+        self.features[index] = value
+        self.sizes[index] = approximate_size(value)
+        self.cached_bytes += self.sizes[index]
+        while self.cached_bytes > self.max_bytes and len(self.features) > 1:
+            evicted, _ = self.features.popitem(last=False)
+            self.cached_bytes -= self.sizes.pop(evicted)
+        return value
+
+class DocumentFeaturizer:
+    """
+    DocumentFeaturizer is the single preprocessing stage shared by scoring and clustering.
+
+    Each document is normalized (lowercased, whitespace collapsed), split into words and
+    filtered from stop words, and source code files are turned into canonical token
+    streams. Features are computed on first use, so a run only pays for the features
+    its engines consume, and cached by the SHA-256 hash of the text so the stages of a
+    run share them. Callers needing several features of a document can hash it once with
+    document() and pass the entry to each feature method. The cache is an LRU bounded by
+    the approximate size of the features it holds, and is meant to be cleared at the end
+    of each run (see clear()).
+    """
+    def __init__(self, stop_words=(), max_bytes=FEATURIZER_CACHE_MAX_BYTES):
+        """
+        Initializes the DocumentFeaturizer.
+
+        Args:
+            stop_words (iterable, optional): Words removed from the terms. Built once into a set.
+            max_bytes (int, optional): Approximate maximum size of the cached features. Default is FEATURIZER_CACHE_MAX_BYTES.
+        """
+        self.stop_words = frozenset(stop_words)
+        self.max_bytes = max_bytes
+        self.code_tokenizer = CodeTokenizer()
+        self.cache = OrderedDict()
+        # Approximate size of the features of each cache entry, and of the whole cache
+        self.sizes = {}
+        self.cached_bytes = 0
+
+    def clear(self):
+        """
+        Drops every cached feature, e.g. once a run has used them.
+        """
+        self.cache.clear()
+        self.sizes.clear()
+        self.cached_bytes = 0
+
+    def document(self, text):
+        """
+        Returns the cache entry of a document, creating it on first use.
+
+        Args:
+            text (str): Content of the document.
+
+        Returns:
+            dict: The features computed so far, with at least the content "hash".
+        """
+        key = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        entry = {"hash": key}
+        self.cache[key] = entry
+        self.sizes[key] = 0
+        return entry
+
+    def store(self, entry, name, value):
+        """
+        Adds a feature to a cache entry, evicting the least recently used entries beyond the size bound.
+
+        Args:
+            entry (dict): Cache entry of the document, from document().
+            name (str): Name of the feature.
+            value (object): The feature.
+
+        Returns:
+            object: The value, which is returned even if its entry had to be evicted.
+        """
+        entry[name] = value
+        key = entry["hash"]
+        if self.cache.get(key) is not entry:
+            # The entry was evicted while the feature was computed
+            return value
+        size = approximate_size(value)
+        self.sizes[key] += size
+        self.cached_bytes += size
+        while self.cached_bytes > self.max_bytes and self.cache:
+            evicted, _ = self.cache.popitem(last=False)
+            self.cached_bytes -= self.sizes.pop(evicted)
+        return value
+
+    def content_hash(self, text):
+        """
+        Returns the SHA-256 hash of a document content.
+
+        Args:
+            text (str): Content of the document.
+
+        Returns:
+            str: Hexadecimal digest of the content.
+        """
+        return self.document(text)["hash"]
+
+    def normalized(self, text, entry=None):
+        """
+        Returns the normalized text of a document: lowercased, with runs of whitespace collapsed to one space.
+
+        Args:
+            text (str): Content of the document.
+            entry (dict, optional): Cache entry of the document, from document(), so the text is not hashed again.
+
+        Returns:
+            str: The normalized text.
+        """
+        entry = self.document(text) if entry is None else entry
+        if "normalized" not in entry:
+            return self.store(entry, "normalized", re.sub(r'\s+', ' ', text.lower()).strip())
+        return entry["normalized"]
+
+    def tokens(self, text, entry=None):
+        """
+        Returns the words of a document, lowercased, in order.
+
+        Args:
+            text (str): Content of the document.
+            entry (dict, optional): Cache entry of the document, from document(), so the text is not hashed again.
+
+        Returns:
+            list: The words of two or more word characters.
+        """
+        entry = self.document(text) if entry is None else entry
+        if "tokens" not in entry:
+            return self.store(entry, "tokens", WORD_PATTERN.findall(self.normalized(text, entry)))
+        return entry["tokens"]
+
+    def terms(self, text, entry=None):
+        """
+        Returns the words of a document without the stop words.
+
+        Args:
+            text (str): Content of the document.
+            entry (dict, optional): Cache entry of the document, from document(), so the text is not hashed again.
+
+        Returns:
+            list: The remaining words, in order.
+        """
+        entry = self.document(text) if entry is None else entry
+        if "terms" not in entry:
+            return self.store(entry, "terms", [token for token in self.tokens(text, entry) if token not in self.stop_words])
+        return entry["terms"]
+
+    def token_stream(self, text, filename, entry=None):
+        """
+        Returns the canonical token stream of a source code file.
+
+        Args:
+            text (str): Content of the document.
+            filename (str): Name or path of the file, whose extension selects the language.
+            entry (dict, optional): Cache entry of the document, from document(), so the text is not hashed again.
+
+        Returns:
+            dict: Token stream (see CodeTokenizer.tokenize), or None if the file is not a source code file.
+        """
+        if not CodeTokenizer.is_code_file(filename):
+            return None
+        extension = os.path.splitext(filename)[1].lower()
+        entry = self.document(text) if entry is None else entry
+        name = f"stream{extension}"
+        if name not in entry:
+            return self.store(entry, name, self.code_tokenizer.tokenize(text, extension))
+        return entry[name]
@@ -0,0 +1,156 @@
+# model/document_store.py
+
+import mmap
+import os
+import tempfile
+import threading
+from collections.abc import Mapping
+
+class DocumentStore(Mapping):
+    """
+    DocumentStore holds the documents of a run without keeping their texts in memory.
+
+    Each text is appended to an anonymous spill file as UTF-8 as soon as it is added, and
+    only its metadata (integer ID, path, basename, byte range) stays in memory. Texts are
+    decoded on demand from a memory map of the spill file, so the memory used by a large
+    batch is left to the operating system's page cache. Documents can be looked up by path
+    (as a read-only mapping), by integer ID or by basename, all in constant time.
+    """
+    def __init__(self):
+        """
+        Creates an empty store. The spill file is created with the first document.
+        """
+        self.paths = []
+        self.ranges = []
+        self.ids_by_path = {}
+        self.ids_by_basename = {}
+        self.spill_file = None
+        self.spill_size = 0
+        self.view = None
+        self.lock = threading.Lock()
+
+    def add(self, path, text):
+        """
+        Adds a document, replacing the text of a document already stored under the same path.
+
+        Args:
+            path (str): Full path of the document.
+            text (str): Content of the document.
+
+        Returns:
+            int: ID of the document.
+        """
+        data = text.encode('utf-8', 'surrogatepass')
+        with self.lock:
+            if self.spill_file is None:
+                self.spill_file = tempfile.TemporaryFile(prefix='spark-documents-')
+            self.spill_file.seek(self.spill_size)
+            self.spill_file.write(data)
+            text_range = (self.spill_size, self.spill_size + len(data))
+            self.spill_size += len(data)
+
+            doc_id = self.ids_by_path.get(path)
+            if doc_id is not None:
+                self.ranges[doc_id] = text_range
+                return doc_id
+            doc_id = len(self.paths)
+            self.paths.append(path)
+            self.ranges.append(text_range)
+            self.ids_by_path[path] = doc_id
+            # Like a scan in insertion order, a basename refers to the first document having it
+            self.ids_by_basename.setdefault(os.path.basename(path), doc_id)
+            return doc_id
+
+    def text(self, doc_id):
+        """
+        Returns the text of a document.
+
+        Args:
+            doc_id (int): ID of the document.
+
+        Returns:
+            str: Content of the document.
+        """
+        with self.lock:
+            start, end = self.ranges[doc_id]
+            if start == end:
+                return ""
+            if self.view is None or len(self.view) < end:
+                # The spill file grew since it was mapped
+                if self.view is not None:
+                    self.view.close()
+                self.spill_file.flush()
+                self.view = mmap.mmap(self.spill_file.fileno(), self.spill_size, access=mmap.ACCESS_READ)
+            data = self.view[start:end]
+            if hasattr(mmap, "MADV_DONTNEED"):
+                # The text was copied, so its pages no longer need to count in the resident memory of the process
+                page_start = start - start % mmap.PAGESIZE
+                self.view.madvise(mmap.MADV_DONTNEED, page_start, end - page_start)
+        return data.decode('utf-8', 'surrogatepass')
+
+    def id_of(self, path):
+        """
+        Returns the ID of a document.
+
+        Args:
+            path (str): Full path of the document.
+
+        Returns:
+            int: ID of the document.
+
+        Raises:
+            KeyError: If no document has this path.
+        """
+        return self.ids_by_path[path]
+
+    def path_of(self, doc_id):
+        """
+        Returns the path of a document.
+
+        Args:
+            doc_id (int): ID of the document.
+
+        Returns:
+            str: Full path of the document.
+        """
+        return self.paths[doc_id]
+
+    def by_basename(self, basename):
+        """
+        Returns the text of the document with the given file name.
+
+        Args:
+            basename (str): File name of the document, without its directory.
+
+        Returns:
+            str: Content of the document.
+
+        Raises:
+            KeyError: If no document has this file name.
+        """
+        return self.text(self.ids_by_basename[basename])
+
+    def __getitem__(self, path):
+        return self.text(self.ids_by_path[path])
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, path):
+        return path in self.ids_by_path
+
+    def clear(self):
+        """
+        Removes every document and releases the spill file.
+        """
+        with self.lock:
+            if self.view is not None:
+                self.view.close()
+            if self.spill_file is not None:
+                self.spill_file.close()
+            self.paths, self.ranges = [], []
+            self.ids_by_path, self.ids_by_basename = {}, {}
+            self.spill_file, self.spill_size, self.view = None, 0, None
@@ -0,0 +1,136 @@
+# model/docx_extraction.py
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+# WordprocessingML namespaces (transitional and strict)
+WORD_NAMESPACES = (
+    'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'http://purl.oclc.org/ooxml/wordprocessingml/main',
+)
+MARKUP_COMPATIBILITY_NAMESPACE = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+
+DOCUMENT_PART = 'word/document.xml'
+HEADER_PART = re.compile(r'word/header(\d*)\.xml$')
+FOOTER_PART = re.compile(r'word/footer(\d*)\.xml$')
+
+# Run content other than w:t, mapped to the text python-docx gives it
+RUN_CHARACTERS = {'tab': '\t', 'ptab': '\t', 'br': '\n', 'cr': '\n', 'noBreakHyphen': '-'}
+
+def _word_tags(local_name):
+    """
+    Returns the qualified tags of a WordprocessingML element in every supported namespace.
+
+    Args:
+        local_name (str): Name of the element without its namespace.
+
+    Returns:
+        frozenset: The '{namespace}name' tags.
+    """
+    return frozenset(f'{{{namespace}}}{local_name}' for namespace in WORD_NAMESPACES)
+
+PARAGRAPH_TAGS = _word_tags('p')
+TEXT_TAGS = _word_tags('t')
+CHARACTER_TAGS = {tag: text for local_name, text in RUN_CHARACTERS.items() for tag in _word_tags(local_name)}
+FALLBACK_TAG = f'{{{MARKUP_COMPATIBILITY_NAMESPACE}}}Fallback'
+
+def _numbered_parts(names, pattern):
+    """
+    Returns the names of the parts matching a pattern, sorted by their number.
+
+    Args:
+        names (list): Names of the entries of the package.
+        pattern (re.Pattern): Pattern with the part number as its first group.
+
+    Returns:
+        list: Matching part names, e.g. header1.xml before header2.xml and header10.xml.
+    """
+    numbered = []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            numbered.append((int(match.group(1) or 0), name))
+    return [name for _, name in sorted(numbered)]
+
+def iter_part_paragraphs(stream):
+    """
+    Streams the paragraph texts of a WordprocessingML part with an incremental parser.
+
+    Paragraphs are yielded in the order they end, so the paragraphs of a text box come
+    right before the paragraph anchoring it, and table cells come in reading order. Every
+    element is detached from the tree once it ends, so only the path of the elements being
+    parsed is kept in memory, and the fallback copy of alternate content (the legacy VML
+    version of a text box) is skipped.
+
+    Args:
+        stream (file): Binary stream of the XML part.
+
+    Yields:
+        str: The text of each paragraph.
+    """
+    # Elements being parsed, from the root to the current one
+    path = []
+    # Text of the paragraphs currently open; text box paragraphs nest inside another paragraph
+    open_paragraphs = []
+    fallback_depth = 0
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            path.append(element)
+            if tag == FALLBACK_TAG:
+                fallback_depth += 1
+            elif tag in PARAGRAPH_TAGS and not fallback_depth:
+                open_paragraphs.append([])
+            continue
+
+        path.pop()
+        if path:
+            # The element and its earlier siblings are finished
+            del path[-1][:]
+        if tag == FALLBACK_TAG:
+            fallback_depth -= 1
+        elif fallback_depth or not open_paragraphs:
+            continue
+        elif tag in TEXT_TAGS:
+            if element.text:
+                open_paragraphs[-1].append(element.text)
+        elif tag in CHARACTER_TAGS:
+            open_paragraphs[-1].append(CHARACTER_TAGS[tag])
+        elif tag in PARAGRAPH_TAGS:
+            yield ''.join(open_paragraphs.pop())
+
+def iter_docx_paragraphs(filepath):
+    """
+    Streams the paragraph texts of a .docx file: headers, then the body (with tables and
+    text boxes), then footers.
+
+    Args:
+        filepath (str): Full path to the .docx file.
+
+    Yields:
+        str: The text of each paragraph.
+
+    Raises:
+        zipfile.BadZipFile: If the file is not a zip archive.
+        KeyError: If the archive has no word/document.xml part.
+        xml.etree.ElementTree.ParseError: If a part is not well-formed XML.
+    """
+    with zipfile.ZipFile(filepath) as package:
+        names = package.namelist()
+        parts = _numbered_parts(names, HEADER_PART) + [DOCUMENT_PART] + _numbered_parts(names, FOOTER_PART)
+        for part in parts:
+            with package.open(part) as stream:
+                yield from iter_part_paragraphs(stream)
+
+def extract_docx_text(filepath):
+    """
+    Extracts the text of a .docx file, one line per paragraph.
+
+    Args:
+        filepath (str): Full path to the .docx file.
+
+    Returns:
+        str: The text of the document.
+    """
+    return '\n'.join(iter_docx_paragraphs(filepath))
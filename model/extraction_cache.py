@@ -0,0 +1,135 @@
+# model/extraction_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+class ExtractionCache:
+    """
+    ExtractionCache is a persistent, content-addressed store of extracted document texts.
+
+    Texts are stored as zlib-compressed blobs in a SQLite file, keyed by the hash of the
+    file content and the version of the reader that extracted them. The total size of the
+    stored blobs is capped, and the least recently used entries are evicted first.
+    """
+    def __init__(self, path, max_bytes):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            max_bytes (int): Maximum total size of the compressed texts kept in the cache.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self.connection.commit()
+
+    @staticmethod
+    def file_hash(filepath, chunk_size=1 << 20):
+        """
+        Computes the SHA-256 hash of a file's content.
+
+        Args:
+            filepath (str): Full path to the file.
+            chunk_size (int, optional): Number of bytes read at a time. Default is 1 MiB.
+
+        Returns:
+            str: Hexadecimal digest of the file content.
+        """
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Looks up a cached text and marks it as recently used.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            str: The cached text, or None if the key is not cached.
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.connection.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.connection.commit()
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def put(self, key, text):
+        """
+        Stores a text in the cache and evicts the least recently used entries above the size cap.
+
+        Args:
+            key (str): Cache key.
+            text (str): The text to store.
+        """
+        data = zlib.compress(text.encode('utf-8'))
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (key, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time())
+            )
+            self.evict()
+            self.connection.commit()
+
+    def evict(self):
+        """
+        Deletes the least recently used entries until the total size fits the cap.
+        Must be called with the lock held.
+        """
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.connection.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+
+    def reset_stats(self):
+        """
+        Resets the hit and miss counters.
+        """
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns the hit and miss counters since the last reset.
+
+        Returns:
+            dict: Dictionary with the number of cache hits and misses.
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        """
+        Closes the cache database.
+        """
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,109 @@
+# model/file_ingestion.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from model.file_reader import FileReader
+
+def _extract_in_process(localization, filepath):
+    """
+    Reads a document inside a worker process, without the extraction cache.
+
+    Args:
+        localization (object): Localization object for error messages.
+        filepath (str): Full path to the file to be read.
+
+    Returns:
+        str: The content of the file as a string.
+    """
+    return FileReader(localization).read_file(filepath)
+
+class FileIngestor:
+    """
+    FileIngestor reads a batch of files concurrently and streams their contents.
+
+    Plain text and code files are read on a thread pool. DOCX files, whose parsing is
+    CPU-bound, are extracted on a process pool after an extraction cache lookup. PDF
+    files are read on the thread pool too, their pages being extracted in worker
+    processes by the reader's PdfExtractor, which enforces per-file time and memory
+    limits. Results are yielded in the order of the input paths as soon as each one
+    (and every file before it) is ready, which keeps downstream processing deterministic.
+    """
+    def __init__(self, file_reader, workers=None):
+        """
+        Initializes the FileIngestor.
+
+        Args:
+            file_reader (FileReader): Reader used for the files, including its extraction cache.
+            workers (int, optional): Maximum number of worker processes for documents. Default is the CPU count.
+        """
+        self.file_reader = file_reader
+        self.workers = workers
+        self.processes = None
+
+    # Extensions extracted on the process pool; PDF files manage their own worker processes
+    process_extensions = ('.docx',)
+
+    def read(self, filepath):
+        """
+        Reads one file, offloading DOCX extraction to the process pool.
+
+        Args:
+            filepath (str): Full path to the file to be read.
+
+        Returns:
+            str: The content of the file as a string.
+
+        Raises:
+            IOError: If an error occurs while reading the file.
+        """
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext not in self.process_extensions:
+            return self.file_reader.read_file(filepath)
+
+        try:
+            key = self.file_reader.cache_key(filepath, ext)
+        except Exception as e:
+            raise IOError(self.file_reader.localization.get("file_read_error").format(path=filepath, error=str(e)))
+        if key is not None:
+            content = self.file_reader.cache.get(key)
+            if content is not None:
+                return content
+
+        try:
+            content = self.processes.submit(_extract_in_process, self.file_reader.localization, filepath).result()
+        except IOError:
+            raise
+        except Exception as e:
+            # e.g. a worker process that crashed while parsing the file
+            raise IOError(self.file_reader.localization.get("file_read_error").format(path=filepath, error=str(e)))
+        if key is not None:
+            self.file_reader.cache.put(key, content)
+        return content
+
+    def iter_files(self, file_paths):
+        """
+        Reads the files concurrently and yields them in input order.
+
+        Args:
+            file_paths (list): List of file paths to be read.
+
+        Yields:
+            tuple: (path, content, error) where either content or error (IOError) is None.
+        """
+        has_documents = any(os.path.splitext(path)[1].lower() in self.process_extensions for path in file_paths)
+        with ThreadPoolExecutor() as threads:
+            self.processes = ProcessPoolExecutor(max_workers=self.workers) if has_documents else None
+            futures = []
+            try:
+                futures = [threads.submit(self.read, path) for path in file_paths]
+                for path, future in zip(file_paths, futures):
+                    try:
+                        yield path, future.result(), None
+                    except IOError as e:
+                        yield path, None, e
+            finally:
+                for future in futures:
+                    future.cancel()
+                if self.processes is not None:
+                    self.processes.shutdown(cancel_futures=True)
+                    self.processes = None
@@ -1,24 +1,36 @@
 # model/file_reader.py
 
 import os
-from docx import Document
+import sqlite3
+import zlib
+from model.docx_extraction import extract_docx_text
+from model.pdf_extraction import PdfExtractor
 from utils.constants import PROGRAMMING_EXTENSIONS
-import pdfplumber
 
 class FileReader:
     """
     FileReader is responsible for reading files with different extensions and returning their content as a string.
     """
     programming_extensions = PROGRAMMING_EXTENSIONS
-
-    def __init__(self, localization):
+    # Extensions parsed by a document library, slow enough to be cached and extracted in worker processes
+    document_extensions = ('.docx', '.pdf')
+    # Bump whenever the extracted text of a format changes, so stale cache entries are not reused
+    reader_version = 3
+    # Errors of the extraction cache that fall back to extracting the file
+    cache_errors = (sqlite3.Error, OSError, zlib.error)
+
+    def __init__(self, localization, cache=None, pdf_extractor=None):
         """
         Initializes the FileReader with a localization object for error messages.
 
         Args:
             localization (object): Localization object to fetch localized messages.
+            cache (ExtractionCache, optional): Persistent cache of extracted texts. Default is None (no caching).
+            pdf_extractor (PdfExtractor, optional): Extractor of PDF texts. Default is a PdfExtractor with the default limits.
         """
         self.localization = localization
+        self.cache = cache
+        self.pdf_extractor = pdf_extractor if pdf_extractor is not None else PdfExtractor()
 
     def read_file(self, filepath):
         """
@@ -34,15 +46,59 @@ class FileReader:
             IOError: If an error occurs while reading the file.
         """
         ext = os.path.splitext(filepath)[1].lower()
+        # A broken cache only costs the extraction it would have saved, never the read itself
+        try:
+            key = self.cache_key(filepath, ext)
+            content = self.cache.get(key) if key is not None else None
+        except self.cache_errors:
+            key = content = None
+        if content is not None:
+            return content
+
         try:
-            if ext == '.docx':
-                return self.read_docx(filepath)
-            elif ext == '.pdf':
-                return self.read_pdf(filepath)
-            else:
-                return self.read_text(filepath)
+            content = self.extract(filepath, ext)
         except Exception as e:
-            raise IOError(self.localization.get("file_read_error").format(filepath=filepath, error=str(e)))
+            raise IOError(self.localization.get("file_read_error").format(path=filepath, error=str(e)))
+
+        if key is not None:
+            try:
+                self.cache.put(key, content)
+            except self.cache_errors:
+                pass
+        return content
+
+    def cache_key(self, filepath, ext):
+        """
+        Builds the extraction cache key of a file from its content hash and the reader version.
+
+        Args:
+            filepath (str): Full path to the file.
+            ext (str): Lowercase file extension, including the leading dot.
+
+        Returns:
+            str: The cache key, or None if the file is not cached.
+        """
+        if self.cache is None or ext not in self.document_extensions:
+            return None
+        return f"{self.cache.file_hash(filepath)}:{ext}:{self.reader_version}"
+
+    def extract(self, filepath, ext):
+        """
+        Extracts the text of a file with the reader matching its extension.
+
+        Args:
+            filepath (str): Full path to the file to be read.
+            ext (str): Lowercase file extension, including the leading dot.
+
+        Returns:
+            str: The content of the file as a string.
+        """
+        if ext == '.docx':
+            return self.read_docx(filepath)
+        elif ext == '.pdf':
+            return self.read_pdf(filepath)
+        else:
+            return self.read_text(filepath)
 
     def read_text(self, filepath):
         """
@@ -59,7 +115,8 @@ class FileReader:
 
     def read_docx(self, filepath):
         """
-        Reads a .docx file.
+        Reads a .docx file, including its tables, text boxes, headers and footers. The XML of the
+        document is streamed out of the archive instead of being loaded as an object model.
 
         Args:
             filepath (str): Full path to the .docx file.
@@ -67,26 +124,25 @@ class FileReader:
         Returns:
             str: The content of the .docx file.
         """
-        doc = Document(filepath)
-        return '\n'.join([para.text for para in doc.paragraphs])
+        return extract_docx_text(filepath)
 
     def read_pdf(self, filepath):
         """
-        Reads a .pdf file.
+        Reads a .pdf file. The pages are extracted in parallel worker processes, within the time
+        and memory limits of the PdfExtractor.
 
         Args:
             filepath (str): Full path to the .pdf file.
 
         Returns:
             str: The content of the .pdf file.
+
+        Raises:
+            IOError: If the extraction fails, takes too long or uses too much memory.
         """
-        text = ''
         try:
-            with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    extracted_text = page.extract_text()
-                    if extracted_text:
-                        text += extracted_text + '\n'
-        except Exception as e:
-            text = f"Error reading PDF file: {e}"
-        return text
+            return self.pdf_extractor.extract(filepath)
+        except TimeoutError:
+            raise IOError(self.localization.get("pdf_timeout").format(seconds=self.pdf_extractor.timeout))
+        except MemoryError:
+            raise IOError(self.localization.get("pdf_memory_limit"))
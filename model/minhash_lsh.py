@@ -0,0 +1,129 @@
+# model/minhash_lsh.py
+
+import re
+import zlib
+import numpy as np
+
+# Mersenne prime used for the universal hash family (a * x + b) mod p
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+class MinHashLSH:
+    """
+    MinHashLSH generates candidate pairs of likely-similar documents.
+
+    Each document is split into character shingles, summarised by a MinHash
+    signature, and the signatures are grouped into LSH bands. Only documents
+    that share at least one band bucket are reported as candidates, so the
+    expensive exact comparison can be limited to those pairs.
+    """
+    def __init__(self, num_perm=128, shingle_size=5, seed=1):
+        """
+        Initializes the MinHashLSH with the signature size and shingle length.
+
+        Args:
+            num_perm (int, optional): Number of hash permutations in each signature. Default is 128.
+            shingle_size (int, optional): Length of the character shingles. Default is 5.
+            seed (int, optional): Seed for the hash permutations, fixed for reproducible results. Default is 1.
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self.perm_a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.perm_b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def shingle(self, text, normalized=False):
+        """
+        Splits a text into a set of hashed character shingles.
+
+        The text is lowercased and whitespace is collapsed first, so formatting
+        changes do not affect the shingles.
+
+        Args:
+            text (str): The text to shingle.
+            normalized (bool, optional): Whether the text is already normalized, e.g. by DocumentFeaturizer.normalized().
+
+        Returns:
+            np.ndarray: Unique 32-bit shingle hashes.
+        """
+        if not normalized:
+            text = re.sub(r'\s+', ' ', text.lower()).strip()
+        k = self.shingle_size
+        if len(text) < k:
+            shingles = {text} if text else set()
+        else:
+            shingles = {text[i:i + k] for i in range(len(text) - k + 1)}
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+        return np.array(hashes, dtype=np.uint64)
+
+    def signature(self, text, normalized=False):
+        """
+        Computes the MinHash signature of a text.
+
+        Args:
+            text (str): The text to summarise.
+            normalized (bool, optional): Whether the text is already normalized, e.g. by DocumentFeaturizer.normalized().
+
+        Returns:
+            np.ndarray: Signature of length num_perm.
+        """
+        hashes = self.shingle(text, normalized)
+        if hashes.size == 0:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        permuted = (np.outer(hashes, self.perm_a) + self.perm_b) % np.uint64(MERSENNE_PRIME)
+        return (permuted & np.uint64(MAX_HASH)).min(axis=0)
+
+    def band_parameters(self, jaccard_bound):
+        """
+        Chooses the number of bands and rows per band for a Jaccard bound.
+
+        The LSH collision curve 1 - (1 - s^r)^b rises steeply around (1/b)^(1/r).
+        The configuration whose curve midpoint is closest to, but not above, the
+        requested bound is chosen, so pairs at the bound are unlikely to be missed.
+
+        Args:
+            jaccard_bound (float): Estimated Jaccard similarity (0.0 - 1.0) a pair needs to become a candidate.
+
+        Returns:
+            tuple: (bands, rows) where bands * rows <= num_perm.
+        """
+        best = (self.num_perm, 1)
+        best_distance = None
+        for rows in range(1, self.num_perm + 1):
+            bands = self.num_perm // rows
+            midpoint = (1.0 / bands) ** (1.0 / rows)
+            if midpoint > jaccard_bound:
+                continue
+            distance = jaccard_bound - midpoint
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (bands, rows), distance
+        return best
+
+    def candidate_pairs(self, signatures, jaccard_bound, new_from=0):
+        """
+        Finds candidate pairs of documents using LSH banding.
+
+        Args:
+            signatures (list): MinHash signatures, one per document.
+            jaccard_bound (float): Estimated Jaccard similarity (0.0 - 1.0) a pair needs to become a candidate.
+            new_from (int, optional): Only pairs whose second document is at this index or later are returned,
+                e.g. the pairs involving documents added to an existing run. Default is 0 (all pairs).
+
+        Returns:
+            set: Pairs of document indices (i, j) with i < j that share at least one band.
+        """
+        bands, rows = self.band_parameters(jaccard_bound)
+        candidates = set()
+        for band in range(bands):
+            buckets = {}
+            start = band * rows
+            for index, signature in enumerate(signatures):
+                key = signature[start:start + rows].tobytes()
+                buckets.setdefault(key, []).append(index)
+            for members in buckets.values():
+                for b in range(len(members) - 1, 0, -1):
+                    if members[b] < new_from:
+                        break
+                    for a in range(b):
+                        candidates.add((members[a], members[b]))
+        return candidates
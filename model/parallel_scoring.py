@@ -0,0 +1,171 @@
+# model/parallel_scoring.py
+
+import math
+import mmap
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from model.document_featurizer import FeatureCache
+from model.similarity_engines import get_engine
+from utils.constants import FEATURIZER_CACHE_MAX_BYTES
+
+# Per-process state of the scoring workers, set up once by _init_worker
+_worker_state = {}
+
+def _init_worker(corpus_path, offsets, engine_name, engine_options, max_bytes):
+    """
+    Initializes a scoring worker: maps the corpus file and creates the similarity engine.
+
+    Args:
+        corpus_path (str): Path to the file holding all document texts encoded as UTF-8.
+        offsets (list): (start, end) byte offsets of each document in the corpus file.
+        engine_name (str): Name of the similarity engine.
+        engine_options (dict): Keyword arguments passed to the engine constructor.
+        max_bytes (int): Approximate maximum size of the document features cached by the worker.
+    """
+    with open(corpus_path, 'rb') as corpus_file:
+        size = os.fstat(corpus_file.fileno()).st_size
+        corpus = mmap.mmap(corpus_file.fileno(), size, access=mmap.ACCESS_READ) if size else b''
+    _worker_state['corpus'] = corpus
+    _worker_state['offsets'] = offsets
+    _worker_state['engine'] = get_engine(engine_name, engine_options)
+    _worker_state['features'] = FeatureCache(_prepare_document, max_bytes)
+
+def _prepare_document(index):
+    """
+    Prepares the engine features of a document of the mapped corpus.
+
+    Args:
+        index (int): Index of the document in the corpus.
+
+    Returns:
+        object: Features produced by the engine's prepare() method.
+    """
+    start, end = _worker_state['offsets'][index]
+    return _worker_state['engine'].prepare(_worker_state['corpus'][start:end].decode('utf-8'))
+
+def _score_block(pairs):
+    """
+    Scores one block of document pairs inside a worker.
+
+    Args:
+        pairs (list): Pairs of document indices (i, j).
+
+    Returns:
+        tuple: (results, stats)
+            - results (list): (ratio, blocks) for every pair, in the same order.
+            - stats (dict): Counters recorded by the engine while scoring this block, if any.
+    """
+    engine, features = _worker_state['engine'], _worker_state['features']
+    results = [engine.compare(features.get(i), features.get(j)) for i, j in pairs]
+    stats = getattr(engine, 'stats', {})
+    block_stats = dict(stats)
+    for key in stats:
+        stats[key] = 0
+    return results, block_stats
+
+class ParallelScorer:
+    """
+    ParallelScorer scores document pairs across a pool of worker processes.
+
+    The document texts are written once to a memory-mapped corpus file that every
+    worker maps on start-up, so tasks only carry document indices. The pair matrix
+    is split into square tiles so that each task touches a bounded set of documents.
+    Each worker caches the features it prepares within its share of max_bytes.
+
+    The result of every pair is identical to the serial path, but the results come
+    grouped by tile rather than in the order of the pairs, so consumers that need an
+    order (e.g. a sorted table) must not rely on the order they arrive in.
+    """
+    def __init__(self, engine_name, workers, tile_size=None, engine_options=None, max_bytes=FEATURIZER_CACHE_MAX_BYTES):
+        """
+        Initializes the ParallelScorer.
+
+        Args:
+            engine_name (str): Name of the similarity engine.
+            workers (int): Number of worker processes.
+            tile_size (int, optional): Number of documents along each side of a tile of the pair matrix.
+                By default it is chosen so that every worker gets several tiles.
+            engine_options (dict, optional): Keyword arguments passed to the engine constructor in each worker.
+            max_bytes (int, optional): Approximate size of the document features cached by all workers together.
+                Default is FEATURIZER_CACHE_MAX_BYTES.
+        """
+        self.engine_name = engine_name
+        self.workers = workers
+        self.tile_size = tile_size
+        self.engine_options = engine_options
+        self.max_bytes = max_bytes
+        self.stats = {}
+
+    def split_into_tiles(self, pairs, document_count):
+        """
+        Groups pairs by the tile of the pair matrix they fall in.
+
+        Args:
+            pairs (list): Pairs of document indices (i, j).
+            document_count (int): Number of documents in the corpus.
+
+        Returns:
+            list: Blocks of pairs, each holding the pairs of one tile in their original order.
+        """
+        tile_size = self.tile_size
+        if tile_size is None:
+            # About four tiles per worker in the upper triangle of the pair matrix
+            tile_size = max(1, math.ceil(document_count / math.sqrt(8 * self.workers)))
+        tiles = {}
+        for i, j in pairs:
+            tiles.setdefault((i // tile_size, j // tile_size), []).append((i, j))
+        return list(tiles.values())
+
+    def score(self, texts, pairs):
+        """
+        Scores the given pairs of documents in parallel.
+
+        Args:
+            texts (list): Document texts, indexed by document index.
+            pairs (list): Pairs of document indices (i, j) to score.
+
+        Returns:
+            dict: Mapping of each pair (i, j) to its (ratio, blocks) result.
+                The engine counters summed over all workers are kept in self.stats.
+        """
+        return dict(self.iter_score(texts, pairs))
+
+    def iter_score(self, texts, pairs):
+        """
+        Scores the given pairs of documents in parallel, yielding the results one tile at a time.
+
+        Results are yielded as soon as their tile is scored, so the caller can consume them without
+        holding the results of the whole run.
+
+        Args:
+            texts (iterable): Document texts in document index order, read once.
+            pairs (list): Pairs of document indices (i, j) to score.
+
+        Yields:
+            tuple: (pair, result) with the pair (i, j) and its (ratio, blocks) result, grouped by tile.
+                The engine counters summed over all workers are kept in self.stats.
+        """
+        offsets = []
+        corpus_file = tempfile.NamedTemporaryFile(prefix='spark-corpus-', suffix='.bin', delete=False)
+        try:
+            with corpus_file:
+                position = 0
+                for text in texts:
+                    data = text.encode('utf-8')
+                    corpus_file.write(data)
+                    offsets.append((position, position + len(data)))
+                    position += len(data)
+
+            blocks = self.split_into_tiles(pairs, len(offsets))
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(corpus_file.name, offsets, self.engine_name, self.engine_options, self.max_bytes // self.workers)
+            ) as executor:
+                for block, (block_results, block_stats) in zip(blocks, executor.map(_score_block, blocks)):
+                    for key, value in block_stats.items():
+                        self.stats[key] = self.stats.get(key, 0) + value
+                    yield from zip(block, block_results)
+        finally:
+            os.remove(corpus_file.name)
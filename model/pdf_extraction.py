@@ -0,0 +1,238 @@
+# model/pdf_extraction.py
+
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing.connection import wait
+import pdfplumber
+from utils.constants import PDF_TIMEOUT_SECONDS, PDF_MEMORY_LIMIT_BYTES, PDF_PAGES_PER_TASK
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows: the memory limit is not enforced there
+    resource = None
+
+def _limit_memory(memory_limit):
+    """
+    Caps the address space of the current process to its current size plus memory_limit bytes.
+
+    Args:
+        memory_limit (int): Number of bytes the process may still allocate, or None for no limit.
+    """
+    if resource is None or not memory_limit:
+        return
+    try:
+        with open('/proc/self/statm') as statm:
+            used = int(statm.read().split()[0]) * mmap.PAGESIZE
+    except (OSError, ValueError):
+        used = 0
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = used + memory_limit
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+# Exit code of a worker that ran out of memory before it could report it
+_MEMORY_EXIT_CODE = 75
+
+def _is_memory_error(error):
+    """
+    Checks whether an exception is, or was raised while handling, a MemoryError.
+
+    Args:
+        error (BaseException): The exception raised by the parser.
+
+    Returns:
+        bool: True if a MemoryError is found in the exception chain.
+    """
+    while error is not None:
+        if isinstance(error, MemoryError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+def _extract_pages(connection, filepath, first, last, memory_limit):
+    """
+    Extracts the text of a range of pages inside a worker process and sends it back.
+
+    Args:
+        connection (multiprocessing.connection.Connection): Pipe to the parent process.
+        filepath (str): Full path to the .pdf file.
+        first (int): Index of the first page to extract.
+        last (int): Index after the last page to extract.
+        memory_limit (int): Number of bytes the worker may allocate, or None for no limit.
+    """
+    try:
+        _limit_memory(memory_limit)
+        with pdfplumber.open(filepath) as pdf:
+            page_count = len(pdf.pages)
+            texts = [pdf.pages[index].extract_text() or '' for index in range(first, min(last, page_count))]
+        result = ("ok", texts, page_count)
+    except Exception as e:
+        # pdfplumber may wrap a MemoryError in its own exception
+        result = ("memory", None, None) if _is_memory_error(e) else ("error", str(e), None)
+    # The result is sent once the exception and the parser objects it referenced are released
+    try:
+        connection.send(result)
+    except MemoryError:
+        os._exit(_MEMORY_EXIT_CODE)
+    finally:
+        connection.close()
+
+class PdfWorkerError(RuntimeError):
+    """
+    Raised when a PDF extraction process stops without sending its result, e.g. after a crash of the parser.
+    """
+
+class PdfExtractor:
+    """
+    PdfExtractor extracts the text of PDF files with their pages spread across worker processes.
+
+    Each task extracts a range of pages in its own process, so a parser crash or runaway
+    memory use only takes down that process. The first task also reports the page count,
+    after which the remaining ranges run in parallel. The number of running processes is
+    bounded across all files being extracted. Every file has a wall-clock deadline, which
+    starts once its first process gets a slot and is pushed back by the time the file
+    waits for a slot with none of its processes running, so time spent queued behind
+    other files does not count. The processes of a file that misses it are killed.
+    """
+    def __init__(self, workers=None, timeout=PDF_TIMEOUT_SECONDS, memory_limit=PDF_MEMORY_LIMIT_BYTES, pages_per_task=PDF_PAGES_PER_TASK):
+        """
+        Initializes the PdfExtractor.
+
+        Args:
+            workers (int, optional): Maximum number of extraction processes running at once. Default is the CPU count.
+            timeout (float, optional): Maximum extraction time of one file, in seconds. None for no limit.
+            memory_limit (int, optional): Maximum memory a process may allocate, in bytes (not enforced on Windows).
+                None for no limit.
+            pages_per_task (int, optional): Number of pages extracted by one process.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.pages_per_task = pages_per_task
+        self.slots = threading.BoundedSemaphore(self.workers)
+
+    def extract(self, filepath):
+        """
+        Extracts the text of a PDF file, one line break after the text of each page.
+
+        Args:
+            filepath (str): Full path to the .pdf file.
+
+        Returns:
+            str: The text of the pages that have any.
+
+        Raises:
+            TimeoutError: If the extraction takes longer than the timeout.
+            MemoryError: If a process exceeds the memory limit.
+            PdfWorkerError: If a process stops without a result.
+            Exception: The error raised by the parser, e.g. for a file that is not a PDF.
+        """
+        # The clock starts once the file gets its first slot, not while it waits behind other files
+        self.slots.acquire()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        first_texts, page_count = self.run_tasks(filepath, [(0, self.pages_per_task)], deadline, reserved=True)[0]
+        ranges = [(start, start + self.pages_per_task) for start in range(self.pages_per_task, page_count, self.pages_per_task)]
+        page_texts = [first_texts] + [texts for texts, _ in self.run_tasks(filepath, ranges, deadline)]
+
+        parts = []
+        for texts in page_texts:
+            for text in texts:
+                if text:
+                    parts.append(text)
+                    parts.append('\n')
+        return ''.join(parts)
+
+    def run_tasks(self, filepath, ranges, deadline, reserved=False):
+        """
+        Extracts page ranges in worker processes, at most self.workers processes running at once overall.
+
+        Args:
+            filepath (str): Full path to the .pdf file.
+            ranges (list): (first, last) page ranges to extract.
+            deadline (float): time.monotonic() value by which every range must be extracted, or None.
+                It is pushed back by the time spent waiting for a slot while no range of the file runs.
+            reserved (bool, optional): Whether the caller already acquired the slot of the first range.
+
+        Returns:
+            list: (texts, page_count) for each range, in the order of the ranges.
+        """
+        results = [None] * len(ranges)
+        pending = list(enumerate(ranges))
+        running = {}
+        try:
+            while pending or running:
+                # Start as many tasks as there are free slots, waiting for one only when nothing runs
+                while pending:
+                    if running:
+                        if not self.slots.acquire(blocking=False):
+                            break
+                    elif not reserved:
+                        # Queued behind other files with nothing running: the wait does not count
+                        started = time.monotonic()
+                        self.slots.acquire()
+                        if deadline is not None:
+                            deadline += time.monotonic() - started
+                    index, (first, last) = pending.pop(0)
+                    receiver, sender = multiprocessing.Pipe(duplex=False)
+                    process = multiprocessing.Process(target=_extract_pages, args=(sender, filepath, first, last, self.memory_limit), daemon=True)
+                    process.start()
+                    sender.close()
+                    running[receiver] = (index, process)
+                    reserved = False
+
+                # Poll while tasks wait for a slot held by another file
+                timeout = self.remaining(deadline)
+                if pending:
+                    timeout = 0.05 if timeout is None else min(timeout, 0.05)
+                ready = wait(list(running), timeout)
+                if not ready and deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(filepath)
+
+                for receiver in ready:
+                    index, process = running.pop(receiver)
+                    try:
+                        status, value, page_count = receiver.recv()
+                    except EOFError:
+                        status, value, page_count = "crashed", None, None
+                    receiver.close()
+                    process.join()
+                    if status == "crashed" and process.exitcode == _MEMORY_EXIT_CODE:
+                        status = "memory"
+                    self.slots.release()
+                    if status == "memory":
+                        raise MemoryError(filepath)
+                    if status == "crashed":
+                        raise PdfWorkerError(f"PDF extraction process exited with code {process.exitcode}")
+                    if status == "error":
+                        raise RuntimeError(value)
+                    results[index] = (value, page_count)
+        finally:
+            if reserved:
+                self.slots.release()
+            for receiver, (_, process) in running.items():
+                process.kill()
+                process.join()
+                receiver.close()
+                self.slots.release()
+        return results
+
+    @staticmethod
+    def remaining(deadline):
+        """
+        Returns the time left before a deadline.
+
+        Args:
+            deadline (float): time.monotonic() value, or None for no deadline.
+
+        Returns:
+            float: Seconds left (at least 0), or None without a deadline.
+        """
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
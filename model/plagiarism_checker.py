@@ -2,15 +2,30 @@
 
 import difflib
 import itertools
+import numpy as np
 import pandas as pd
 import os
+from model.code_tokenizer import CodeTokenizer
+from model.document_featurizer import DocumentFeaturizer, FeatureCache, approximate_size
+from model.document_store import DocumentStore
+from model.minhash_lsh import MinHashLSH
+from model.similarity_engines import ENGINES, get_engine
+from model.parallel_scoring import ParallelScorer
+from model.run_state import RunState
+from model.similarity_matrix import SimilarityMatrix
+from utils.constants import LSH_NUM_PERM, LSH_SHINGLE_SIZE, LSH_BOUND_RATIO, ENGINE_DEFAULT, WORKERS_DEFAULT, EXPORT_CHUNK_ROWS
 
 class PlagiarismChecker:
-    def __init__(self, localization):
+    def __init__(self, localization, featurizer=None):
         """
-        Constructor for the PlagiarismChecker that accepts a localization object for translating messages.
+        Constructor for the PlagiarismChecker that accepts a localization object for translating messages,
+        and optionally the DocumentFeaturizer shared with the other stages of the application.
         """
         self.localization = localization
+        self.match_blocks = {}
+        self.pruning_stats = {}
+        self.run_state = None
+        self.featurizer = featurizer if featurizer is not None else DocumentFeaturizer()
 
     def calculate_similarity(self, text1, text2):
         """
@@ -44,39 +59,534 @@ class PlagiarismChecker:
         else:
             return ((plagiarism_percent - threshold) / (100 - threshold)) * max_reduction
 
-    def process_plagiarism(self, files_content, threshold, max_reduction):
+    def find_candidate_pairs(self, signatures, threshold, bound_ratio=LSH_BOUND_RATIO, new_from=0):
+        """
+        Finds the document pairs that are likely to be similar using LSH banding of their MinHash signatures.
+
+        Args:
+            signatures (list): MinHash signatures of the documents, see MinHashLSH.signature().
+            threshold (float): Minimum similarity percentage threshold for score reduction.
+            bound_ratio (float, optional): Ratio applied to the threshold to get the Jaccard bound of the candidate stage.
+            new_from (int, optional): Only pairs involving a document at this index or later are returned. Default is 0.
+
+        Returns:
+            set: Pairs of document indices (i, j) with i < j that should be compared exactly.
+        """
+        lsh = MinHashLSH(num_perm=LSH_NUM_PERM, shingle_size=LSH_SHINGLE_SIZE)
+        jaccard_bound = min(max(threshold / 100 * bound_ratio, 0.0), 1.0)
+        return lsh.candidate_pairs(signatures, jaccard_bound, new_from=new_from)
+
+    def process_plagiarism(self, files_content, threshold, max_reduction, use_candidates=False, bound_ratio=LSH_BOUND_RATIO, engine=ENGINE_DEFAULT, workers=WORKERS_DEFAULT, report_floor=None, keep_state=False, row_sink=None):
         """
         Processes plagiarism checking between multiple files.
 
+        The documents can be given as a dictionary or as a stream of (file name, content) pairs. When streamed,
+        each document is prepared (engine features, MinHash signature) as soon as it arrives, so the preparation
+        overlaps with reading the remaining files.
+
+        The similarities are kept in a SimilarityMatrix (a condensed float32 array indexed by document index), and
+        the localized similarity table is only built when the results are viewed or exported.
+
+        When use_candidates is enabled, only the pairs found by the MinHash/LSH candidate stage are compared
+        exactly. The other pairs are still listed, with an empty similarity and a "below candidate bound" status.
+
+        Each document is prepared once by the selected similarity engine. Match blocks produced by the engine
+        are kept in self.match_blocks, keyed by the pair of file basenames, for reuse by the comparison view.
+
+        Engines that support token streams compare source code files by their canonical token streams instead
+        of their characters (see comparison_text()). Match blocks are mapped back to character offsets.
+
+        With more than one worker, the pairs are scored by a ParallelScorer across worker processes.
+        The results are identical to the serial path. Matrix engines (e.g. TF-IDF cosine) score all pairs
+        at once with vectorized operations and ignore the worker count.
+
+        A reporting floor requires a tiered engine (see supports_report_floor()), which skips the exact score of
+        pairs whose upper bounds show they cannot reach it. Those pairs are listed with an empty similarity and a "below reporting floor" status, and the
+        number of pairs eliminated by each tier is kept in self.pruning_stats.
+
+        With a row sink, the similarity rows are not collected into a DataFrame: they are passed to the sink
+        in chunks of EXPORT_CHUNK_ROWS rows as the pairs are scored, unsorted, and no match blocks are kept,
+        so the memory used does not grow with the number of rows (see stream_similarities()).
+
         Args:
-            files_content (dict): Dictionary with file names as keys and file content as values.
+            files_content (dict or iterable): Dictionary with file names as keys and file content as values,
+                or an iterable of (file name, content) pairs.
             threshold (float): Minimum similarity percentage threshold for score reduction.
             max_reduction (float): Maximum allowed score reduction.
+            use_candidates (bool, optional): Whether to run the MinHash/LSH candidate stage. Default is False.
+            bound_ratio (float, optional): Ratio applied to the threshold to get the Jaccard bound of the candidate stage.
+            engine (str, optional): Name of the similarity engine, see model.similarity_engines.ENGINES.
+            workers (int, optional): Number of worker processes used to score the pairs. Default is 1 (serial).
+            report_floor (float, optional): Minimum similarity percentage worth an exact score. Default is None (no pruning).
+            keep_state (bool, optional): Whether to keep the documents and results in self.run_state, so the run
+                can be extended later with extend_plagiarism(). Default is False. Ignored with a row sink.
+            row_sink (callable, optional): Function called with each chunk of similarity rows
+                (file1, file2, similarity, status). Default is None (rows are returned as a DataFrame).
 
         Returns:
-            tuple: (df_similarity, df_reduction)
-                - df_similarity (pd.DataFrame): DataFrame containing similarity percentages between files.
+            tuple: (similarity_matrix, df_reduction)
+                - similarity_matrix (SimilarityMatrix): Similarities between files, or None with a row sink.
                 - df_reduction (pd.DataFrame): DataFrame containing score reduction percentages per file.
+
+        Raises:
+            ValueError: If a reporting floor is given for an engine that is not tiered, or there are fewer than two files.
         """
-        if len(files_content) < 2:
+        documents = files_content.items() if isinstance(files_content, dict) else files_content
+        if report_floor and not self.supports_report_floor(engine):
+            raise ValueError(self.localization.get("error_report_floor_engine"))
+        tiered = bool(report_floor)
+        engine_options = {"floor": report_floor / 100} if tiered else None
+        similarity_engine = get_engine(engine, engine_options)
+        lsh = MinHashLSH(num_perm=LSH_NUM_PERM, shingle_size=LSH_SHINGLE_SIZE) if use_candidates else None
+        # Matrix engines score the whole corpus at once and need the raw texts instead of per-document features
+        matrix_engine = hasattr(similarity_engine, "score_pairs")
+        parallel = workers > 1 and not matrix_engine
+        state = RunState(engine, engine_options, use_candidates, bound_ratio, report_floor) if keep_state and row_sink is None else None
+        self.run_state = state
+
+        # Spill each document as it arrives, keeping only its length and signature; the texts compared and
+        # the engine features are derived again when the pairs are scored (matrix engines need every document's words)
+        file_names, tokens, signatures, lengths, doc_ids = [], [], [], [], []
+        spilled = DocumentStore()
+        for filename, text in documents:
+            # Hash the text once for the features taken from it below
+            entry = self.featurizer.document(text) if matrix_engine or lsh is not None else None
+            compared, stream = self.comparison_text(similarity_engine, filename, text, entry)
+            file_names.append(filename)
+            lengths.append(len(compared))
+            if matrix_engine:
+                tokens.append(self.featurizer.tokens(text, entry))
+            else:
+                doc_ids.append(spilled.add(filename, text))
+            if lsh is not None:
+                signatures.append(self.candidate_signature(lsh, text, compared, stream, entry))
+            if state is not None:
+                state.add_document(filename, text, signatures[-1] if lsh is not None else None)
+
+        if len(file_names) < 2:
             raise ValueError(self.localization.get("two_files_required"))
 
-        reduction_dict = {os.path.basename(filename): 0.0 for filename in files_content.keys()}
+        candidates = self.find_candidate_pairs(signatures, threshold, bound_ratio) if use_candidates else None
+
+        pairs_to_score = [pair for pair in itertools.combinations(range(len(file_names)), 2) if candidates is None or pair in candidates]
+        if tiered:
+            # Length tier: skip whole ranges of pairs of documents sorted by length
+            swept = similarity_engine.sweep_pairs(lengths, candidates)
+            pairs_to_score = [pair for pair in pairs_to_score if pair in swept]
+
+        # Score the selected pairs, either at once, serially or across worker processes
+        compared_of, stream_of = self.document_views(similarity_engine, file_names, lambda index: spilled.text(doc_ids[index]))
+        if matrix_engine:
+            scored = similarity_engine.iter_scores(tokens, set(pairs_to_score) if candidates is not None else None)
+        elif parallel:
+            compared_texts = (compared_of(index) for index in range(len(file_names)))
+            scored = self.iter_in_parallel(similarity_engine, engine, engine_options, workers, compared_texts, pairs_to_score)
+        else:
+            scored = self.iter_serial(similarity_engine, compared_of, pairs_to_score)
+
+        self.match_blocks = {}
+        if row_sink is not None:
+            reduction_dict = {os.path.basename(filename): 0.0 for filename in file_names}
+            self.stream_similarities(file_names, pairs_to_score, scored, candidates, row_sink, reduction_dict, threshold, max_reduction)
+            self.pruning_stats = dict(similarity_engine.stats) if tiered else {}
+            return None, self.build_reduction_frame(reduction_dict)
+
+        similarity_matrix = SimilarityMatrix(file_names, pruning=use_candidates or tiered)
+        if candidates is not None:
+            similarity_matrix.mark_candidates(candidates)
+        self.record_results(similarity_matrix, scored, stream_of)
+        self.pruning_stats = dict(similarity_engine.stats) if tiered else {}
+        df_reduction = self.build_reduction_frame(self.reduction_dict(similarity_matrix, threshold, max_reduction))
+
+        if state is not None:
+            state.threshold, state.max_reduction = threshold, max_reduction
+            state.candidates = candidates
+            state.similarity_matrix = similarity_matrix
+            state.match_blocks = self.match_blocks
+            state.df_reduction = df_reduction
+
+        return similarity_matrix, df_reduction
+
+    @staticmethod
+    def supports_report_floor(engine):
+        """
+        Checks whether an engine has pruning tiers for a reporting floor.
+
+        Args:
+            engine (str): Name of the similarity engine.
+
+        Returns:
+            bool: True if the engine is tiered.
+        """
+        return getattr(ENGINES.get(engine), "tiered", False)
+
+    def extend_plagiarism(self, state, files_content, threshold, max_reduction, workers=WORKERS_DEFAULT):
+        """
+        Adds new files to a finished run and scores only the pairs that involve them.
+
+        With n files in the state and k new files, only the k * n new-to-existing and new-to-new pairs are scored.
+        The similarity matrix of the state is extended with the new pairs and the reductions are recomputed from
+        it. The scoring settings (engine, reporting floor, candidate stage) are those of the state.
+
+        Engines whose scores depend on the whole corpus (corpus_scores, e.g. the IDF weights of TF-IDF cosine)
+        rescore every pair instead, so the old pairs are not left with the weights of the previous corpus.
+
+        Args:
+            state (RunState): State of the finished run, updated in place.
+            files_content (dict or iterable): Dictionary with file names as keys and file content as values,
+                or an iterable of (file name, content) pairs.
+            threshold (float): Minimum similarity percentage threshold for score reduction.
+            max_reduction (float): Maximum allowed score reduction.
+            workers (int, optional): Number of worker processes used to score the pairs. Default is 1 (serial).
+
+        Returns:
+            tuple: (similarity_matrix, df_reduction) for all files of the run.
+        """
+        documents = files_content.items() if isinstance(files_content, dict) else files_content
+        similarity_engine = get_engine(state.engine, state.engine_options)
+        lsh = MinHashLSH(num_perm=LSH_NUM_PERM, shingle_size=LSH_SHINGLE_SIZE) if state.use_candidates else None
+        matrix_engine = hasattr(similarity_engine, "score_pairs")
+        parallel = workers > 1 and not matrix_engine
+
+        new_from = len(state.file_names)
+        for filename, text in documents:
+            signature = None
+            if lsh is not None:
+                entry = self.featurizer.document(text)
+                compared, stream = self.comparison_text(similarity_engine, filename, text, entry)
+                signature = self.candidate_signature(lsh, text, compared, stream, entry)
+            state.add_document(filename, text, signature)
+        file_names = state.file_names
+        new_pairs = [(i, j) for j in range(new_from, len(file_names)) for i in range(j)]
+
+        candidates = None
+        if state.use_candidates:
+            candidates = self.find_candidate_pairs(state.signatures, threshold, state.bound_ratio, new_from=new_from)
+            state.candidates.update(candidates)
+        pairs_to_score = [pair for pair in new_pairs if candidates is None or pair in candidates]
+        rescore = getattr(similarity_engine, "corpus_scores", False)
+        if rescore:
+            pairs_to_score = [
+                pair for pair in itertools.combinations(range(len(file_names)), 2)
+                if state.candidates is None or pair in state.candidates
+            ]
+
+        # Score the new pairs (every pair for corpus-dependent scores); existing documents are only prepared
+        compared_of, stream_of = self.document_views(similarity_engine, file_names, state.text)
+        if matrix_engine:
+            tokens = [self.featurizer.tokens(state.text(index)) for index in range(len(file_names))]
+            if rescore:
+                scored = similarity_engine.iter_scores(tokens, state.candidates)
+            else:
+                scored = similarity_engine.iter_scores(tokens, set(pairs_to_score), new_from=new_from)
+        elif parallel:
+            compared_texts = (compared_of(index) for index in range(len(file_names)))
+            scored = self.iter_in_parallel(similarity_engine, state.engine, state.engine_options, workers, compared_texts, pairs_to_score)
+        else:
+            scored = self.iter_serial(similarity_engine, compared_of, pairs_to_score)
+
+        similarity_matrix = state.similarity_matrix.extended(file_names)
+        if candidates is not None:
+            similarity_matrix.mark_candidates(candidates, new_from=new_from)
+        self.match_blocks = state.match_blocks
+        self.record_results(similarity_matrix, scored, stream_of)
+        self.pruning_stats = dict(similarity_engine.stats) if state.engine_options else {}
+
+        # The reductions are a vectorized pass over the whole matrix, so changed reduction settings need no special case
+        state.threshold, state.max_reduction = threshold, max_reduction
+        state.similarity_matrix = similarity_matrix
+        state.df_reduction = self.build_reduction_frame(self.reduction_dict(similarity_matrix, threshold, max_reduction))
+
+        return similarity_matrix, state.df_reduction
+
+    def comparison_text(self, similarity_engine, filename, text, entry=None):
+        """
+        Returns the text a similarity engine compares for a document.
+
+        Source code files (PROGRAMMING_EXTENSIONS) are compared by their canonical token stream, rendered as one
+        character per token, when the engine supports token streams. Other files are compared as they are.
+
+        Args:
+            similarity_engine (object): The similarity engine.
+            filename (str): Full path of the document.
+            text (str): Content of the document.
+            entry (dict, optional): Featurizer cache entry of the document, from DocumentFeaturizer.document().
+
+        Returns:
+            tuple: (compared_text, stream) where stream is the token stream, or None if the text is used as is.
+        """
+        if not getattr(similarity_engine, "token_streams", False) or not CodeTokenizer.is_code_file(filename):
+            return text, None
+        stream = self.featurizer.token_stream(text, filename, entry)
+        return CodeTokenizer.token_text(stream), stream
+
+    def document_views(self, similarity_engine, file_names, text_of):
+        """
+        Builds lazy accessors of the text an engine compares and of the token stream of each document.
+
+        Token streams are only computed for the documents compared by tokens, and kept in a FeatureCache
+        within the featurizer's byte budget, since scoring needs them for every match block of a document.
+
+        Args:
+            similarity_engine (object): The similarity engine.
+            file_names (list): Full paths of the documents, indexed by document index.
+            text_of (callable): Function returning the content of a document index.
+
+        Returns:
+            tuple: (compared_of, stream_of) functions of a document index, returning the compared text and
+                the token stream (None for a document compared as is).
+        """
+        def compared_of(index):
+            return self.comparison_text(similarity_engine, file_names[index], text_of(index))[0]
+
+        if not getattr(similarity_engine, "token_streams", False):
+            return compared_of, lambda index: None
+        streams = FeatureCache(
+            lambda index: self.comparison_text(similarity_engine, file_names[index], text_of(index))[1], self.featurizer.max_bytes
+        )
+
+        def stream_of(index):
+            return streams.get(index) if CodeTokenizer.is_code_file(file_names[index]) else None
+
+        return compared_of, stream_of
+
+    def iter_serial(self, similarity_engine, compared_of, pairs):
+        """
+        Scores pairs in this process, preparing the features of the documents as they are needed.
+
+        The pairs are scored by bands of rows: the features of the next rows are prepared until they reach
+        the featurizer's byte budget, then the pairs of the band are scored column by column, each column
+        document being prepared once per band. The memory used is bounded by the budget instead of growing
+        with the corpus. When every document fits in the budget there is a single band, and each document is
+        prepared once as before; otherwise documents are prepared again once per band they are a column of.
+
+        Args:
+            similarity_engine (object): The similarity engine.
+            compared_of (callable): Function returning the text compared for a document index.
+            pairs (list): Pairs of document indices (i, j) to score.
+
+        Yields:
+            tuple: (pair, result) with the pair (i, j) and its (ratio, blocks) result, grouped by band.
+        """
+        pairs = sorted(pairs)
+        position = 0
+        while position < len(pairs):
+            band, band_bytes, end = {}, 0, position
+            while end < len(pairs) and band_bytes < self.featurizer.max_bytes:
+                row = pairs[end][0]
+                band[row] = similarity_engine.prepare(compared_of(row))
+                band_bytes += approximate_size(band[row])
+                while end < len(pairs) and pairs[end][0] == row:
+                    end += 1
+
+            column, features = None, None
+            for i, j in sorted(pairs[position:end], key=lambda pair: (pair[1], pair[0])):
+                if j != column:
+                    column = j
+                    features = band[j] if j in band else similarity_engine.prepare(compared_of(j))
+                yield (i, j), similarity_engine.compare(band[i], features)
+            position = end
+
+    def candidate_signature(self, lsh, text, compared, stream, entry=None):
+        """
+        Computes the MinHash signature of a document over the text its engine scores, so the candidate
+        stage sees source code files as their token streams (e.g. copies with renamed identifiers).
+
+        Args:
+            lsh (MinHashLSH): The candidate stage.
+            text (str): Content of the document.
+            compared (str): Text compared by the engine, from comparison_text().
+            stream (dict): Token stream of the document, or None if the text is compared as is.
+            entry (dict, optional): Featurizer cache entry of the document, from DocumentFeaturizer.document().
+
+        Returns:
+            np.ndarray: The signature.
+        """
+        if stream is not None:
+            # One character per token, already canonical
+            return lsh.signature(compared, normalized=True)
+        return lsh.signature(self.featurizer.normalized(text, entry), normalized=True)
+
+    def iter_in_parallel(self, similarity_engine, engine, engine_options, workers, texts, pairs):
+        """
+        Scores pairs across worker processes, yielding the results as the workers finish them.
+        The engine counters of the workers are merged into the local engine once all pairs are scored.
+
+        Args:
+            similarity_engine (object): Local engine instance whose counters are updated.
+            engine (str): Name of the similarity engine.
+            engine_options (dict): Keyword arguments passed to the engine constructor.
+            workers (int): Number of worker processes.
+            texts (iterable): Texts compared for each document, in document index order.
+            pairs (list): Pairs of document indices (i, j) to score.
+
+        Yields:
+            tuple: (pair, result) with the pair (i, j) and its (ratio, blocks) result.
+        """
+        scorer = ParallelScorer(engine, workers, engine_options=engine_options)
+        yield from scorer.iter_score(texts, pairs)
+        for key, value in scorer.stats.items():
+            similarity_engine.stats[key] += value
+
+    def record_results(self, similarity_matrix, scored, stream_of=None):
+        """
+        Stores pair results in a similarity matrix, one chunk of EXPORT_CHUNK_ROWS pairs at a time,
+        and keeps the engine's match blocks in self.match_blocks.
+
+        Args:
+            similarity_matrix (SimilarityMatrix): The matrix receiving the similarity ratios.
+            scored (iterable): (pair, result) items with the (ratio, blocks) result of each scored pair.
+            stream_of (callable, optional): Function returning the token stream of a document index, or None for a
+                document compared as is. Match blocks of documents compared by tokens are converted from token to
+                character offsets.
+        """
+        names = similarity_matrix.names
+        scored = iter(scored)
+        for chunk in iter(lambda: list(itertools.islice(scored, EXPORT_CHUNK_ROWS)), []):
+            similarity_matrix.set_scores([pair for pair, _ in chunk], [ratio for _, (ratio, _) in chunk])
+            for (i, j), (ratio, blocks) in chunk:
+                if ratio is None or blocks is None:
+                    continue
+                stream1, stream2 = (stream_of(i), stream_of(j)) if stream_of is not None else (None, None)
+                if stream1 is not None or stream2 is not None:
+                    blocks = [self.char_block(block, stream1, stream2) for block in blocks]
+                self.match_blocks[(names[i], names[j])] = blocks
+
+    def reduction_dict(self, similarity_matrix, threshold, max_reduction):
+        """
+        Computes the score reduction of each file from a similarity matrix.
+
+        Args:
+            similarity_matrix (SimilarityMatrix): Similarities between the files.
+            threshold (float): Minimum similarity percentage threshold for score reduction.
+            max_reduction (float): Maximum allowed score reduction.
+
+        Returns:
+            dict: Mapping of file basenames to their score reduction. Files sharing a basename share the highest reduction.
+        """
+        reduction_dict = {}
+        for name, reduction in zip(similarity_matrix.names, similarity_matrix.reductions(threshold, max_reduction).tolist()):
+            reduction_dict[name] = max(reduction_dict.get(name, 0.0), reduction)
+        return reduction_dict
+
+    def stream_similarities(self, file_names, pairs_to_score, scored, candidates, row_sink, reduction_dict, threshold, max_reduction):
+        """
+        Passes the similarity rows of a run to a sink in chunks, updating the score reductions on the way.
+
+        The scored pairs are reported as they come out of the engine, then the pairs that were not scored
+        (outside the candidate pairs, or pruned by the length tier) are reported with their status.
+        Only one chunk of rows is held at a time.
+
+        Args:
+            file_names (list): Full paths of the documents, indexed by document index.
+            pairs_to_score (list): Pairs of document indices (i, j) that are scored.
+            scored (iterable): (pair, result) items for the scored pairs, in any order.
+            candidates (set): Pairs kept by the candidate stage, or None if it was not used.
+            row_sink (callable): Function called with each chunk of rows (file1, file2, similarity, status).
+            reduction_dict (dict): Mapping of file basenames to their score reduction, updated in place.
+            threshold (float): Minimum similarity percentage threshold for score reduction.
+            max_reduction (float): Maximum allowed score reduction.
+        """
+        def emit(pairs, results):
+            self.update_reductions(reduction_dict, file_names, results, threshold, max_reduction)
+            row_sink(self.collect_similarities(file_names, pairs, results, candidates))
+
+        scored = iter(scored)
+        for results in iter(lambda: dict(itertools.islice(scored, EXPORT_CHUNK_ROWS)), {}):
+            emit(list(results), results)
+
+        pair_count = len(file_names) * (len(file_names) - 1) // 2
+        if len(pairs_to_score) < pair_count:
+            selected = set(pairs_to_score)
+            unscored = (pair for pair in itertools.combinations(range(len(file_names)), 2) if pair not in selected)
+            for pairs in iter(lambda: list(itertools.islice(unscored, EXPORT_CHUNK_ROWS)), []):
+                emit(pairs, {})
+
+    def collect_similarities(self, file_names, pairs, results, candidates):
+        """
+        Turns pair results into similarity rows.
+
+        Args:
+            file_names (list): Full paths of the documents, indexed by document index.
+            pairs (list): Pairs of document indices (i, j) to report.
+            results (dict): Mapping of scored pairs to their (ratio, blocks) result.
+            candidates (set): Pairs kept by the candidate stage, or None if it was not used.
+
+        Returns:
+            list: Rows (file1, file2, similarity, status) with basenames and the similarity percentage.
+        """
+        below_bound = self.localization.get("below_candidate_bound")
+        below_floor = self.localization.get("below_reporting_floor")
         similarities = []
 
-        file_pairs = itertools.combinations(files_content.keys(), 2)
-        for file1, file2 in file_pairs:
-            text1 = files_content[file1]
-            text2 = files_content[file2]
-            similarity_ratio = self.calculate_similarity(text1, text2) * 100
+        for i, j in pairs:
+            file1, file2 = os.path.basename(file_names[i]), os.path.basename(file_names[j])
+            if candidates is not None and (i, j) not in candidates:
+                similarities.append((file1, file2, None, below_bound))
+                continue
 
-            similarities.append((os.path.basename(file1), os.path.basename(file2), round(similarity_ratio, 2)))
+            ratio, _ = results.get((i, j), (None, None))
+            if ratio is None:
+                similarities.append((file1, file2, None, below_floor))
+                continue
+            similarities.append((file1, file2, round(ratio * 100, 2), ""))
 
-            if similarity_ratio > threshold:
-                reduction = self.calculate_reduction(similarity_ratio, threshold, max_reduction)
-                reduction_dict[os.path.basename(file1)] = max(reduction_dict[os.path.basename(file1)], reduction)
-                reduction_dict[os.path.basename(file2)] = max(reduction_dict[os.path.basename(file2)], reduction)
+        return similarities
+
+    @staticmethod
+    def char_block(block, stream1, stream2):
+        """
+        Converts the token offsets of a match block into character offsets.
+
+        Args:
+            block (tuple): Match block (start1, end1, start2, end2).
+            stream1 (dict): Token stream of the first document, or None if its offsets are already characters.
+            stream2 (dict): Token stream of the second document, or None if its offsets are already characters.
+
+        Returns:
+            tuple: Match block (start1, end1, start2, end2) in character offsets.
+        """
+        start1, end1, start2, end2 = block
+        if stream1 is not None:
+            start1, end1 = CodeTokenizer.char_span(stream1, start1, end1)
+        if stream2 is not None:
+            start2, end2 = CodeTokenizer.char_span(stream2, start2, end2)
+        return start1, end1, start2, end2
+
+    def update_reductions(self, reduction_dict, file_names, results, threshold, max_reduction):
+        """
+        Raises the score reduction of each file to the highest reduction of its scored pairs.
 
+        The reductions are computed from the unrounded similarities, stored as float32 like in a
+        SimilarityMatrix, so they match those of SimilarityMatrix.reductions().
+
+        Args:
+            reduction_dict (dict): Mapping of file basenames to their score reduction, updated in place.
+            file_names (list): Full paths of the documents, indexed by document index.
+            results (dict): Mapping of scored pairs (i, j) to their (ratio, blocks) result.
+            threshold (float): Minimum similarity percentage threshold for score reduction.
+            max_reduction (float): Maximum allowed score reduction.
+        """
+        for (i, j), (ratio, _) in results.items():
+            if ratio is None:
+                continue
+            similarity = float(np.float32(ratio)) * 100
+            if similarity > threshold:
+                reduction = self.calculate_reduction(similarity, threshold, max_reduction)
+                file1, file2 = os.path.basename(file_names[i]), os.path.basename(file_names[j])
+                reduction_dict[file1] = max(reduction_dict[file1], reduction)
+                reduction_dict[file2] = max(reduction_dict[file2], reduction)
+
+    def build_reduction_frame(self, reduction_dict):
+        """
+        Builds the score reduction table.
+
+        Args:
+            reduction_dict (dict): Mapping of file basenames to their score reduction.
+
+        Returns:
+            pd.DataFrame: DataFrame containing score reduction percentages per file, highest first.
+        """
         data_reduction = [
             {
                 self.localization.get("file_name"): student,
@@ -86,18 +596,4 @@ class PlagiarismChecker:
         ]
 
         df_reduction = pd.DataFrame(data_reduction)
-        df_reduction = df_reduction.sort_values(by=self.localization.get("score_reduction_percentage"), ascending=False)
-
-        data_similarity = [
-            {
-                self.localization.get("file_1"): file1,
-                self.localization.get("file_2"): file2,
-                self.localization.get("similarity_percent"): sim
-            }
-            for file1, file2, sim in similarities
-        ]
-
-        df_similarity = pd.DataFrame(data_similarity)
-        df_similarity = df_similarity.sort_values(by=self.localization.get("similarity_percent"), ascending=False)
-
-        return df_similarity, df_reduction
+        return df_reduction.sort_values(by=self.localization.get("score_reduction_percentage"), ascending=False)
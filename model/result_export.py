@@ -0,0 +1,353 @@
+# model/result_export.py
+
+import csv
+import errno
+import numbers
+import os
+from openpyxl import Workbook
+from utils.constants import EXCEL_MAX_ROWS, EXPORT_CHUNK_ROWS
+
+EXPORT_FORMATS = ('xlsx', 'csv', 'parquet')
+
+SIMILARITY_SHEET = 'Similarity'
+REDUCTION_SHEET = 'Score Deduction'
+
+# Types of the exported columns, by the localization key of their header ("cluster" for the Cluster column)
+COLUMN_TYPES = {
+    "file_1": "string",
+    "file_2": "string",
+    "similarity_percent": "float64",
+    "status": "string",
+    "file_name": "string",
+    "score_reduction_percentage": "float64",
+    "cluster": "int64",
+}
+REDUCTION_KEYS = ("file_name", "score_reduction_percentage", "cluster")
+
+def column_types(keys):
+    """
+    Returns the types of the columns of an exported table.
+
+    Args:
+        keys (iterable): Localization keys of the column headers, see COLUMN_TYPES.
+
+    Returns:
+        list: "string", "float64" or "int64" for each column.
+    """
+    return [COLUMN_TYPES[key] for key in keys]
+
+def check_writable(path):
+    """
+    Checks that a file can be created at a path, before any output is produced.
+
+    Args:
+        path (str): Path of the file to create.
+
+    Raises:
+        FileNotFoundError: If the directory of the file does not exist.
+        PermissionError: If the directory (or the existing file) is not writable.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+    if not os.access(directory, os.W_OK) or (os.path.exists(path) and not os.access(path, os.W_OK)):
+        raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), path)
+
+def companion_path(output_file, suffix):
+    """
+    Builds the path of a file written next to the output file, for formats holding one table per file.
+
+    Args:
+        output_file (str): Path to the main output file.
+        suffix (str): Suffix added to the file name, before the extension.
+
+    Returns:
+        str: The companion path, e.g. "results_score_deduction.csv" for "results.csv".
+    """
+    stem, extension = os.path.splitext(output_file)
+    return f"{stem}_{suffix}{extension}"
+
+class XlsxTableWriter:
+    """
+    XlsxTableWriter appends the rows of one table to sheets of a write-only workbook.
+
+    Rows are streamed to disk as they are appended. When a sheet reaches Excel's row limit,
+    the table continues on a new sheet ("Similarity (2)", ...) with the same header.
+    """
+    def __init__(self, workbook, sheet_name, columns):
+        """
+        Initializes the writer and creates the first sheet.
+
+        Args:
+            workbook (openpyxl.Workbook): A workbook created with write_only=True.
+            sheet_name (str): Name of the first sheet of the table.
+            columns (list): Column headers.
+        """
+        self.workbook = workbook
+        self.sheet_name = sheet_name
+        self.columns = list(columns)
+        self.sheets = []
+        self.new_sheet()
+
+    def new_sheet(self):
+        """
+        Starts a new sheet of the table with the header row.
+        """
+        title = self.sheet_name if not self.sheets else f"{self.sheet_name} ({len(self.sheets) + 1})"
+        self.sheet = self.workbook.create_sheet(title)
+        self.sheets.append(self.sheet)
+        self.sheet.append(self.columns)
+        self.sheet_rows = 1
+
+    def write_rows(self, rows):
+        """
+        Appends rows to the table.
+
+        Args:
+            rows (iterable): Rows, each a sequence of cell values in column order.
+        """
+        for row in rows:
+            if self.sheet_rows >= EXCEL_MAX_ROWS:
+                self.new_sheet()
+            self.sheet.append(list(row))
+            self.sheet_rows += 1
+
+    def close(self):
+        """
+        Nothing to flush: the workbook is saved by its owner.
+        """
+
+    def discard(self):
+        """
+        Closes the sheets of a workbook that will not be saved, so their streams end cleanly.
+        """
+        for sheet in self.sheets:
+            if not sheet.closed:
+                sheet.close()
+
+class CsvTableWriter:
+    """
+    CsvTableWriter writes the rows of one table to a CSV file as they arrive.
+    """
+    def __init__(self, path, columns):
+        """
+        Opens the CSV file and writes the header row.
+
+        Args:
+            path (str): Path to the CSV file.
+            columns (list): Column headers.
+        """
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write_rows(self, rows):
+        """
+        Appends rows to the table.
+
+        Args:
+            rows (iterable): Rows, each a sequence of cell values in column order.
+        """
+        self.writer.writerows(rows)
+
+    def close(self):
+        """
+        Closes the CSV file.
+        """
+        self.file.close()
+
+    def discard(self):
+        """
+        Closes the CSV file of an unfinished export.
+        """
+        self.file.close()
+
+class ParquetTableWriter:
+    """
+    ParquetTableWriter writes the rows of one table to a Parquet file, one row group per chunk.
+
+    Requires the optional pyarrow package. The schema is built from the column types, so it does
+    not depend on the values of the first chunk (e.g. a chunk whose similarities are all empty).
+    """
+    def __init__(self, path, columns, types):
+        """
+        Initializes the writer. The file is created when the first chunk is written.
+
+        Args:
+            path (str): Path to the Parquet file.
+            columns (list): Column headers.
+            types (list): Type of each column, "string", "float64" or "int64".
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        import pyarrow
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.path = path
+        self.columns = list(columns)
+        self.types = list(types)
+        self.schema = pyarrow.schema([(column, getattr(pyarrow, type_name)()) for column, type_name in zip(self.columns, self.types)])
+        self.buffer = []
+        self.writer = None
+
+    def write_rows(self, rows):
+        """
+        Appends rows to the table, writing a row group each time EXPORT_CHUNK_ROWS rows are buffered.
+
+        Args:
+            rows (iterable): Rows, each a sequence of cell values in column order.
+        """
+        for row in rows:
+            self.buffer.append(row)
+            if len(self.buffer) >= EXPORT_CHUNK_ROWS:
+                self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered rows as a row group.
+        """
+        if not self.buffer and self.writer is not None:
+            return
+        data = {column: self.column_values(index) for index, column in enumerate(self.columns)}
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(self.pyarrow.table(data, schema=self.schema))
+        self.buffer = []
+
+    def column_values(self, index):
+        """
+        Returns the buffered values of a column, converted to its type. Values that are not numbers
+        in a numeric column (e.g. "N/A" for a file without a cluster) are stored as nulls.
+
+        Args:
+            index (int): Index of the column.
+
+        Returns:
+            list: The values.
+        """
+        values = [row[index] for row in self.buffer]
+        type_name = self.types[index]
+        if type_name == 'string':
+            return [None if value is None else str(value) for value in values]
+        numeric = [value if isinstance(value, numbers.Number) and value == value else None for value in values]
+        if type_name == 'int64':
+            return [None if value is None else int(value) for value in numeric]
+        return numeric
+
+    def close(self):
+        """
+        Writes the remaining rows and closes the Parquet file.
+        """
+        self.flush()
+        self.writer.close()
+
+    def discard(self):
+        """
+        Closes the Parquet file of an unfinished export, without writing the buffered rows.
+        """
+        if self.writer is not None:
+            self.writer.close()
+
+class ResultExporter:
+    """
+    ResultExporter writes the similarity and score deduction tables without holding them in memory.
+
+    XLSX output uses a write-only workbook with both tables in one file, the similarity table
+    being split across sheets above Excel's row limit. CSV and Parquet outputs hold one table
+    per file: the similarity table goes to the output file and the score deduction table to a
+    "_score_deduction" file next to it. Rows can be written in chunks as they are produced.
+    An export that fails is closed with discard(), which does not finish the output files.
+    """
+    def __init__(self, output_file, output_format, similarity_columns, reduction_columns, similarity_types, reduction_types):
+        """
+        Opens the output for writing.
+
+        Args:
+            output_file (str): Path to the output file.
+            output_format (str): One of EXPORT_FORMATS.
+            similarity_columns (list): Column headers of the similarity table.
+            reduction_columns (list): Column headers of the score deduction table.
+            similarity_types (list): Types of the similarity table columns, see column_types().
+            reduction_types (list): Types of the score deduction table columns, see column_types().
+
+        Raises:
+            ValueError: If the format is not supported.
+            ImportError: If the format needs an optional package that is not installed.
+            OSError: If the output file cannot be created.
+        """
+        if output_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {output_format}")
+        # Fail before anything is written, rather than when the workbook is saved
+        check_writable(output_file)
+        self.output_file = output_file
+        self.output_format = output_format
+        self.similarity_rows = 0
+        self.workbook = None
+        if output_format == 'xlsx':
+            self.workbook = Workbook(write_only=True)
+            # The score deduction sheet comes first, as in the interactive export
+            self.reduction = XlsxTableWriter(self.workbook, REDUCTION_SHEET, reduction_columns)
+            self.similarity = XlsxTableWriter(self.workbook, SIMILARITY_SHEET, similarity_columns)
+        elif output_format == 'csv':
+            self.similarity = CsvTableWriter(output_file, similarity_columns)
+            self.reduction = CsvTableWriter(companion_path(output_file, 'score_deduction'), reduction_columns)
+        else:
+            self.similarity = ParquetTableWriter(output_file, similarity_columns, similarity_types)
+            self.reduction = ParquetTableWriter(companion_path(output_file, 'score_deduction'), reduction_columns, reduction_types)
+
+    def write_similarity(self, rows):
+        """
+        Appends rows to the similarity table.
+
+        Args:
+            rows (list): Rows (file 1, file 2, similarity, ...) in the column order of the table.
+        """
+        self.similarity.write_rows(rows)
+        self.similarity_rows += len(rows)
+
+    def write_reduction(self, rows):
+        """
+        Appends rows to the score deduction table.
+
+        Args:
+            rows (list): Rows (file name, score reduction, ...) in the column order of the table.
+        """
+        self.reduction.write_rows(rows)
+
+    def write_frame(self, table, data):
+        """
+        Writes a DataFrame to one of the tables, EXPORT_CHUNK_ROWS rows at a time.
+
+        Args:
+            table (str): "similarity" or "reduction".
+            data (pd.DataFrame): The rows to write, with the columns of the table.
+        """
+        write = self.write_similarity if table == 'similarity' else self.write_reduction
+        for start in range(0, len(data), EXPORT_CHUNK_ROWS):
+            chunk = data.iloc[start:start + EXPORT_CHUNK_ROWS]
+            write([
+                [None if value != value else value for value in row]
+                for row in chunk.astype(object).itertuples(index=False, name=None)
+            ])
+
+    def close(self):
+        """
+        Finishes the output files.
+        """
+        self.similarity.close()
+        self.reduction.close()
+        if self.workbook is not None:
+            try:
+                self.workbook.save(self.output_file)
+            except Exception:
+                self.discard()
+                raise
+
+    def discard(self):
+        """
+        Closes the output files of an unfinished export without finishing them. The workbook is not
+        saved; the files already created are left for the caller to remove.
+        """
+        self.similarity.discard()
+        self.reduction.discard()
@@ -0,0 +1,258 @@
+# model/run_state.py
+
+import json
+import os
+import zipfile
+import zlib
+import numpy as np
+import pandas as pd
+from model.similarity_matrix import SimilarityMatrix
+
+class RunState:
+    """
+    RunState holds everything needed to extend a finished plagiarism run with new files.
+
+    It keeps the document texts (compressed), the MinHash signatures when the candidate
+    stage was used, the similarity matrix of every pair and the reduction table, so adding
+    k files to a run of n files only scores the k * n new pairs. The hash of each file's
+    content is kept too, so files that changed or were deselected since can be removed
+    (and changed files scored again as new ones). The state is persisted as an .npz
+    archive of arrays with a JSON document for the other fields, never as a pickle.
+    """
+    # Bump whenever the stored fields (or how they are computed) change, so older state files are not reused
+    version = 8
+
+    def __init__(self, engine, engine_options=None, use_candidates=False, bound_ratio=None, report_floor=None):
+        """
+        Initializes an empty RunState for the given scoring settings.
+
+        Args:
+            engine (str): Name of the similarity engine.
+            engine_options (dict, optional): Keyword arguments passed to the engine constructor.
+            use_candidates (bool, optional): Whether the MinHash/LSH candidate stage is used. Default is False.
+            bound_ratio (float, optional): Ratio applied to the threshold to get the Jaccard bound of the candidate stage.
+            report_floor (float, optional): Minimum similarity percentage worth an exact score.
+        """
+        self.engine = engine
+        self.engine_options = engine_options
+        self.use_candidates = use_candidates
+        self.bound_ratio = bound_ratio
+        self.report_floor = report_floor
+        self.threshold = None
+        self.max_reduction = None
+        self.file_names = []
+        # Hash of the file content of each document when it was read, keyed by full path
+        self.file_hashes = {}
+        self.compressed_texts = []
+        self.signatures = []
+        self.candidates = set() if use_candidates else None
+        self.similarity_matrix = None
+        self.match_blocks = {}
+        self.df_reduction = None
+        # Clusters of the first run: TF-IDF "vocabulary" and "idf" weights and the KMeans "centers"
+        self.cluster_model = None
+        self.file_cluster_mapping = {}
+
+    def add_document(self, filename, text, signature=None):
+        """
+        Adds a document to the state.
+
+        Args:
+            filename (str): Full path of the document.
+            text (str): Content of the document.
+            signature (np.ndarray, optional): MinHash signature of the document.
+        """
+        self.file_names.append(filename)
+        self.compressed_texts.append(zlib.compress(text.encode('utf-8')))
+        if signature is not None:
+            self.signatures.append(signature)
+
+    def remove_documents(self, filenames):
+        """
+        Removes documents and every result involving them from the state.
+
+        Args:
+            filenames (iterable): Full paths of the documents to remove.
+        """
+        removed = set(filenames) & set(self.file_names)
+        if not removed:
+            return
+        kept = [index for index, filename in enumerate(self.file_names) if filename not in removed]
+        new_index = {old: new for new, old in enumerate(kept)}
+        removed_names = {os.path.basename(filename) for filename in removed}
+
+        self.file_names = [self.file_names[index] for index in kept]
+        self.compressed_texts = [self.compressed_texts[index] for index in kept]
+        if self.signatures:
+            self.signatures = [self.signatures[index] for index in kept]
+        if self.candidates is not None:
+            self.candidates = {
+                (new_index[i], new_index[j]) for i, j in self.candidates if i in new_index and j in new_index
+            }
+        if self.similarity_matrix is not None:
+            self.similarity_matrix = self.similarity_matrix.subset(kept)
+        self.match_blocks = {
+            names: blocks for names, blocks in self.match_blocks.items() if not removed_names.intersection(names)
+        }
+        for filename in removed:
+            self.file_hashes.pop(filename, None)
+        for name in removed_names:
+            self.file_cluster_mapping.pop(name, None)
+
+    def text(self, index):
+        """
+        Returns the content of a document.
+
+        Args:
+            index (int): Index of the document.
+
+        Returns:
+            str: The document text.
+        """
+        return zlib.decompress(self.compressed_texts[index]).decode('utf-8')
+
+    def texts(self):
+        """
+        Returns the contents of all documents.
+
+        Returns:
+            list: Document texts, indexed by document index.
+        """
+        return [self.text(index) for index in range(len(self.file_names))]
+
+    def matches(self, engine, use_candidates, report_floor, bound_ratio, threshold):
+        """
+        Checks whether the state was produced with the given scoring settings.
+
+        The candidate stage keeps pairs above a Jaccard bound derived from the threshold, so with
+        candidates the bound ratio and the threshold must match as well.
+
+        Args:
+            engine (str): Name of the similarity engine.
+            use_candidates (bool): Whether the MinHash/LSH candidate stage is used.
+            report_floor (float): Minimum similarity percentage worth an exact score, or None.
+            bound_ratio (float): Ratio applied to the threshold to get the Jaccard bound of the candidate stage.
+            threshold (float): Minimum similarity percentage threshold for score reduction.
+
+        Returns:
+            bool: True if the state can be extended with these settings.
+        """
+        if (self.engine, self.use_candidates, self.report_floor) != (engine, use_candidates, report_floor):
+            return False
+        return not use_candidates or (self.bound_ratio, self.threshold) == (bound_ratio, threshold)
+
+    def save(self, path):
+        """
+        Writes the state to a file: a NumPy .npz archive holding the arrays (texts, signatures,
+        similarities, match blocks, cluster centers) and the other fields as a JSON document.
+        Unlike a pickle, loading it never runs code stored in the file.
+
+        Args:
+            path (str): Path to the state file.
+        """
+        texts = np.frombuffer(b''.join(self.compressed_texts), dtype=np.uint8)
+        block_keys = list(self.match_blocks)
+        blocks = [block for key in block_keys for block in self.match_blocks[key]]
+        arrays = {
+            "texts": texts,
+            "text_lengths": np.array([len(data) for data in self.compressed_texts], dtype=np.int64),
+            "match_blocks": np.asarray(blocks, dtype=np.int64).reshape(-1, 4),
+        }
+        if self.signatures:
+            arrays["signatures"] = np.stack(self.signatures)
+        if self.candidates is not None:
+            arrays["candidates"] = np.asarray(sorted(self.candidates), dtype=np.int64).reshape(-1, 2)
+        if self.similarity_matrix is not None:
+            arrays["scores"] = self.similarity_matrix.scores
+            arrays["status"] = self.similarity_matrix.status
+        if self.cluster_model is not None:
+            arrays["cluster_idf"] = self.cluster_model["idf"]
+            arrays["cluster_centers"] = self.cluster_model["centers"]
+
+        df_reduction = self.df_reduction
+        metadata = {
+            "version": self.version,
+            "engine": self.engine,
+            "engine_options": self.engine_options,
+            "use_candidates": self.use_candidates,
+            "bound_ratio": self.bound_ratio,
+            "report_floor": self.report_floor,
+            "threshold": self.threshold,
+            "max_reduction": self.max_reduction,
+            "file_names": self.file_names,
+            "file_hashes": self.file_hashes,
+            "pruning": self.similarity_matrix is not None and self.similarity_matrix.pruning,
+            "match_blocks": [[name1, name2, len(self.match_blocks[(name1, name2)])] for name1, name2 in block_keys],
+            "df_reduction": None if df_reduction is None else {
+                "columns": df_reduction.columns.tolist(),
+                "index": df_reduction.index.tolist(),
+                "data": df_reduction.values.tolist(),
+            },
+            "cluster_vocabulary": None if self.cluster_model is None else self.cluster_model["vocabulary"],
+            "file_cluster_mapping": {name: int(label) for name, label in self.file_cluster_mapping.items()},
+        }
+        arrays["metadata"] = np.frombuffer(json.dumps(metadata).encode('utf-8'), dtype=np.uint8)
+        # A file object, so numpy does not append .npz to the path
+        with open(path, 'wb') as state_file:
+            np.savez_compressed(state_file, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a state from a file written by save().
+
+        Args:
+            path (str): Path to the state file.
+
+        Returns:
+            RunState: The loaded state.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a run state or was written by an incompatible version.
+        """
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                arrays = {name: archive[name] for name in archive.files}
+            metadata = json.loads(arrays.pop("metadata").tobytes().decode('utf-8'))
+            version = metadata["version"]
+        except (KeyError, TypeError, UnicodeDecodeError, zipfile.BadZipFile) as e:
+            raise ValueError(f"Not a run state file: {e}")
+        if version != cls.version:
+            raise ValueError(f"Unsupported run state version: {version}")
+
+        state = cls(metadata["engine"], metadata["engine_options"], metadata["use_candidates"], metadata["bound_ratio"], metadata["report_floor"])
+        state.threshold = metadata["threshold"]
+        state.max_reduction = metadata["max_reduction"]
+        state.file_names = metadata["file_names"]
+        state.file_hashes = metadata["file_hashes"]
+
+        texts = arrays["texts"].tobytes()
+        ends = np.cumsum(arrays["text_lengths"]).tolist()
+        state.compressed_texts = [texts[start:end] for start, end in zip([0] + ends[:-1], ends)]
+        if "signatures" in arrays:
+            state.signatures = list(arrays["signatures"])
+        if "candidates" in arrays:
+            state.candidates = set(map(tuple, arrays["candidates"].tolist()))
+        if "scores" in arrays:
+            state.similarity_matrix = SimilarityMatrix(state.file_names, metadata["pruning"])
+            state.similarity_matrix.scores = arrays["scores"]
+            state.similarity_matrix.status = arrays["status"]
+
+        blocks = arrays["match_blocks"].tolist()
+        position = 0
+        for name1, name2, count in metadata["match_blocks"]:
+            state.match_blocks[(name1, name2)] = [tuple(block) for block in blocks[position:position + count]]
+            position += count
+
+        df_reduction = metadata["df_reduction"]
+        if df_reduction is not None:
+            state.df_reduction = pd.DataFrame(df_reduction["data"], index=df_reduction["index"], columns=df_reduction["columns"])
+        if metadata["cluster_vocabulary"] is not None:
+            state.cluster_model = {
+                "vocabulary": metadata["cluster_vocabulary"],
+                "idf": arrays["cluster_idf"],
+                "centers": arrays["cluster_centers"],
+            }
+        state.file_cluster_mapping = metadata["file_cluster_mapping"]
+        return state
@@ -0,0 +1,141 @@
+# model/similarity_engines.py
+
+import bisect
+import difflib
+from model.winnowing import WinnowingEngine
+from model.suffix_engine import SuffixAutomatonEngine
+from model.tfidf_engine import TfidfCosineEngine
+
+class SequenceMatcherEngine:
+    """
+    SequenceMatcherEngine compares the raw texts of two documents with difflib.
+
+    This is the default engine. It has no per-document preparation step and does
+    not produce match blocks, which are computed by the comparison view on demand.
+
+    With a reporting floor, pairs are scored by tiers of increasingly expensive upper
+    bounds of difflib's ratio, and the full ratio() only runs for pairs whose bound still
+    reaches the floor:
+
+    1. the length bound 2 * min(len1, len2) / (len1 + len2), applied to whole ranges of
+       pairs at once by sweep_pairs() over the documents sorted by length;
+    2. real_quick_ratio(), the same bound for pairs that did not go through the sweep;
+    3. quick_ratio(), which compares the character multisets.
+
+    The number of pairs each tier eliminated is counted in self.stats.
+    """
+    name = "sequence"
+    # Supports a reporting floor below which pairs are pruned
+    tiered = True
+    # Compares source code files by their canonical token streams (see model/code_tokenizer.py)
+    token_streams = True
+
+    def __init__(self, floor=0.0):
+        """
+        Initializes the SequenceMatcherEngine.
+
+        Args:
+            floor (float, optional): Reporting floor as a ratio (0.0 - 1.0). Pairs that cannot reach it are
+                not scored exactly. Default is 0.0 (every pair is scored exactly).
+        """
+        self.floor = floor
+        self.stats = {"length": 0, "real_quick": 0, "quick": 0, "exact": 0}
+
+    def prepare(self, text):
+        """
+        Prepares a document for comparison. The raw text is used as is.
+
+        Args:
+            text (str): The content of the document.
+
+        Returns:
+            str: The unchanged text.
+        """
+        return text
+
+    def sweep_pairs(self, lengths, candidates=None):
+        """
+        Finds the pairs whose length bound reaches the reporting floor by sweeping the documents sorted by length.
+
+        For a document of length a, the bound 2a / (a + b) of every longer partner b decreases as b grows,
+        so it reaches the floor only while b <= a * (2 - floor) / floor. All longer partners are skipped at once.
+        Pairs already removed by the candidate stage are neither swept nor counted in the "length" stat.
+
+        Args:
+            lengths (list): Length of every document, indexed by document index.
+            candidates (set, optional): Pairs kept by the candidate stage. Default is None (every pair).
+
+        Returns:
+            set: Pairs of document indices (i, j) with i < j that pass the length tier.
+        """
+        if candidates is not None:
+            # The same bound checked pair by pair, with a the shorter length and b the longer one
+            surviving = {
+                (i, j) for i, j in candidates
+                if self.floor <= 0 or max(lengths[i], lengths[j]) <= min(lengths[i], lengths[j]) * (2 - self.floor) / self.floor
+            }
+            self.stats["length"] += len(candidates) - len(surviving)
+            return surviving
+        order = sorted(range(len(lengths)), key=lambda index: lengths[index])
+        sorted_lengths = [lengths[index] for index in order]
+        surviving = set()
+        for position, index in enumerate(order):
+            if self.floor <= 0:
+                limit = len(order)
+            else:
+                max_length = sorted_lengths[position] * (2 - self.floor) / self.floor
+                limit = bisect.bisect_right(sorted_lengths, max_length, lo=position + 1)
+            for partner in order[position + 1:limit]:
+                surviving.add((index, partner) if index < partner else (partner, index))
+        total = len(lengths) * (len(lengths) - 1) // 2
+        self.stats["length"] += total - len(surviving)
+        return surviving
+
+    def compare(self, features1, features2):
+        """
+        Calculates the similarity ratio between two texts using difflib.
+
+        Args:
+            features1 (str): The first text.
+            features2 (str): The second text.
+
+        Returns:
+            tuple: (ratio, blocks) where blocks is None because no match blocks are kept.
+                The ratio is None when an upper bound shows the pair is below the reporting floor.
+        """
+        sequence_matcher = difflib.SequenceMatcher(None, features1, features2)
+        if self.floor > 0:
+            if sequence_matcher.real_quick_ratio() < self.floor:
+                self.stats["real_quick"] += 1
+                return None, None
+            if sequence_matcher.quick_ratio() < self.floor:
+                self.stats["quick"] += 1
+                return None, None
+        self.stats["exact"] += 1
+        return sequence_matcher.ratio(), None
+
+ENGINES = {
+    SequenceMatcherEngine.name: SequenceMatcherEngine,
+    WinnowingEngine.name: WinnowingEngine,
+    TfidfCosineEngine.name: TfidfCosineEngine,
+    SuffixAutomatonEngine.name: SuffixAutomatonEngine,
+}
+
+def get_engine(name, options=None):
+    """
+    Creates a similarity engine by its name.
+
+    Args:
+        name (str): Name of the engine, one of the keys of ENGINES.
+        options (dict, optional): Keyword arguments passed to the engine constructor.
+
+    Returns:
+        object: A new engine instance, either with prepare() and compare() methods (pairwise engines)
+            or with a score_pairs() method that scores the whole corpus at once (matrix engines).
+
+    Raises:
+        ValueError: If no engine exists with the given name.
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown similarity engine: {name}")
+    return ENGINES[name](**(options or {}))
@@ -0,0 +1,323 @@
+# model/similarity_matrix.py
+
+import os
+import numpy as np
+import pandas as pd
+from utils.constants import EXPORT_CHUNK_ROWS
+
+# Status of a pair in the matrix
+SCORED = 0
+BELOW_CANDIDATE_BOUND = 1
+BELOW_REPORTING_FLOOR = 2
+
+# Localization keys of the statuses of the pairs that were not scored
+STATUS_KEYS = {BELOW_CANDIDATE_BOUND: "below_candidate_bound", BELOW_REPORTING_FLOOR: "below_reporting_floor"}
+
+class SimilarityMatrix:
+    """
+    SimilarityMatrix holds the similarity of every pair of documents of a run.
+
+    The pairs (i, j), i < j, are stored in condensed (row-major upper triangle) order:
+    one float32 similarity ratio and one int8 status per pair, next to a single table of
+    document names. This takes 5 bytes per pair instead of a Python tuple and a DataFrame
+    row per pair. Localized DataFrames and rows are only produced when the results are
+    viewed or exported, and score reductions are computed with vectorized max-reduces.
+    """
+    def __init__(self, file_names, pruning=False):
+        """
+        Creates a matrix where no pair is scored yet.
+
+        Args:
+            file_names (list): Full paths of the documents, indexed by document index.
+            pruning (bool, optional): Whether the run may leave pairs unscored (candidate stage or reporting floor),
+                so the tables have a status column even if every pair ends up scored. Default is False.
+        """
+        self.file_names = list(file_names)
+        self.pruning = pruning
+        self.names = [os.path.basename(filename) for filename in self.file_names]
+        count = len(self.file_names)
+        self.scores = np.full(count * (count - 1) // 2, np.nan, dtype=np.float32)
+        self.status = np.full(count * (count - 1) // 2, BELOW_REPORTING_FLOOR, dtype=np.int8)
+
+    def __len__(self):
+        """
+        Returns the number of pairs.
+
+        Returns:
+            int: n * (n - 1) / 2 for n documents.
+        """
+        return len(self.scores)
+
+    def row_starts(self):
+        """
+        Returns the condensed index of the first pair of each row.
+
+        Returns:
+            np.ndarray: Index of the pair (i, i + 1) for every document i.
+        """
+        count = len(self.file_names)
+        rows = np.arange(count, dtype=np.int64)
+        return rows * count - rows * (rows + 1) // 2
+
+    def pair_index(self, rows, cols):
+        """
+        Converts pairs of document indices to condensed indices.
+
+        Args:
+            rows (np.ndarray): First document index i of each pair.
+            cols (np.ndarray): Second document index j > i of each pair.
+
+        Returns:
+            np.ndarray: Condensed index of each pair.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        count = len(self.file_names)
+        return rows * count - rows * (rows + 1) // 2 + cols - rows - 1
+
+    def pairs_of(self, indices):
+        """
+        Converts condensed indices to pairs of document indices.
+
+        Args:
+            indices (np.ndarray): Condensed indices.
+
+        Returns:
+            tuple: (rows, cols) arrays with the document indices (i, j) of each pair.
+        """
+        starts = self.row_starts()
+        rows = np.searchsorted(starts, indices, side='right') - 1
+        return rows, indices - starts[rows] + rows + 1
+
+    def set_scores(self, pairs, ratios):
+        """
+        Records the similarity ratio of scored pairs. A ratio of None marks a pair pruned by the reporting floor.
+
+        Args:
+            pairs (list): Pairs of document indices (i, j).
+            ratios (list): Similarity ratio between 0.0 and 1.0 of each pair, or None.
+        """
+        if not pairs:
+            return
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        ratios = np.array([np.nan if ratio is None else ratio for ratio in ratios], dtype=np.float32)
+        indices = self.pair_index(pairs[:, 0], pairs[:, 1])
+        self.scores[indices] = ratios
+        self.status[indices] = np.where(np.isnan(ratios), BELOW_REPORTING_FLOOR, SCORED)
+
+    def mark_candidates(self, candidates, new_from=0):
+        """
+        Marks the pairs outside the candidate stage as below the candidate bound.
+
+        Args:
+            candidates (set): Pairs kept by the candidate stage.
+            new_from (int, optional): Only pairs involving a document at this index or later are marked. Default is 0.
+        """
+        outside = np.zeros(len(self), dtype=bool)
+        starts = self.row_starts()
+        for row in range(len(self.file_names) - 1):
+            # Pairs (row, j) with j >= new_from
+            first = max(new_from, row + 1)
+            outside[starts[row] + first - row - 1:starts[row] + len(self.file_names) - row - 1] = True
+        if candidates:
+            pairs = np.asarray(list(candidates), dtype=np.int64).reshape(-1, 2)
+            outside[self.pair_index(pairs[:, 0], pairs[:, 1])] = False
+        self.status[outside] = BELOW_CANDIDATE_BOUND
+
+    def extended(self, file_names):
+        """
+        Returns a copy of the matrix for a larger set of documents, the new pairs being unscored.
+
+        Args:
+            file_names (list): Full paths of all documents, starting with the documents of this matrix.
+
+        Returns:
+            SimilarityMatrix: The extended matrix.
+        """
+        matrix = SimilarityMatrix(file_names, self.pruning)
+        old_count = len(self.file_names)
+        old_starts, new_starts = self.row_starts(), matrix.row_starts()
+        for row in range(old_count - 1):
+            length = old_count - row - 1
+            matrix.scores[new_starts[row]:new_starts[row] + length] = self.scores[old_starts[row]:old_starts[row] + length]
+            matrix.status[new_starts[row]:new_starts[row] + length] = self.status[old_starts[row]:old_starts[row] + length]
+        return matrix
+
+    def subset(self, indices):
+        """
+        Returns a copy of the matrix restricted to some of its documents, keeping the pairs between them.
+
+        Args:
+            indices (list): Increasing indices of the documents to keep.
+
+        Returns:
+            SimilarityMatrix: The matrix of the kept documents, in the order of indices.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        matrix = SimilarityMatrix([self.file_names[index] for index in indices], self.pruning)
+        new_starts = matrix.row_starts()
+        for row in range(len(indices) - 1):
+            old = self.pair_index(np.full(len(indices) - row - 1, indices[row]), indices[row + 1:])
+            matrix.scores[new_starts[row]:new_starts[row] + len(old)] = self.scores[old]
+            matrix.status[new_starts[row]:new_starts[row] + len(old)] = self.status[old]
+        return matrix
+
+    def percentages(self, indices=slice(None)):
+        """
+        Returns similarity percentages rounded to two decimals, as reported in the results.
+
+        Args:
+            indices (slice or np.ndarray, optional): Condensed indices of the pairs. Default is all pairs.
+
+        Returns:
+            np.ndarray: float64 percentages, NaN for the pairs that were not scored.
+        """
+        return np.round(self.scores[indices].astype(np.float64) * 100, 2)
+
+    def iter_blocks(self, chunk_rows=EXPORT_CHUNK_ROWS):
+        """
+        Splits the matrix into blocks of whole rows holding about chunk_rows pairs each.
+
+        Args:
+            chunk_rows (int, optional): Number of pairs per block. Default is EXPORT_CHUNK_ROWS.
+
+        Yields:
+            tuple: (rows, cols, block) with the document indices of the pairs of the block and the slice
+                of their condensed indices.
+        """
+        count = len(self.file_names)
+        starts = self.row_starts()
+        row = 0
+        while row < count - 1:
+            end_row = row + 1
+            while end_row < count - 1 and starts[end_row] + count - end_row - 1 - starts[row] <= chunk_rows:
+                end_row += 1
+            block = slice(int(starts[row]), int(starts[end_row - 1] + count - end_row))
+            lengths = count - np.arange(row, end_row) - 1
+            rows = np.repeat(np.arange(row, end_row), lengths)
+            cols = np.arange(block.stop - block.start) - np.repeat(starts[row:end_row] - starts[row], lengths) + rows + 1
+            yield rows, cols, block
+            row = end_row
+
+    def reductions(self, threshold, max_reduction):
+        """
+        Computes the score reduction of each document: the highest reduction over the pairs it belongs to.
+        Reductions are computed from the unrounded similarities; only the reported percentages are rounded.
+
+        Args:
+            threshold (float): Minimum similarity percentage threshold for score reduction.
+            max_reduction (float): Maximum allowed score reduction.
+
+        Returns:
+            np.ndarray: Score reduction of each document, indexed by document index.
+        """
+        result = np.zeros(len(self.file_names))
+        for rows, cols, block in self.iter_blocks():
+            percent = self.scores[block].astype(np.float64) * 100
+            with np.errstate(divide='ignore', invalid='ignore'):
+                reduction = np.where(percent >= 100, max_reduction, (percent - threshold) / (100 - threshold) * max_reduction)
+            # NaN (not scored) compares as False, so unscored pairs never reduce a score
+            reduction = np.where(percent > threshold, reduction, 0.0)
+            np.maximum.at(result, rows, reduction)
+            np.maximum.at(result, cols, reduction)
+        return result
+
+    def has_status(self):
+        """
+        Checks whether the results need a status column: the run may leave pairs unscored, or some were.
+        The column depends on the settings of the run rather than on its results, so streamed exports,
+        which write their header before any pair is scored, have the same columns.
+
+        Returns:
+            bool: True if the run prunes pairs or a pair is below the candidate bound or the reporting floor.
+        """
+        return self.pruning or bool((self.status != SCORED).any())
+
+    def column_keys(self, cluster=False):
+        """
+        Returns the localization keys of the headers of the similarity table.
+
+        Args:
+            cluster (bool, optional): Whether the table has a "Cluster" column (key "cluster"). Default is False.
+
+        Returns:
+            list: Localization keys.
+        """
+        keys = ["file_1", "file_2", "similarity_percent", "status"] if self.has_status() else ["file_1", "file_2", "similarity_percent"]
+        return keys + (["cluster"] if cluster else [])
+
+    def columns(self, localization, cluster=False):
+        """
+        Returns the localized headers of the similarity table.
+
+        Args:
+            localization (object): Localization object for fetching the column names.
+            cluster (bool, optional): Whether the table has a "Cluster" column. Default is False.
+
+        Returns:
+            list: Column headers.
+        """
+        return [localization.get(key) for key in self.column_keys()] + (['Cluster'] if cluster else [])
+
+    def sorted_indices(self):
+        """
+        Returns the condensed indices of the pairs from the highest similarity to the lowest, unscored pairs last.
+
+        Returns:
+            np.ndarray: Condensed indices in report order.
+        """
+        return np.argsort(-self.percentages(), kind='stable')
+
+    def table(self, indices, localization, file_cluster_mapping=None):
+        """
+        Builds the localized similarity table of some pairs.
+
+        Args:
+            indices (np.ndarray): Condensed indices of the pairs, in display order.
+            localization (object): Localization object for fetching the column names and statuses.
+            file_cluster_mapping (dict, optional): Mapping of the file basename to the cluster number.
+                When given, a "Cluster" column holds the cluster of the first file.
+
+        Returns:
+            pd.DataFrame: One row per pair.
+        """
+        columns = self.columns(localization, file_cluster_mapping is not None)
+        rows, cols = self.pairs_of(indices)
+        names = np.array(self.names, dtype=object)
+        data = {columns[0]: names[rows], columns[1]: names[cols], columns[2]: self.percentages(indices)}
+        if self.has_status():
+            labels = np.array([""] + [localization.get(STATUS_KEYS[status]) for status in sorted(STATUS_KEYS)], dtype=object)
+            data[columns[3]] = labels[self.status[indices]]
+        if file_cluster_mapping is not None:
+            data['Cluster'] = [file_cluster_mapping.get(name, 'N/A') for name in names[rows]]
+        return pd.DataFrame(data, columns=columns)
+
+    def to_frame(self, localization, file_cluster_mapping=None):
+        """
+        Builds the localized similarity table of all pairs, highest similarity first.
+
+        Args:
+            localization (object): Localization object for fetching the column names and statuses.
+            file_cluster_mapping (dict, optional): Mapping of the file basename to the cluster number.
+
+        Returns:
+            pd.DataFrame: DataFrame containing similarity percentages between files.
+        """
+        return self.table(self.sorted_indices(), localization, file_cluster_mapping)
+
+    def iter_tables(self, localization, file_cluster_mapping=None, chunk_rows=EXPORT_CHUNK_ROWS):
+        """
+        Yields the similarity table in chunks of rows, highest similarity first, so it can be exported
+        without building the whole table.
+
+        Args:
+            localization (object): Localization object for fetching the column names and statuses.
+            file_cluster_mapping (dict, optional): Mapping of the file basename to the cluster number.
+            chunk_rows (int, optional): Number of rows per chunk. Default is EXPORT_CHUNK_ROWS.
+
+        Yields:
+            pd.DataFrame: The next rows of the table.
+        """
+        order = self.sorted_indices()
+        for start in range(0, len(order), chunk_rows):
+            yield self.table(order[start:start + chunk_rows], localization, file_cluster_mapping)
@@ -0,0 +1,284 @@
+# model/suffix_engine.py
+
+from array import array
+import numpy as np
+
+class SuffixAutomaton:
+    """
+    SuffixAutomaton is the minimal automaton recognizing every substring of a text.
+
+    It is built in linear time and, for every position of another text, gives the
+    longest substring ending there that also occurs in the indexed text. Each state
+    keeps the end offset of the first occurrence of its strings, so matches can be
+    located in the indexed text.
+
+    The states and transitions are kept in flat integer arrays rather than one dict per
+    state: the transitions of a state form a linked list of edges, and the transitions
+    of the initial state, which is visited most, are also kept in a dict.
+    """
+    def __init__(self, text):
+        """
+        Builds the suffix automaton of a text.
+
+        Args:
+            text (str): The text to index.
+        """
+        self.text = text
+        # Per state: suffix link, length of its longest string, end of its first occurrence and first edge
+        self.links = array('i', [-1])
+        self.lengths = array('i', [0])
+        self.first_ends = array('i', [-1])
+        self.first_edges = array('i', [-1])
+        # Per edge: character code, target state and next edge of the same state
+        self.edge_chars = array('i')
+        self.edge_targets = array('i')
+        self.next_edges = array('i')
+        self.root = {}
+        last = 0
+        for position, char in enumerate(text):
+            last = self.extend(last, ord(char), position)
+
+    def edge(self, state, code):
+        """
+        Finds the edge of a state for a character.
+
+        Args:
+            state (int): The state.
+            code (int): Code point of the character.
+
+        Returns:
+            int: Index of the edge, or -1 if the state has no transition for the character.
+        """
+        if state == 0:
+            return self.root.get(code, -1)
+        edge, edge_chars, next_edges = self.first_edges[state], self.edge_chars, self.next_edges
+        while edge != -1 and edge_chars[edge] != code:
+            edge = next_edges[edge]
+        return edge
+
+    def add_edge(self, state, code, target):
+        """
+        Adds a transition to a state.
+
+        Args:
+            state (int): The state.
+            code (int): Code point of the character.
+            target (int): State reached by the transition.
+        """
+        edge = len(self.edge_chars)
+        self.edge_chars.append(code)
+        self.edge_targets.append(target)
+        self.next_edges.append(self.first_edges[state])
+        self.first_edges[state] = edge
+        if state == 0:
+            self.root[code] = edge
+
+    def add_state(self, length, first_end):
+        """
+        Adds a state without transitions.
+
+        Args:
+            length (int): Length of the longest string of the state.
+            first_end (int): End offset of the first occurrence of its strings.
+
+        Returns:
+            int: The new state.
+        """
+        self.links.append(0)
+        self.lengths.append(length)
+        self.first_ends.append(first_end)
+        self.first_edges.append(-1)
+        return len(self.lengths) - 1
+
+    def extend(self, last, code, position):
+        """
+        Adds one character to the automaton.
+
+        Args:
+            last (int): State of the whole text indexed so far.
+            code (int): Code point of the character to add.
+            position (int): Offset of the character in the text.
+
+        Returns:
+            int: State of the whole text including the new character.
+        """
+        links, lengths, first_ends, first_edges = self.links, self.lengths, self.first_ends, self.first_edges
+        edge_chars, edge_targets, next_edges, root = self.edge_chars, self.edge_targets, self.next_edges, self.root
+        # The state and edge additions of add_state() and add_edge(), inlined as they run for every character
+        current = len(lengths)
+        links.append(0)
+        lengths.append(lengths[last] + 1)
+        first_ends.append(position)
+        first_edges.append(-1)
+
+        state = last
+        while True:
+            if state == 0:
+                found = root.get(code, -1)
+            else:
+                found = first_edges[state]
+                while found != -1 and edge_chars[found] != code:
+                    found = next_edges[found]
+            if found != -1:
+                break
+            new_edge = len(edge_chars)
+            edge_chars.append(code)
+            edge_targets.append(current)
+            next_edges.append(first_edges[state])
+            first_edges[state] = new_edge
+            if state == 0:
+                root[code] = new_edge
+                return current
+            state = links[state]
+
+        target = edge_targets[found]
+        if lengths[target] == lengths[state] + 1:
+            links[current] = target
+            return current
+
+        # Split the target state so that every state keeps a single end position set
+        clone = self.add_state(lengths[state] + 1, first_ends[target])
+        copied = first_edges[target]
+        while copied != -1:
+            self.add_edge(clone, edge_chars[copied], edge_targets[copied])
+            copied = next_edges[copied]
+        links[clone] = links[target]
+        while found != -1 and edge_targets[found] == target:
+            edge_targets[found] = clone
+            state = links[state]
+            found = -1 if state == -1 else self.edge(state, code)
+        links[target] = clone
+        links[current] = clone
+        return current
+
+    def maximal_matches(self, text, min_length):
+        """
+        Finds the maximal substrings of a text that also occur in the indexed text, in linear time.
+
+        A match is reported where it cannot be extended any further to the right; it is the longest
+        match ending there, so it cannot be extended to the left either.
+
+        Args:
+            text (str): The text to scan.
+            min_length (int): Minimum length of the reported matches.
+
+        Returns:
+            list: Matches (start1, end1, start2, end2), offsets 1 being in the indexed text and offsets 2 in the scanned text.
+        """
+        links, lengths, first_ends = self.links, self.lengths, self.first_ends
+        first_edges, edge_chars, edge_targets, next_edges, root = self.first_edges, self.edge_chars, self.edge_targets, self.next_edges, self.root
+        matches = []
+        state, length = 0, 0
+        for position, char in enumerate(text):
+            code = ord(char)
+            previous_state, previous_length = state, length
+            # The edge lookup of edge(), inlined as it runs for every character
+            while True:
+                if state == 0:
+                    edge = root.get(code, -1)
+                    break
+                edge = first_edges[state]
+                while edge != -1 and edge_chars[edge] != code:
+                    edge = next_edges[edge]
+                if edge != -1:
+                    break
+                state = links[state]
+                length = lengths[state]
+            if edge != -1:
+                state = edge_targets[edge]
+                length += 1
+            else:
+                state, length = 0, 0
+            if previous_length >= min_length and length != previous_length + 1:
+                end1 = first_ends[previous_state] + 1
+                matches.append((end1 - previous_length, end1, position - previous_length, position))
+        if length >= min_length:
+            end1 = first_ends[state] + 1
+            matches.append((end1 - length, end1, len(text) - length, len(text)))
+        return matches
+
+class SuffixAutomatonEngine:
+    """
+    SuffixAutomatonEngine compares documents by the maximal substrings they share.
+
+    The first document of a pair is indexed by a suffix automaton and the second one is
+    scanned through it, which enumerates all maximal shared substrings of at least
+    min_length characters in time linear in the length of both documents, without the
+    junk heuristics of difflib. The longest non-overlapping matches are kept as the match
+    blocks, and the similarity is 2 * M / T like difflib's ratio, M being the number of
+    matched characters and T the total length of both documents.
+    """
+    name = "suffix"
+    # Compares source code files by their canonical token streams (see model/code_tokenizer.py)
+    token_streams = True
+
+    def __init__(self, min_length=12):
+        """
+        Initializes the SuffixAutomatonEngine.
+
+        Args:
+            min_length (int, optional): Minimum length of a shared substring to count as a match. Default is 12.
+        """
+        self.min_length = min_length
+        # Automaton of the last first document, reused while the pairs of that document are compared
+        self.automaton = None
+
+    def prepare(self, text):
+        """
+        Prepares a document for comparison. The raw text is used as is; the automaton is built on demand.
+
+        Args:
+            text (str): The content of the document.
+
+        Returns:
+            str: The unchanged text.
+        """
+        return text
+
+    def compare(self, features1, features2):
+        """
+        Compares two texts by their maximal shared substrings.
+
+        Args:
+            features1 (str): The first text.
+            features2 (str): The second text.
+
+        Returns:
+            tuple: (ratio, blocks)
+                - ratio (float): Similarity ratio between 0.0 and 1.0.
+                - blocks (list): Matched spans (start1, end1, start2, end2) ordered by their position in the first text.
+        """
+        total = len(features1) + len(features2)
+        if total == 0:
+            return 0.0, []
+        blocks = self.matching_blocks(features1, features2)
+        matched = sum(end1 - start1 for start1, end1, _, _ in blocks)
+        return 2.0 * matched / total, blocks
+
+    def matching_blocks(self, text1, text2):
+        """
+        Selects the longest non-overlapping maximal matches between two texts.
+
+        Args:
+            text1 (str): The first text.
+            text2 (str): The second text.
+
+        Returns:
+            list: Matched spans (start1, end1, start2, end2) ordered by their position in the first text.
+        """
+        if self.automaton is None or self.automaton.text is not text1:
+            self.automaton = SuffixAutomaton(text1)
+        matches = self.automaton.maximal_matches(text2, self.min_length)
+        matches.sort(key=lambda match: (match[0] - match[1], match[2]))
+
+        covered1 = np.zeros(len(text1), dtype=bool)
+        covered2 = np.zeros(len(text2), dtype=bool)
+        blocks = []
+        for start1, end1, start2, end2 in matches:
+            if covered1[start1:end1].any() or covered2[start2:end2].any():
+                continue
+            covered1[start1:end1] = True
+            covered2[start2:end2] = True
+            blocks.append((start1, end1, start2, end2))
+        blocks.sort()
+        return blocks
@@ -0,0 +1,124 @@
+# model/tfidf_engine.py
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from model.document_featurizer import pretokenized
+
+class TfidfCosineEngine:
+    """
+    TfidfCosineEngine scores every pair of documents at once by the cosine similarity of their TF-IDF vectors.
+
+    The TF-IDF rows are L2-normalized, so the cosine similarities are a sparse matrix
+    product. The product is computed one block of rows at a time, which bounds the
+    memory used to block_size x number of documents. This is a "quick scan" engine: it
+    compares vocabulary rather than the order of the text.
+
+    The documents are given as lists of words, as produced by DocumentFeaturizer.tokens(),
+    so the words of each document are extracted once and shared with the other stages.
+    """
+    name = "tfidf"
+    # The IDF weights depend on the whole corpus, so adding documents changes the scores of existing pairs
+    corpus_scores = True
+
+    def __init__(self, block_size=512):
+        """
+        Initializes the TfidfCosineEngine.
+
+        Args:
+            block_size (int, optional): Number of documents per block of the similarity matrix. Default is 512.
+        """
+        self.block_size = block_size
+
+    def vectorize(self, documents):
+        """
+        Builds the L2-normalized TF-IDF matrix of the documents.
+
+        Args:
+            documents (list): Words of each document.
+
+        Returns:
+            scipy.sparse.csr_matrix: One row per document, or None if no document has any term.
+        """
+        vectorizer = TfidfVectorizer(sublinear_tf=True, analyzer=pretokenized)
+        try:
+            return vectorizer.fit_transform(documents).tocsr()
+        except ValueError:
+            # Empty vocabulary: no document contains a single term
+            return None
+
+    def iter_blocks(self, documents):
+        """
+        Computes the upper triangle of the cosine similarity matrix block by block.
+
+        Args:
+            documents (list): Words of each document.
+
+        Yields:
+            tuple: (rows, cols, similarities) arrays for the pairs (i, j), i < j, of one block of rows.
+        """
+        matrix = self.vectorize(documents)
+        count = len(documents)
+        for start in range(0, count, self.block_size):
+            end = min(start + self.block_size, count)
+            if matrix is None:
+                block = np.zeros((end - start, count - start))
+            else:
+                block = (matrix[start:end] @ matrix[start:].T).toarray()
+            local_rows, local_cols = np.triu_indices(end - start, k=1, m=count - start)
+            yield local_rows + start, local_cols + start, np.clip(block[local_rows, local_cols], 0.0, 1.0)
+
+    def iter_new_rows(self, documents, new_from):
+        """
+        Computes the similarities between the documents from new_from onwards and all earlier documents.
+
+        Only the rows of the new documents are multiplied, so the cost grows with k * n for k new documents.
+
+        Args:
+            documents (list): Words of each document.
+            new_from (int): Index of the first new document.
+
+        Yields:
+            tuple: (rows, cols, similarities) arrays for the pairs (i, j), i < j, j >= new_from, of one block.
+        """
+        matrix = self.vectorize(documents)
+        count = len(documents)
+        for start in range(new_from, count, self.block_size):
+            end = min(start + self.block_size, count)
+            if matrix is None:
+                block = np.zeros((end - start, end))
+            else:
+                block = (matrix[start:end] @ matrix[:end].T).toarray()
+            local_rows, cols = np.nonzero(np.arange(end)[None, :] < np.arange(start, end)[:, None])
+            yield cols, local_rows + start, np.clip(block[local_rows, cols], 0.0, 1.0)
+
+    def score_pairs(self, documents, pairs=None, new_from=None):
+        """
+        Scores document pairs by their TF-IDF cosine similarity.
+
+        Args:
+            documents (list): Words of each document, indexed by document index.
+            pairs (collection, optional): Pairs of document indices (i, j) to keep. Default is all pairs.
+            new_from (int, optional): Only score the pairs involving a document at this index or later.
+
+        Returns:
+            dict: Mapping of each pair (i, j) to its (ratio, blocks) result, blocks being None.
+        """
+        return dict(self.iter_scores(documents, pairs, new_from))
+
+    def iter_scores(self, documents, pairs=None, new_from=None):
+        """
+        Scores document pairs by their TF-IDF cosine similarity, one block of rows at a time.
+
+        Args:
+            documents (list): Words of each document, indexed by document index.
+            pairs (collection, optional): Pairs of document indices (i, j) to keep. Default is all pairs.
+            new_from (int, optional): Only score the pairs involving a document at this index or later.
+
+        Yields:
+            tuple: (pair, result) with the pair (i, j) and its (ratio, blocks) result, blocks being None.
+        """
+        blocks = self.iter_blocks(documents) if new_from is None else self.iter_new_rows(documents, new_from)
+        for rows, cols, similarities in blocks:
+            for i, j, similarity in zip(rows.tolist(), cols.tolist(), similarities.tolist()):
+                if pairs is None or (i, j) in pairs:
+                    yield (i, j), (similarity, None)
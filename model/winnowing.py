@@ -0,0 +1,148 @@
+# model/winnowing.py
+
+import numpy as np
+
+# Base of the polynomial k-gram hash (arithmetic wraps modulo 2^64)
+HASH_BASE = 1000003
+
+class WinnowingEngine:
+    """
+    WinnowingEngine compares documents by their winnowed k-gram fingerprints (MOSS-style).
+
+    Fingerprints are computed once per document. Comparing two documents is then a
+    set intersection of the precomputed fingerprint hashes, independent of the
+    document length, instead of a character-level diff.
+    """
+    name = "winnowing"
+    # Compares source code files by their canonical token streams (see model/code_tokenizer.py)
+    token_streams = True
+
+    def __init__(self, k=8, window=4):
+        """
+        Initializes the WinnowingEngine with the k-gram length and window size.
+
+        Args:
+            k (int, optional): Length of the k-grams (noise threshold). Default is 8.
+            window (int, optional): Number of consecutive k-grams in each winnowing window. Default is 4.
+        """
+        self.k = k
+        self.window = window
+
+    def normalize(self, text):
+        """
+        Normalizes a text by lowercasing it and removing whitespace and punctuation.
+
+        Args:
+            text (str): The text to normalize.
+
+        Returns:
+            tuple: (codes, positions)
+                - codes (np.ndarray): Code points of the kept characters.
+                - positions (np.ndarray): Offset of each kept character in the original text.
+        """
+        kept = [(ord(char), index) for index, char in enumerate(text.lower()) if char.isalnum()]
+        if not kept:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+        codes, positions = zip(*kept)
+        return np.array(codes, dtype=np.uint64), np.array(positions, dtype=np.int64)
+
+    def prepare(self, text):
+        """
+        Computes the winnowed fingerprints of a text.
+
+        Args:
+            text (str): The text to fingerprint.
+
+        Returns:
+            dict: Fingerprint hashes, their start and end offsets in the original text, and the set of unique hashes.
+        """
+        codes, positions = self.normalize(text)
+        k = self.k
+        if len(codes) < k:
+            empty = np.zeros(0, dtype=np.uint64)
+            return {"hashes": empty, "starts": np.zeros(0, dtype=np.int64), "ends": np.zeros(0, dtype=np.int64), "unique": empty}
+
+        # Polynomial hash of every k-gram, vectorized over the k character offsets
+        kgram_count = len(codes) - k + 1
+        hashes = np.zeros(kgram_count, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for offset in range(k):
+                hashes = hashes * np.uint64(HASH_BASE) + codes[offset:offset + kgram_count]
+
+        # Pick the rightmost minimal hash in every window, skipping repeated selections
+        window = min(self.window, kgram_count)
+        windows = np.lib.stride_tricks.sliding_window_view(hashes, window)
+        selected = window - 1 - np.argmin(windows[:, ::-1], axis=1) + np.arange(len(windows))
+        keep = np.ones(len(selected), dtype=bool)
+        keep[1:] = selected[1:] != selected[:-1]
+        selected = selected[keep]
+
+        return {
+            "hashes": hashes[selected],
+            "starts": positions[selected],
+            "ends": positions[selected + k - 1] + 1,
+            "unique": np.unique(hashes[selected]),
+        }
+
+    def compare(self, features1, features2):
+        """
+        Compares two fingerprinted documents.
+
+        The similarity is the Dice coefficient of the fingerprint sets, 2 * |A & B| / (|A| + |B|),
+        which mirrors the 2 * M / T definition of difflib's ratio.
+
+        Args:
+            features1 (dict): Fingerprints of the first document.
+            features2 (dict): Fingerprints of the second document.
+
+        Returns:
+            tuple: (ratio, blocks)
+                - ratio (float): Similarity ratio between 0.0 and 1.0.
+                - blocks (list): Matched spans (start1, end1, start2, end2) in the original texts.
+        """
+        total = len(features1["unique"]) + len(features2["unique"])
+        if total == 0:
+            return 0.0, []
+        shared = np.intersect1d(features1["unique"], features2["unique"], assume_unique=True)
+        ratio = 2.0 * len(shared) / total
+        return ratio, self.matched_spans(features1, features2, shared)
+
+    def matched_spans(self, features1, features2, shared):
+        """
+        Pairs up the positions of the shared fingerprints in both documents.
+
+        Each shared hash is paired by its first occurrence in each document.
+
+        Args:
+            features1 (dict): Fingerprints of the first document.
+            features2 (dict): Fingerprints of the second document.
+            shared (np.ndarray): Hashes present in both documents.
+
+        Returns:
+            list: Matched spans (start1, end1, start2, end2) ordered by their position in the first document.
+        """
+        if len(shared) == 0:
+            return []
+        first1 = self._first_occurrences(features1["hashes"], shared)
+        first2 = self._first_occurrences(features2["hashes"], shared)
+        blocks = [
+            (int(features1["starts"][i]), int(features1["ends"][i]), int(features2["starts"][j]), int(features2["ends"][j]))
+            for i, j in zip(first1, first2)
+        ]
+        blocks.sort()
+        return blocks
+
+    @staticmethod
+    def _first_occurrences(hashes, shared):
+        """
+        Finds the index of the first occurrence of each shared hash.
+
+        Args:
+            hashes (np.ndarray): Fingerprint hashes of a document in positional order.
+            shared (np.ndarray): Sorted hashes to look up.
+
+        Returns:
+            np.ndarray: Index into hashes for every entry of shared.
+        """
+        unique, first_index = np.unique(hashes, return_index=True)
+        return first_index[np.searchsorted(unique, shared)]
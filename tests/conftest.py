@@ -0,0 +1,77 @@
+# tests/conftest.py
+
+import os
+import random
+import sys
+import pytest
+
+# The modules are imported from the repository root, as when running main.py or cli.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.localization import Localization
+
+WORDS = (
+    "plagiarism similarity document student assignment report analysis method result data system model "
+    "value function process structure example reference table figure section chapter summary evidence "
+    "argument source citation review draft final course lecture topic question answer research study"
+).split()
+
+def make_text(rng, sentences):
+    """
+    Builds a text of random sentences.
+
+    Args:
+        rng (random.Random): Source of the random words.
+        sentences (int): Number of sentences.
+
+    Returns:
+        str: The text.
+    """
+    return ' '.join(
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + '.'
+        for _ in range(sentences)
+    )
+
+@pytest.fixture
+def localization():
+    return Localization("en")
+
+@pytest.fixture
+def corpus():
+    """
+    Twelve prose documents, three of them partial copies of others, keyed by fake paths.
+    """
+    rng = random.Random(0)
+    texts = [make_text(rng, rng.randint(8, 20)) for _ in range(9)]
+    texts.append(texts[0][:len(texts[0]) // 2] + ' ' + make_text(rng, 4))
+    texts.append(texts[3].replace('data', 'facts'))
+    texts.append(make_text(rng, 3) + ' ' + texts[5])
+    return {f"/corpus/student{index:02d}.txt": text for index, text in enumerate(texts)}
+
+@pytest.fixture
+def code_corpus():
+    """
+    Three Python files: a source, a copy with renamed identifiers and an unrelated file.
+    """
+    source = ''.join(
+        f"def compute_{index}(alpha, beta):\n    total = alpha * {index} + beta\n"
+        f"    if total > {index * 3}:\n        return total - beta\n    return [x for x in range(total)]\n\n"
+        for index in range(30)
+    )
+    renamed = source
+    for old, new in (("alpha", "left"), ("beta", "right"), ("total", "acc"), ("compute_", "calc_")):
+        renamed = renamed.replace(old, new)
+    unrelated = ''.join(f"class Record{index}:\n    label = 'item {index}'\n    size = {index * 7}\n\n" for index in range(40))
+    return {"/code/source.py": source, "/code/renamed.py": renamed, "/code/unrelated.py": unrelated}
+
+@pytest.fixture
+def corpus_files(tmp_path, corpus):
+    """
+    The documents of the corpus fixture written to text files, as a list of paths.
+    """
+    paths = []
+    for name, text in corpus.items():
+        path = tmp_path / os.path.basename(name)
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+    return paths
@@ -0,0 +1,49 @@
+# tests/test_document_store.py
+
+import pytest
+from model.document_store import DocumentStore
+
+def test_lookups():
+    store = DocumentStore()
+    first = store.add("/a/report.txt", "first text")
+    second = store.add("/b/report.txt", "second text")
+    store.add("/b/notes.txt", "")
+
+    assert store["/b/report.txt"] == "second text"
+    assert store.text(first) == "first text"
+    assert store.id_of("/b/report.txt") == second
+    assert store.path_of(first) == "/a/report.txt"
+    # A basename refers to the first document having it
+    assert store.by_basename("report.txt") == "first text"
+    assert store["/b/notes.txt"] == ""
+    assert list(store) == ["/a/report.txt", "/b/report.txt", "/b/notes.txt"]
+    assert len(store) == 3 and "/a/report.txt" in store and "/c.txt" not in store
+    store.clear()
+
+def test_replacing_a_document_keeps_its_id():
+    store = DocumentStore()
+    doc_id = store.add("/a.txt", "old")
+    # The spill file grows after it was mapped
+    assert store.text(doc_id) == "old"
+    assert store.add("/a.txt", "new text " * 1000) == doc_id
+    assert store["/a.txt"] == "new text " * 1000
+    assert len(store) == 1
+    store.clear()
+
+def test_unicode_round_trip():
+    store = DocumentStore()
+    text = "Kemiripan dokumen éè 中文 \U0001F600 \ud800"
+    store.add("/u.txt", text)
+    assert store["/u.txt"] == text
+    store.clear()
+
+def test_clear():
+    store = DocumentStore()
+    store.add("/a.txt", "text")
+    store.clear()
+    assert len(store) == 0
+    with pytest.raises(KeyError):
+        store["/a.txt"]
+    store.add("/b.txt", "again")
+    assert store["/b.txt"] == "again"
+    store.clear()
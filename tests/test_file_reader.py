@@ -0,0 +1,26 @@
+# tests/test_file_reader.py
+
+from benchmarks.corpus import write_pdf
+from model.extraction_cache import ExtractionCache
+from model.file_reader import FileReader
+
+PARAGRAPHS = [f"Paragraph {index} of the cached report." for index in range(20)]
+
+def test_extracted_texts_are_cached(tmp_path, localization):
+    path = str(tmp_path / "report.pdf")
+    write_pdf(path, PARAGRAPHS)
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"), 1 << 20)
+    reader = FileReader(localization, cache=cache)
+
+    text = reader.read_file(path)
+    assert reader.read_file(path) == text
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_a_broken_cache_does_not_fail_the_read(tmp_path, localization):
+    path = str(tmp_path / "report.pdf")
+    write_pdf(path, PARAGRAPHS)
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"), 1 << 20)
+    cache.connection.close()
+
+    text = FileReader(localization, cache=cache).read_file(path)
+    assert "Paragraph 0 " in text
@@ -0,0 +1,27 @@
+# tests/test_line_index.py
+
+from utils.line_index import LineIndex
+
+def test_positions_follow_tk_indices():
+    index = LineIndex("first\nsecond\n")
+    assert index.line_count() == 3
+    assert index.tk_index(0) == "1.0"
+    assert index.tk_index(8) == "2.2"
+    assert index.tk_index(13) == "3.0"
+
+def test_chunks_end_at_line_starts():
+    text = "alpha\nbeta\ngamma\n"
+    index = LineIndex(text)
+    assert index.chunk_end(0, 8) == 6
+    assert index.chunk_end(6, 8) == 11
+    assert index.chunk_end(11, 8) == len(text)
+
+def test_long_lines_are_split_across_chunks():
+    text = "x" * 25 + "\nend" + "y" * 12
+    index = LineIndex(text)
+    ends, start = [], 0
+    while start < len(text):
+        start = index.chunk_end(start, 10)
+        ends.append(start)
+    assert ends == [10, 20, 26, 36, 41]
+    assert LineIndex("").chunk_end(0, 10) == 0
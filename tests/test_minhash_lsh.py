@@ -0,0 +1,36 @@
+# tests/test_minhash_lsh.py
+
+import numpy as np
+from model.minhash_lsh import MinHashLSH
+
+def test_signature_ignores_case_and_whitespace():
+    lsh = MinHashLSH(num_perm=64)
+    np.testing.assert_array_equal(
+        lsh.signature("The quick  brown\nfox jumps"), lsh.signature("the quick brown fox JUMPS")
+    )
+
+def test_signature_of_empty_text():
+    lsh = MinHashLSH(num_perm=16)
+    assert lsh.signature("").shape == (16,)
+    assert lsh.shingle("").size == 0
+
+def test_band_parameters_fit_the_signature():
+    lsh = MinHashLSH(num_perm=128)
+    for bound in (0.2, 0.5, 0.8):
+        bands, rows = lsh.band_parameters(bound)
+        assert bands * rows <= 128
+        assert (1.0 / bands) ** (1.0 / rows) <= bound
+
+def test_candidate_pairs(corpus):
+    lsh = MinHashLSH(num_perm=128)
+    texts = list(corpus.values())
+    signatures = [lsh.signature(text) for text in texts]
+    candidates = lsh.candidate_pairs(signatures, 0.5)
+
+    # Document 10 is document 3 with one word replaced
+    assert (3, 10) in candidates
+    assert all(i < j for i, j in candidates)
+
+    # Only the pairs involving the documents from new_from onwards
+    new_pairs = lsh.candidate_pairs(signatures, 0.5, new_from=10)
+    assert new_pairs == {(i, j) for i, j in candidates if j >= 10}
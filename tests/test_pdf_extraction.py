@@ -0,0 +1,72 @@
+# tests/test_pdf_extraction.py
+
+import threading
+import time
+import pytest
+from benchmarks.corpus import write_pdf
+from model.pdf_extraction import PdfExtractor
+
+PARAGRAPHS = [f"Paragraph {index} of the report on plagiarism detection in student assignments." for index in range(120)]
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "report.pdf"
+    write_pdf(str(path), PARAGRAPHS)
+    return str(path)
+
+def test_pages_are_extracted_in_order(pdf_path):
+    # One page per task, so the pages are spread over several processes
+    text = PdfExtractor(workers=2, pages_per_task=1).extract(pdf_path)
+    positions = [text.index(f"Paragraph {index} ") for index in range(len(PARAGRAPHS))]
+    assert positions == sorted(positions)
+
+def test_parser_errors_are_reported(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"this is not a PDF")
+    extractor = PdfExtractor(workers=1)
+    with pytest.raises(Exception):
+        extractor.extract(str(path))
+    # The slot of the failed process is released
+    assert extractor.slots.acquire(blocking=False)
+
+def test_timeout(pdf_path):
+    extractor = PdfExtractor(workers=1, timeout=0.001)
+    with pytest.raises(TimeoutError):
+        extractor.extract(pdf_path)
+    assert extractor.slots.acquire(blocking=False)
+
+def test_time_waiting_for_a_slot_is_not_counted(pdf_path):
+    extractor = PdfExtractor(workers=1, timeout=1)
+    # Another file holds the only slot for longer than the timeout
+    extractor.slots.acquire()
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(text=extractor.extract(pdf_path)))
+    thread.start()
+    time.sleep(1.5)
+    extractor.slots.release()
+    thread.join(30)
+    assert "Paragraph 0 " in result["text"]
+
+class DelayedSlots(threading.BoundedSemaphore):
+    """
+    Slots of which the given acquisition waits, as if another file held the slot.
+    """
+    def __init__(self, value, delayed_call, delay):
+        super().__init__(value)
+        self.calls = 0
+        self.delayed_call = delayed_call
+        self.delay = delay
+
+    def acquire(self, blocking=True, timeout=None):
+        self.calls += 1
+        if self.calls == self.delayed_call:
+            time.sleep(self.delay)
+        return super().acquire(blocking, timeout)
+
+def test_time_a_later_range_waits_for_a_slot_is_not_counted(pdf_path):
+    # Two page ranges; the second one waits for the only slot for longer than the timeout
+    extractor = PdfExtractor(workers=1, timeout=1, pages_per_task=3)
+    extractor.slots = DelayedSlots(1, delayed_call=2, delay=1.5)
+    text = extractor.extract(pdf_path)
+    assert extractor.slots.calls == 2
+    assert "Paragraph 0 " in text and f"Paragraph {len(PARAGRAPHS) - 1} " in text
@@ -0,0 +1,136 @@
+# tests/test_plagiarism_checker.py
+
+import difflib
+import itertools
+import os
+import numpy as np
+import pytest
+from model.document_featurizer import DocumentFeaturizer
+from model.parallel_scoring import ParallelScorer
+from model.plagiarism_checker import PlagiarismChecker
+from model.similarity_matrix import SCORED
+
+def reduction_table(df_reduction):
+    """
+    Returns the score reductions of a reduction table keyed by file name.
+    """
+    return dict(zip(df_reduction.iloc[:, 0], df_reduction.iloc[:, 1]))
+
+def test_sequence_engine_matches_baseline(corpus, localization):
+    # The original implementation: difflib ratio of every pair of raw texts
+    checker = PlagiarismChecker(localization)
+    similarity_matrix, df_reduction = checker.process_plagiarism(corpus, 60, 20, engine="sequence")
+
+    names = list(corpus)
+    expected_reductions = {os.path.basename(name): 0.0 for name in names}
+    for (i, name1), (j, name2) in itertools.combinations(enumerate(names), 2):
+        ratio = difflib.SequenceMatcher(None, corpus[name1], corpus[name2]).ratio()
+        index = similarity_matrix.pair_index(np.array([i]), np.array([j]))[0]
+        assert similarity_matrix.percentages(index) == pytest.approx(round(ratio * 100, 2), abs=1e-3)
+        reduction = checker.calculate_reduction(ratio * 100, 60, 20)
+        for name in (name1, name2):
+            expected_reductions[os.path.basename(name)] = max(expected_reductions[os.path.basename(name)], reduction)
+
+    reductions = reduction_table(df_reduction)
+    for name, reduction in expected_reductions.items():
+        assert reductions[name] == pytest.approx(reduction, abs=0.01)
+    assert max(reductions.values()) > 0
+
+def test_requires_two_files(localization):
+    with pytest.raises(ValueError):
+        PlagiarismChecker(localization).process_plagiarism({"/a.txt": "text"}, 80, 20)
+
+@pytest.mark.parametrize("engine", ["sequence", "winnowing", "suffix"])
+def test_parallel_matches_serial(corpus, localization, engine):
+    checker = PlagiarismChecker(localization)
+    serial, serial_reduction = checker.process_plagiarism(corpus, 60, 20, engine=engine, workers=1)
+    serial_blocks = dict(checker.match_blocks)
+    parallel, parallel_reduction = checker.process_plagiarism(corpus, 60, 20, engine=engine, workers=2)
+
+    np.testing.assert_array_equal(serial.scores, parallel.scores)
+    np.testing.assert_array_equal(serial.status, parallel.status)
+    assert reduction_table(serial_reduction) == reduction_table(parallel_reduction)
+    assert serial_blocks == checker.match_blocks
+
+def test_parallel_scoring_with_a_small_feature_cache(corpus):
+    texts = list(corpus.values())
+    pairs = list(itertools.combinations(range(len(texts)), 2))
+    # Room for a single document's features, so the workers keep evicting them
+    scorer = ParallelScorer("winnowing", 2, tile_size=4, max_bytes=2)
+    results = scorer.score(texts, pairs)
+    serial = ParallelScorer("winnowing", 1).score(texts, pairs)
+    assert results == serial
+    assert set(results) == set(pairs)
+
+@pytest.mark.parametrize("engine", ["sequence", "winnowing"])
+def test_serial_scoring_within_a_small_feature_budget(corpus, code_corpus, localization, engine):
+    documents = dict(corpus, **code_corpus)
+    checker = PlagiarismChecker(localization)
+    expected, expected_reduction = checker.process_plagiarism(documents, 60, 20, engine=engine)
+    expected_blocks = dict(checker.match_blocks)
+
+    # Room for the features of a single document, so every row is a band of its own
+    checker.featurizer.max_bytes = 1
+    similarity_matrix, df_reduction = checker.process_plagiarism(documents, 60, 20, engine=engine)
+    np.testing.assert_array_equal(similarity_matrix.scores, expected.scores)
+    assert reduction_table(df_reduction) == reduction_table(expected_reduction)
+    assert checker.match_blocks == expected_blocks
+
+@pytest.mark.parametrize("engine", ["sequence", "winnowing", "tfidf"])
+@pytest.mark.parametrize("use_candidates", [False, True])
+def test_incremental_matches_full_run(corpus, localization, engine, use_candidates):
+    names = list(corpus)
+    checker = PlagiarismChecker(localization)
+    full, full_reduction = checker.process_plagiarism(corpus, 60, 20, use_candidates=use_candidates, engine=engine)
+
+    checker.process_plagiarism(
+        {name: corpus[name] for name in names[:7]}, 60, 20, use_candidates=use_candidates, engine=engine, keep_state=True
+    )
+    extended, extended_reduction = checker.extend_plagiarism(
+        checker.run_state, {name: corpus[name] for name in names[7:]}, 60, 20
+    )
+
+    assert extended.file_names == full.file_names
+    np.testing.assert_allclose(extended.scores, full.scores, rtol=1e-6, equal_nan=True)
+    np.testing.assert_array_equal(extended.status, full.status)
+    assert reduction_table(extended_reduction) == pytest.approx(reduction_table(full_reduction))
+
+def test_candidates_keep_renamed_code_copies(code_corpus, localization):
+    checker = PlagiarismChecker(localization)
+    similarity_matrix, _ = checker.process_plagiarism(code_corpus, 80, 20, use_candidates=True, engine="winnowing")
+
+    # Signatures are computed over the token streams, so renaming identifiers does not hide the copy
+    assert similarity_matrix.status[0] == SCORED
+    assert similarity_matrix.percentages(0) == 100.0
+
+def test_streamed_rows_match_matrix(corpus, localization):
+    checker = PlagiarismChecker(localization)
+    similarity_matrix, df_reduction = checker.process_plagiarism(corpus, 60, 20, engine="winnowing")
+    rows = []
+    _, streamed_reduction = checker.process_plagiarism(corpus, 60, 20, engine="winnowing", row_sink=rows.extend)
+
+    assert len(rows) == len(similarity_matrix)
+    assert sorted(similarity for _, _, similarity, _ in rows) == sorted(similarity_matrix.percentages().tolist())
+    assert reduction_table(streamed_reduction) == reduction_table(df_reduction)
+
+def test_report_floor_requires_a_tiered_engine(corpus, localization):
+    with pytest.raises(ValueError):
+        PlagiarismChecker(localization).process_plagiarism(corpus, 60, 20, engine="winnowing", report_floor=30)
+
+def test_length_tier_counts_only_candidate_pairs(corpus, localization):
+    checker = PlagiarismChecker(localization)
+    checker.process_plagiarism(corpus, 60, 20, use_candidates=True, engine="sequence", report_floor=90)
+    stats = checker.pruning_stats
+    similarity_matrix, _ = checker.process_plagiarism(corpus, 60, 20, use_candidates=True, engine="sequence")
+
+    # Every pair the tiers eliminated went through the candidate stage
+    candidates = int(np.count_nonzero(similarity_matrix.status == SCORED))
+    assert sum(stats.values()) == candidates
+
+def test_terms_hash_the_document_once(monkeypatch):
+    featurizer = DocumentFeaturizer(stop_words={"the"})
+    calls = []
+    document = featurizer.document
+    monkeypatch.setattr(featurizer, "document", lambda text: calls.append(text) or document(text))
+    assert featurizer.terms("The cat saw the dog") == ["cat", "saw", "dog"]
+    assert len(calls) == 1
@@ -0,0 +1,95 @@
+# tests/test_result_export.py
+
+import csv
+import cli
+import openpyxl
+import pandas as pd
+import pytest
+import model.result_export as result_export
+from model.result_export import ResultExporter, REDUCTION_KEYS, column_types, companion_path
+
+SIMILARITY_KEYS = ("file_1", "file_2", "similarity_percent", "status", "cluster")
+SIMILARITY_COLUMNS = ["File 1", "File 2", "Similarity (%)", "Status", "Cluster"]
+REDUCTION_COLUMNS = ["File Name", "Score Reduction Percentage (%)", "Cluster"]
+
+def make_exporter(path, output_format):
+    return ResultExporter(
+        str(path), output_format, SIMILARITY_COLUMNS, REDUCTION_COLUMNS,
+        column_types(SIMILARITY_KEYS), column_types(REDUCTION_KEYS)
+    )
+
+def similarity_rows(count):
+    return [(f"a{index}.txt", f"b{index}.txt", float(index), "", index % 3) for index in range(count)]
+
+def test_xlsx_splits_the_similarity_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_export, "EXCEL_MAX_ROWS", 4)
+    path = tmp_path / "results.xlsx"
+    exporter = make_exporter(path, 'xlsx')
+    exporter.write_similarity(similarity_rows(7))
+    exporter.write_frame('reduction', pd.DataFrame([["a0.txt", 1.5, 0]], columns=REDUCTION_COLUMNS))
+    exporter.close()
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    assert workbook.sheetnames == ["Score Deduction", "Similarity", "Similarity (2)", "Similarity (3)"]
+    rows = [row for name in workbook.sheetnames[1:] for row in workbook[name].iter_rows(values_only=True)]
+    assert rows.count(tuple(SIMILARITY_COLUMNS)) == 3
+    assert len(rows) == 7 + 3
+    assert exporter.similarity_rows == 7
+
+def test_csv_writes_a_companion_file(tmp_path):
+    path = tmp_path / "results.csv"
+    exporter = make_exporter(path, 'csv')
+    exporter.write_similarity(similarity_rows(3))
+    # Missing values (NaN) are written as empty cells
+    exporter.write_frame('reduction', pd.DataFrame([["a0.txt", float('nan'), 1]], columns=REDUCTION_COLUMNS))
+    exporter.close()
+
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        assert list(csv.reader(csv_file))[0] == SIMILARITY_COLUMNS
+    with open(companion_path(str(path), 'score_deduction'), newline='', encoding='utf-8') as csv_file:
+        assert list(csv.reader(csv_file)) == [REDUCTION_COLUMNS, ["a0.txt", "", "1"]]
+
+def test_missing_directory_fails_before_writing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        make_exporter(tmp_path / "missing" / "results.xlsx", 'xlsx')
+
+def test_discarded_workbook_is_not_saved(tmp_path):
+    path = tmp_path / "results.xlsx"
+    exporter = make_exporter(path, 'xlsx')
+    exporter.write_similarity(similarity_rows(3))
+    exporter.discard()
+    assert not path.exists()
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        make_exporter(tmp_path / "results.txt", 'txt')
+
+def test_parquet_schema_does_not_depend_on_the_first_chunk(tmp_path, monkeypatch):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(result_export, "EXPORT_CHUNK_ROWS", 2)
+    path = tmp_path / "results.parquet"
+    exporter = make_exporter(path, 'parquet')
+    # The first chunk has no similarity and no cluster
+    exporter.write_similarity([("a.txt", "b.txt", None, "below", "N/A"), ("a.txt", "c.txt", None, "below", "N/A")])
+    exporter.write_similarity(similarity_rows(3))
+    exporter.write_reduction([("a.txt", 0.5, 2)])
+    exporter.close()
+
+    table = pyarrow_parquet.read_table(path)
+    assert [str(field.type) for field in table.schema] == ["string", "string", "double", "string", "int64"]
+    assert table.column("Similarity (%)").to_pylist() == [None, None, 0.0, 1.0, 2.0]
+    assert table.column("Cluster").to_pylist() == [None, None, 0, 1, 2]
+
+def test_streamed_and_state_exports_have_the_same_columns(tmp_path, corpus_files):
+    # A reporting floor low enough that every pair is still scored
+    options = ["--engine", "sequence", "--report-floor", "1", "--no-cache"]
+    streamed, sorted_output = tmp_path / "streamed.csv", tmp_path / "sorted.csv"
+    assert cli.main(corpus_files + ["--output", str(streamed)] + options) == 0
+    assert cli.main(corpus_files + ["--output", str(sorted_output), "--state", str(tmp_path / "run.state")] + options) == 0
+
+    streamed_rows, sorted_rows = pd.read_csv(streamed), pd.read_csv(sorted_output)
+    assert list(streamed_rows.columns) == list(sorted_rows.columns) == SIMILARITY_COLUMNS
+    # Only the run that keeps its similarity matrix sorts the rows
+    similarity = SIMILARITY_COLUMNS[2]
+    assert sorted_rows[similarity].is_monotonic_decreasing
+    assert sorted(streamed_rows[similarity]) == sorted(sorted_rows[similarity])
@@ -0,0 +1,115 @@
+# tests/test_run_state.py
+
+import gzip
+import itertools
+import os
+import pickle
+import numpy as np
+import pytest
+from controller.plagiarism_controller import PlagiarismController
+from model.plagiarism_checker import PlagiarismChecker
+from model.run_state import RunState
+
+def test_documents_are_kept_compressed():
+    state = RunState("winnowing")
+    state.add_document("/a.txt", "alpha " * 100)
+    state.add_document("/b.txt", "")
+    assert state.file_names == ["/a.txt", "/b.txt"]
+    assert state.text(0) == "alpha " * 100
+    assert state.texts() == ["alpha " * 100, ""]
+
+def test_matches_scoring_settings():
+    state = RunState("sequence", use_candidates=True, bound_ratio=0.5, report_floor=30.0)
+    state.threshold = 80.0
+    assert state.matches("sequence", True, 30.0, 0.5, 80.0)
+    assert not state.matches("winnowing", True, 30.0, 0.5, 80.0)
+    assert not state.matches("sequence", False, 30.0, 0.5, 80.0)
+    assert not state.matches("sequence", True, None, 0.5, 80.0)
+    assert not state.matches("sequence", True, 30.0, 0.6, 80.0)
+    # The candidate bound depends on the threshold
+    assert not state.matches("sequence", True, 30.0, 0.5, 70.0)
+
+    state = RunState("sequence")
+    state.threshold = 80.0
+    assert state.matches("sequence", False, None, 0.5, 70.0)
+
+def test_save_and_load(tmp_path, corpus, localization):
+    checker = PlagiarismChecker(localization)
+    similarity_matrix, df_reduction = checker.process_plagiarism(corpus, 60, 20, use_candidates=True, engine="winnowing", keep_state=True)
+    state = checker.run_state
+    state.file_hashes = {name: "digest" for name in corpus}
+    state.cluster_model = {"vocabulary": {"alpha": 0, "beta": 1}, "idf": np.ones(2), "centers": np.eye(2)}
+    state.file_cluster_mapping = {os.path.basename(name): np.int32(index % 2) for index, name in enumerate(corpus)}
+    path = tmp_path / "run.state"
+    state.save(str(path))
+
+    loaded = RunState.load(str(path))
+    assert loaded.file_names == list(corpus)
+    assert loaded.texts() == list(corpus.values())
+    assert loaded.candidates == state.candidates
+    np.testing.assert_array_equal(np.stack(loaded.signatures), np.stack(state.signatures))
+    np.testing.assert_array_equal(loaded.similarity_matrix.scores, similarity_matrix.scores)
+    np.testing.assert_array_equal(loaded.similarity_matrix.status, similarity_matrix.status)
+    assert loaded.match_blocks == {key: [tuple(block) for block in blocks] for key, blocks in state.match_blocks.items()}
+    assert loaded.df_reduction.equals(df_reduction)
+    assert loaded.file_hashes == state.file_hashes
+    assert loaded.file_cluster_mapping == state.file_cluster_mapping
+    np.testing.assert_array_equal(loaded.cluster_model["centers"], np.eye(2))
+    assert (loaded.engine, loaded.use_candidates, loaded.threshold) == ("winnowing", True, 60)
+
+def test_rejects_other_versions(tmp_path):
+    path = tmp_path / "old.state"
+    RunState.version -= 1
+    try:
+        RunState("sequence").save(str(path))
+    finally:
+        RunState.version += 1
+    with pytest.raises(ValueError):
+        RunState.load(str(path))
+
+def test_rejects_pickles(tmp_path):
+    # Older state files were pickles, which can run code when loaded
+    path = tmp_path / "pickled.state"
+    with gzip.open(path, 'wb') as state_file:
+        pickle.dump(RunState("sequence"), state_file)
+    with pytest.raises(ValueError):
+        RunState.load(str(path))
+
+def test_other_settings_start_a_full_run(tmp_path, corpus, corpus_files, localization):
+    paths = corpus_files
+    state_file = str(tmp_path / "run.state")
+    controller = PlagiarismController(localization, cache_path=None)
+    _, error = controller.run_plagiarism_process(paths[:6], "60", "20", str(tmp_path / "out.xlsx"), engine="winnowing", state_file=state_file)
+    assert error is None and not controller.state_reset
+
+    result, error = controller.run_plagiarism_process(paths, "60", "20", str(tmp_path / "out.xlsx"), engine="sequence", state_file=state_file)
+    assert error is None and controller.state_reset
+    expected, _ = PlagiarismChecker(localization).process_plagiarism(dict(zip(paths, corpus.values())), 60, 20, engine="sequence")
+    np.testing.assert_array_equal(result[0].scores, expected.scores)
+    assert RunState.load(state_file).engine == "sequence"
+
+def test_changed_and_deselected_files_leave_the_state(tmp_path, corpus_files, localization):
+    paths = corpus_files
+    state_file = str(tmp_path / "run.state")
+    controller = PlagiarismController(localization, cache_path=None)
+    _, error = controller.run_plagiarism_process(paths[:9], "60", "20", str(tmp_path / "out.xlsx"), state_file=state_file)
+    assert error is None
+
+    # Document 2 changes, document 1 is deselected and documents 9 to 11 are new
+    with open(paths[2], 'a', encoding='utf-8') as changed:
+        changed.write(" An added closing sentence.")
+    selection = [paths[0]] + paths[2:]
+    result, error = controller.run_plagiarism_process(selection, "60", "20", str(tmp_path / "out.xlsx"), state_file=state_file)
+    assert error is None
+    assert controller.state_changes == {"added": 3, "rescored": 1, "removed": 1}
+
+    similarity_matrix, df_reduction = result[0], result[1]
+    # The changed document is scored again as a new one, after the unchanged ones
+    assert similarity_matrix.file_names == [paths[0]] + paths[3:9] + [paths[2]] + paths[9:]
+    contents = {path: open(path, encoding='utf-8').read() for path in similarity_matrix.file_names}
+    expected, expected_reduction = PlagiarismChecker(localization).process_plagiarism(contents, 60, 20)
+    np.testing.assert_array_equal(similarity_matrix.scores, expected.scores)
+    assert df_reduction.equals(expected_reduction)
+
+    state = RunState.load(state_file)
+    assert state.file_hashes.keys() == set(selection)
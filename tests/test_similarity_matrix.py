@@ -0,0 +1,81 @@
+# tests/test_similarity_matrix.py
+
+import itertools
+import numpy as np
+import pytest
+from model.similarity_matrix import SimilarityMatrix, SCORED, BELOW_CANDIDATE_BOUND, BELOW_REPORTING_FLOOR
+
+def filled_matrix(count, seed=0):
+    matrix = SimilarityMatrix([f"/files/doc{index}.txt" for index in range(count)])
+    pairs = list(itertools.combinations(range(count), 2))
+    ratios = np.random.RandomState(seed).rand(len(pairs)).tolist()
+    matrix.set_scores(pairs, ratios)
+    return matrix, pairs, ratios
+
+def test_pair_index_follows_combinations():
+    matrix, pairs, _ = filled_matrix(7)
+    rows, cols = np.array(pairs).T
+    np.testing.assert_array_equal(matrix.pair_index(rows, cols), np.arange(len(pairs)))
+    assert len(matrix) == len(pairs)
+
+def test_iter_blocks_cover_every_pair():
+    matrix, pairs, _ = filled_matrix(9)
+    seen = []
+    for rows, cols, block in matrix.iter_blocks(chunk_rows=5):
+        assert len(rows) == block.stop - block.start
+        seen.extend(zip(rows.tolist(), cols.tolist()))
+    assert seen == pairs
+
+def test_reductions_use_unrounded_scores():
+    matrix = SimilarityMatrix(["/a.txt", "/b.txt", "/c.txt"])
+    matrix.set_scores([(0, 1)], [0.80255])
+    reductions = matrix.reductions(80, 20)
+    # (80.255 - 80) / 20 * 20, where the rounded percentage 80.26 would give 0.26
+    assert reductions[0] == pytest.approx(0.255, abs=1e-4)
+    assert reductions[2] == 0.0
+    assert matrix.percentages(0) == 80.26
+
+def test_reductions_match_pairwise_maximum():
+    matrix, pairs, ratios = filled_matrix(12, seed=3)
+    expected = np.zeros(12)
+    for (i, j), ratio in zip(pairs, ratios):
+        percent = np.float32(ratio) * 100.0
+        reduction = 0.0 if percent <= 50 else (percent - 50) / 50 * 10
+        expected[i], expected[j] = max(expected[i], reduction), max(expected[j], reduction)
+    np.testing.assert_allclose(matrix.reductions(50, 10), expected, rtol=1e-6)
+
+def test_unscored_pairs_have_a_status():
+    matrix = SimilarityMatrix(["/a.txt", "/b.txt", "/c.txt"])
+    matrix.mark_candidates({(0, 1), (1, 2)})
+    matrix.set_scores([(0, 1), (1, 2)], [0.9, None])
+    assert matrix.status.tolist() == [SCORED, BELOW_CANDIDATE_BOUND, BELOW_REPORTING_FLOOR]
+    assert matrix.has_status()
+    assert np.isnan(matrix.percentages(1))
+    assert matrix.reductions(80, 20).tolist() == pytest.approx([10.0, 10.0, 0.0])
+
+def test_extended_keeps_scores():
+    matrix, pairs, _ = filled_matrix(5)
+    extended = matrix.extended(matrix.file_names + ["/files/new.txt"])
+    rows, cols = np.array(pairs).T
+    np.testing.assert_array_equal(extended.scores[extended.pair_index(rows, cols)], matrix.scores)
+    assert len(extended) == 15
+
+def test_subset_keeps_the_pairs_between_kept_documents():
+    matrix, _, _ = filled_matrix(6)
+    matrix.status[0] = BELOW_CANDIDATE_BOUND
+    kept = [0, 1, 3, 5]
+    subset = matrix.subset(kept)
+    assert subset.file_names == [matrix.file_names[index] for index in kept]
+    rows, cols = np.array(list(itertools.combinations(kept, 2))).T
+    np.testing.assert_array_equal(subset.scores, matrix.scores[matrix.pair_index(rows, cols)])
+    np.testing.assert_array_equal(subset.status, matrix.status[matrix.pair_index(rows, cols)])
+
+def test_tables_are_sorted_and_chunked(localization):
+    matrix, _, _ = filled_matrix(10)
+    frame = matrix.to_frame(localization, {"doc0.txt": 1})
+    column = localization.get("similarity_percent")
+    assert list(frame.columns) == matrix.columns(localization, cluster=True)
+    assert frame[column].is_monotonic_decreasing
+    chunks = list(matrix.iter_tables(localization, chunk_rows=7))
+    assert [len(chunk) for chunk in chunks] == [7] * 6 + [3]
+    assert np.concatenate([chunk[column].to_numpy() for chunk in chunks]).tolist() == frame[column].tolist()
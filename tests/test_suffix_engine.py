@@ -0,0 +1,34 @@
+# tests/test_suffix_engine.py
+
+import random
+from model.suffix_engine import SuffixAutomaton, SuffixAutomatonEngine
+
+def brute_force_matches(text1, text2, min_length):
+    """
+    Finds the maximal matches of text2 in text1 by trying every substring, for small texts.
+    """
+    matches = []
+    for end2 in range(1, len(text2) + 1):
+        length = max((size for size in range(1, end2 + 1) if text2[end2 - size:end2] in text1), default=0)
+        longer = end2 < len(text2) and text2[end2 - length:end2 + 1] in text1
+        if length >= min_length and not longer:
+            matches.append((end2 - length, end2))
+    return matches
+
+def test_maximal_matches_agree_with_brute_force():
+    generator = random.Random(7)
+    for _ in range(200):
+        text1 = "".join(generator.choice("ab é") for _ in range(generator.randint(0, 40)))
+        text2 = "".join(generator.choice("abc é") for _ in range(generator.randint(0, 40)))
+        matches = SuffixAutomaton(text1).maximal_matches(text2, 2)
+        assert [(start2, end2) for _, _, start2, end2 in matches] == brute_force_matches(text1, text2, 2)
+        for start1, end1, start2, end2 in matches:
+            assert text1[start1:end1] == text2[start2:end2]
+
+def test_blocks_point_at_shared_text(corpus):
+    texts = list(corpus.values())
+    # Document 9 starts with the first half of document 0
+    ratio, blocks = SuffixAutomatonEngine().compare(texts[0], texts[9])
+    assert 0 < ratio < 1
+    for start1, end1, start2, end2 in blocks:
+        assert texts[0][start1:end1] == texts[9][start2:end2]
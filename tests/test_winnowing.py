@@ -0,0 +1,40 @@
+# tests/test_winnowing.py
+
+import pytest
+from model.winnowing import WinnowingEngine
+
+def test_identical_texts():
+    engine = WinnowingEngine()
+    features = engine.prepare("Students must cite every source they use in the final report.")
+    ratio, blocks = engine.compare(features, features)
+    assert ratio == 1.0
+    assert blocks
+
+def test_formatting_does_not_change_the_fingerprints():
+    engine = WinnowingEngine()
+    ratio, _ = engine.compare(
+        engine.prepare("Students must cite every source they use."),
+        engine.prepare("STUDENTS must, cite every\nsource they use!")
+    )
+    assert ratio == 1.0
+
+def test_blocks_point_at_shared_text(corpus):
+    engine = WinnowingEngine()
+    texts = list(corpus.values())
+    # Document 9 starts with the first half of document 0
+    text1, text2 = texts[0], texts[9]
+    ratio, blocks = engine.compare(engine.prepare(text1), engine.prepare(text2))
+    assert 0 < ratio < 1
+    for start1, end1, start2, end2 in blocks:
+        assert text1[start1:end1].lower() == text2[start2:end2].lower()
+
+def test_short_texts():
+    engine = WinnowingEngine(k=8)
+    assert engine.compare(engine.prepare("short"), engine.prepare("")) == (0.0, [])
+
+@pytest.mark.parametrize("k, window", [(5, 1), (8, 4), (12, 10)])
+def test_ratio_is_symmetric(corpus, k, window):
+    engine = WinnowingEngine(k=k, window=window)
+    texts = list(corpus.values())
+    features1, features2 = engine.prepare(texts[3]), engine.prepare(texts[10])
+    assert engine.compare(features1, features2)[0] == engine.compare(features2, features1)[0]
@@ -1,5 +1,7 @@
 # /utils/constants.py
 
+import os
+
 # List of programming extensions that will be used to filter files
 PROGRAMMING_EXTENSIONS = [
     '.py', '.java', '.js', '.c', '.cpp', '.h', '.hpp', 
@@ -10,5 +12,56 @@ PROGRAMMING_EXTENSIONS = [
 THRESHOLD_DEFAULT = 80.0
 MAX_REDUCTION_DEFAULT = 20.0
 
+# Persistent cache of texts extracted from PDF and DOCX files
+EXTRACTION_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "spark", "extraction_cache.sqlite3")
+EXTRACTION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# PDF extraction: pages extracted per worker process, wall-clock limit per file (seconds),
+# and memory a worker process may allocate (bytes, not enforced on Windows)
+PDF_PAGES_PER_TASK = 8
+PDF_TIMEOUT_SECONDS = 120
+PDF_MEMORY_LIMIT_BYTES = 1024 * 1024 * 1024
+
+# MinHash/LSH candidate stage: the Jaccard bound is the threshold scaled by this ratio,
+# because shingle Jaccard similarity runs lower than the character-level similarity ratio
+LSH_NUM_PERM = 128
+LSH_SHINGLE_SIZE = 5
+LSH_BOUND_RATIO = 0.5
+
+# Similarity engines selectable in process_plagiarism (see model/similarity_engines.py)
+ENGINE_DEFAULT = "sequence"
+
+# Number of worker processes used to score file pairs (1 scores them serially)
+WORKERS_DEFAULT = 1
+
+# File clustering: corpus size above which MiniBatchKMeans is used with this batch size,
+# and vocabulary cap of those larger corpora
+CLUSTER_MAX_FEATURES = 100000
+CLUSTER_BATCH_SIZE = 1024
+
+# Approximate size of the document features (normalized text, tokens, terms, code token streams)
+# cached by the DocumentFeaturizer during a run, in bytes
+FEATURIZER_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Number of file pairs whose match blocks are kept for the comparison window
+MATCH_BLOCK_CACHE_SIZE = 32
+
+# Texts longer than this are loaded into the text windows in chunks of LAZY_RENDER_CHUNK_CHARS characters
+LAZY_RENDER_CHARS = 1024 * 1024
+LAZY_RENDER_CHUNK_CHARS = 256 * 1024
+# Number of ranges tagged per tag_add call when highlighting
+TAG_BATCH_SIZE = 500
+
+# Result export: rows per sheet of an XLSX file (header included), and rows written per chunk
+EXCEL_MAX_ROWS = 1048576
+EXPORT_CHUNK_ROWS = 10000
+
+# Stages of a run recorded by the StageTimer, and number of functions listed in the cProfile report of a profiled stage
+PIPELINE_STAGES = ('read', 'score', 'cluster', 'export', 'save_state')
+PROFILE_TOP_FUNCTIONS = 30
+
+# Delay after the last keystroke before the result tables are searched, in milliseconds
+SEARCH_DEBOUNCE_MS = 200
+
 ASCENDING_ARROW = "\u2191"
 DESCENDING_ARROW = "\u2193"
\ No newline at end of file
@@ -0,0 +1,82 @@
+# utils/line_index.py
+
+import bisect
+
+class LineIndex:
+    """
+    LineIndex converts character offsets of a text into line and column positions.
+
+    The offsets of the line starts are computed once, so each conversion is a binary
+    search. Text widgets can then be given "line.column" indices, which Tk resolves
+    directly, instead of "1.0+Nc" indices that it resolves by counting characters from
+    the start of the buffer.
+    """
+    def __init__(self, text):
+        """
+        Builds the index of the line starts of a text.
+
+        Args:
+            text (str): The indexed text.
+        """
+        line_starts = [0]
+        position = text.find('\n')
+        while position != -1:
+            line_starts.append(position + 1)
+            position = text.find('\n', position + 1)
+        self.line_starts = line_starts
+        self.length = len(text)
+
+    def line_count(self):
+        """
+        Returns the number of lines of the text.
+
+        Returns:
+            int: Number of lines, counting the (possibly empty) line after the last newline.
+        """
+        return len(self.line_starts)
+
+    def position(self, offset):
+        """
+        Converts a character offset into a line and column.
+
+        Args:
+            offset (int): Character offset in the text.
+
+        Returns:
+            tuple: (line, column) with lines numbered from 1 and columns from 0, like Tk.
+        """
+        line = bisect.bisect_right(self.line_starts, offset) - 1
+        return line + 1, offset - self.line_starts[line]
+
+    def tk_index(self, offset):
+        """
+        Converts a character offset into a Tk text index.
+
+        Args:
+            offset (int): Character offset in the text.
+
+        Returns:
+            str: Index in the "line.column" form.
+        """
+        line, column = self.position(offset)
+        return f"{line}.{column}"
+
+    def chunk_end(self, start, max_chars):
+        """
+        Finds the end of a chunk of at most max_chars characters starting at an offset.
+
+        The chunk ends at the last line start within max_chars characters, so chunks stay aligned
+        to lines. A line longer than max_chars is split across chunks instead, mid-line.
+
+        Args:
+            start (int): Character offset of the start of the chunk.
+            max_chars (int): Maximum number of characters of the chunk.
+
+        Returns:
+            int: Offset after the last character of the chunk.
+        """
+        limit = start + max_chars
+        if limit >= self.length:
+            return self.length
+        line_start = self.line_starts[bisect.bisect_right(self.line_starts, limit) - 1]
+        return line_start if line_start > start else limit
@@ -0,0 +1,243 @@
+# utils/stage_timer.py
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from utils.constants import PROFILE_TOP_FUNCTIONS
+
+# Profilers that can be run around a stage
+PROFILERS = ('cprofile', 'tracemalloc')
+
+def cpu_time():
+    """
+    Returns the CPU time used by the process and by its finished child processes (e.g. scoring workers).
+
+    Returns:
+        float: User and system CPU time, in seconds.
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def report_path(output_file):
+    """
+    Builds the path of the timing report written next to an output file.
+
+    Args:
+        output_file (str): Path to the output file of the run.
+
+    Returns:
+        str: The report path, e.g. "results_timings.json" for "results.xlsx".
+    """
+    return f"{os.path.splitext(output_file)[0]}_timings.json"
+
+class StageTimer:
+    """
+    StageTimer records the wall time, CPU time and item count of each stage of a run.
+
+    A stage is timed with the stage() context manager, or item by item with timed() for
+    a stream consumed by another stage (e.g. the files read while the pairs are scored).
+    Stages can be nested: the time of an inner stage is only counted in that stage, so
+    the stages add up to the time of the run. A stage timed several times accumulates.
+
+    Optionally, the selected stages run under cProfile (keeping the functions with the
+    highest cumulative time) or tracemalloc (keeping the peak memory allocated). Stages
+    nested in a profiled stage are not profiled on their own.
+    """
+    def __init__(self, profiler=None, profile_stages=None):
+        """
+        Initializes an empty StageTimer.
+
+        Args:
+            profiler (str, optional): "cprofile" or "tracemalloc" to profile stages. Default is None (no profiling).
+            profile_stages (iterable, optional): Names of the stages to profile. Default is None (every stage).
+
+        Raises:
+            ValueError: If the profiler is unknown.
+        """
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler: {profiler}")
+        self.profiler = profiler
+        self.profile_stages = None if profile_stages is None else set(profile_stages)
+        # Records of the stages, in the order they were first entered
+        self.stages = {}
+        # [wall, cpu] spent in inner stages, for each stage being timed
+        self.active = []
+        self.profiles = {}
+        self.profiling = False
+
+    def record(self, name):
+        """
+        Returns the record of a stage, creating it if needed.
+
+        Args:
+            name (str): Name of the stage.
+
+        Returns:
+            dict: The record, with "wall_seconds", "cpu_seconds", "items" and "calls".
+        """
+        if name not in self.stages:
+            self.stages[name] = {"wall_seconds": 0.0, "cpu_seconds": 0.0, "items": 0, "calls": 0}
+        return self.stages[name]
+
+    def count(self, name, items):
+        """
+        Adds processed items to a stage.
+
+        Args:
+            name (str): Name of the stage.
+            items (int): Number of items.
+        """
+        self.record(name)["items"] += items
+
+    @contextmanager
+    def stage(self, name, items=0):
+        """
+        Times a block of code as a stage.
+
+        Args:
+            name (str): Name of the stage.
+            items (int, optional): Number of items processed by the block. More can be added with count().
+
+        Yields:
+            dict: The record of the stage.
+        """
+        record = self.record(name)
+        record["items"] += items
+        record["calls"] += 1
+        profile = self.profiler is not None and not self.profiling and (self.profile_stages is None or name in self.profile_stages)
+        if profile:
+            self.start_profile(name)
+        self.active.append([0.0, 0.0])
+        start_wall, start_cpu = time.perf_counter(), cpu_time()
+        try:
+            yield record
+        finally:
+            wall, cpu = time.perf_counter() - start_wall, cpu_time() - start_cpu
+            inner_wall, inner_cpu = self.active.pop()
+            if profile:
+                self.stop_profile(name)
+            record["wall_seconds"] += wall - inner_wall
+            record["cpu_seconds"] += cpu - inner_cpu
+            if self.active:
+                self.active[-1][0] += wall
+                self.active[-1][1] += cpu
+
+    def timed(self, name, iterable):
+        """
+        Streams the items of an iterable, timing the production of each item as a stage.
+        The time spent by the consumer between two items is not counted.
+
+        Args:
+            name (str): Name of the stage.
+            iterable (iterable): The items to stream.
+
+        Yields:
+            object: Each item of the iterable.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                self.count(name, 1)
+            yield item
+
+    def start_profile(self, name):
+        """
+        Starts the profiler for a stage.
+
+        Args:
+            name (str): Name of the stage.
+        """
+        self.profiling = True
+        if self.profiler == 'cprofile':
+            self.profiles.setdefault(name, cProfile.Profile()).enable()
+        else:
+            tracemalloc.start()
+
+    def stop_profile(self, name):
+        """
+        Stops the profiler of a stage and keeps its results.
+
+        Args:
+            name (str): Name of the stage.
+        """
+        self.profiling = False
+        if self.profiler == 'cprofile':
+            self.profiles[name].disable()
+        else:
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+            self.profiles[name] = max(peak, self.profiles.get(name, 0.0))
+
+    def profile_text(self, name):
+        """
+        Formats the functions with the highest cumulative time of a stage profiled with cProfile.
+
+        Args:
+            name (str): Name of the stage.
+
+        Returns:
+            str: The pstats listing of the PROFILE_TOP_FUNCTIONS functions.
+        """
+        output = io.StringIO()
+        pstats.Stats(self.profiles[name], stream=output).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+        return output.getvalue()
+
+    def as_dict(self):
+        """
+        Returns the timings as a JSON-serializable dictionary.
+
+        Returns:
+            dict: "stages" (one entry per stage, with its name, times, items and profile results)
+                and "wall_seconds" (total time of the stages).
+        """
+        stages = []
+        for name, record in self.stages.items():
+            entry = dict(record, stage=name)
+            if name in self.profiles:
+                if self.profiler == 'cprofile':
+                    entry["profile"] = self.profile_text(name)
+                else:
+                    entry["peak_mb"] = self.profiles[name]
+            stages.append(entry)
+        return {"stages": stages, "wall_seconds": sum(record["wall_seconds"] for record in self.stages.values())}
+
+    def write_json(self, path):
+        """
+        Writes the timings to a JSON file.
+
+        Args:
+            path (str): Path to the JSON file.
+        """
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(self.as_dict(), report_file, indent=2)
+
+    def report(self, localization):
+        """
+        Builds a message with the time spent in each stage.
+
+        Args:
+            localization (object): Localization object for fetching the messages and stage names.
+
+        Returns:
+            str: Localized timing report, or an empty string if no stage was timed.
+        """
+        if not self.stages:
+            return ""
+        lines = [localization.get("timing_report")]
+        for name, record in self.stages.items():
+            lines.append(localization.get("timing_stage").format(
+                stage=localization.get(f"stage_{name}"), wall=record["wall_seconds"],
+                cpu=record["cpu_seconds"], items=record["items"]
+            ))
+            if self.profiler == 'tracemalloc' and name in self.profiles:
+                lines[-1] += localization.get("timing_peak_memory").format(peak=self.profiles[name])
+        return "\n".join(lines)
@@ -0,0 +1,113 @@
+# utils/table_index.py
+
+import numpy as np
+import pandas as pd
+
+# Separates the cells of a row in the search keys, so a query never matches across two cells
+CELL_SEPARATOR = "\n"
+
+class TableSearchIndex:
+    """
+    TableSearchIndex answers substring searches over the rows of a DataFrame.
+
+    Every row is turned once into a lowercase search key holding all its cells, so a
+    search is a single vectorized substring test instead of converting every cell on
+    every keystroke. When a query extends the previous one, only the rows that matched
+    the previous query are tested again.
+    """
+    def __init__(self, data):
+        """
+        Builds the search keys of a DataFrame.
+
+        Args:
+            data (pd.DataFrame): The rows to search. Empty (NaN) cells never match.
+        """
+        self.data = data
+        cells = [
+            data[column].astype(object).where(data[column].notna(), "").astype(str).str.lower()
+            for column in data.columns
+        ]
+        keys = cells[0] if cells else pd.Series([""] * len(data), dtype=object)
+        for column in cells[1:]:
+            keys = keys + CELL_SEPARATOR + column
+        self.keys = keys.to_numpy(dtype=object)
+        self.last_query = ""
+        self.last_positions = np.arange(len(data))
+
+    def search(self, query):
+        """
+        Finds the positions of the rows having a cell that contains the query, ignoring case.
+
+        Args:
+            query (str): The text to look for.
+
+        Returns:
+            np.ndarray: Positions of the matching rows, in the order of the DataFrame.
+        """
+        query = query.lower()
+        if not query:
+            positions = np.arange(len(self.keys))
+        else:
+            # A longer query can only match rows that matched its prefix
+            candidates = self.last_positions if self.last_query and query.startswith(self.last_query) else np.arange(len(self.keys))
+            matches = pd.Series(self.keys[candidates], dtype=object).str.contains(query, regex=False).to_numpy(dtype=bool)
+            positions = candidates[matches]
+        self.last_query, self.last_positions = query, positions
+        return positions
+
+class TableSortIndex:
+    """
+    TableSortIndex keeps the sort order of each column of a DataFrame.
+
+    The stable argsort of a column is computed the first time the column is sorted and
+    reused afterwards, in both directions. Sorting a filtered view keeps the rows of the
+    cached order that are in the filter, which is linear instead of a new sort.
+    """
+    def __init__(self, data):
+        """
+        Initializes the index. No column is sorted until it is requested.
+
+        Args:
+            data (pd.DataFrame): The rows to sort.
+        """
+        self.data = data
+        # Column name -> (ascending permutation with empty cells last, number of non-empty cells)
+        self.permutations = {}
+
+    def permutation(self, column):
+        """
+        Returns the cached ascending order of a column, computing it on first use.
+
+        Args:
+            column (str): Name of the column.
+
+        Returns:
+            tuple: (positions, count) where positions sorts the rows ascending with empty (NaN) cells last
+                and count is the number of non-empty cells.
+        """
+        if column not in self.permutations:
+            values = self.data[column].reset_index(drop=True)
+            positions = values.sort_values(kind='stable', na_position='last').index.to_numpy()
+            self.permutations[column] = (positions, int(values.notna().sum()))
+        return self.permutations[column]
+
+    def order(self, column, ascending=True, positions=None):
+        """
+        Sorts rows by a column. Empty cells stay last in both directions, like DataFrame.sort_values.
+
+        Args:
+            column (str): Name of the column.
+            ascending (bool, optional): Sort direction. Default is True.
+            positions (np.ndarray, optional): Positions of the rows to sort, e.g. a search result. Default is all rows.
+
+        Returns:
+            np.ndarray: The row positions in sorted order.
+        """
+        permutation, count = self.permutation(column)
+        if not ascending:
+            permutation = np.concatenate((permutation[:count][::-1], permutation[count:]))
+        if positions is None:
+            return permutation
+        selected = np.zeros(len(self.data), dtype=bool)
+        selected[positions] = True
+        return permutation[selected[permutation]]
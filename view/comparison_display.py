@@ -2,15 +2,17 @@
 
 import customtkinter as ctk
 from tkinter import ttk
-import difflib
 import os
+import queue
+import threading
+from view.lazy_text import LazyTextLoader
 
 class ComparisonDisplayWindow(ctk.CTkToplevel):
     """
     A window for displaying the content of two files side by side, allowing comparison.
 
     This class creates a pop-up window that loads the content of two files and highlights
-    similar sections between them using difflib for text comparison.
+    similar sections between them using the match blocks of the controller.
     """
     def __init__(self, parent, file1, file2, controller):
         """
@@ -67,8 +69,8 @@ class ComparisonDisplayWindow(ctk.CTkToplevel):
         text1_widget = ctk.CTkTextbox(text1_frame, wrap="none")
         text1_widget.pack(side="left", fill="both", expand=True)
         content1 = self.controller.get_file_content(self.file1)
-        text1_widget.insert("1.0", content1)
-        text1_widget.configure(state="disabled")  # Make it read-only
+        self.loader1 = LazyTextLoader(text1_widget, content1)  # Read-only, large files are loaded in chunks
+        self.loader1.start()
 
         # Set font based on file type for file 1
         self.set_programming_font(text1_widget, self.file1)
@@ -89,8 +91,8 @@ class ComparisonDisplayWindow(ctk.CTkToplevel):
         text2_widget = ctk.CTkTextbox(text2_frame, wrap="none")
         text2_widget.pack(side="left", fill="both", expand=True)
         content2 = self.controller.get_file_content(self.file2)
-        text2_widget.insert("1.0", content2)
-        text2_widget.configure(state="disabled")  # Make it read-only
+        self.loader2 = LazyTextLoader(text2_widget, content2)  # Read-only, large files are loaded in chunks
+        self.loader2.start()
 
         # Set font based on file type for file 2
         self.set_programming_font(text2_widget, self.file2)
@@ -111,8 +113,11 @@ class ComparisonDisplayWindow(ctk.CTkToplevel):
         text1_widget.configure(xscrollcommand=lambda *args: sync_scrollbar_horizontal.set(*args))
         text2_widget.configure(xscrollcommand=lambda *args: sync_scrollbar_horizontal.set(*args))
 
-        # Highlight the similarities between the two text contents
-        self.highlight_similarities(text1_widget, text2_widget, content1, content2)
+        # Compute the match blocks off the UI thread and highlight them once they are ready
+        self.block_queue = queue.Queue()
+        self.configure(cursor="watch")
+        threading.Thread(target=self.compute_match_blocks, daemon=True).start()
+        self.after(50, self.poll_match_blocks, text1_widget, text2_widget)
 
     def set_programming_font(self, widget, filepath):
         """
@@ -153,25 +158,51 @@ class ComparisonDisplayWindow(ctk.CTkToplevel):
         text1_widget.xview(*args)
         text2_widget.xview(*args)
 
-    def highlight_similarities(self, text1_widget, text2_widget, text1, text2):
+    def compute_match_blocks(self):
         """
-        Highlights the similar text segments between the two files using difflib.
+        Retrieves the match blocks of the two files from the controller. Runs in a background thread
+        and hands the blocks (or None on failure) to the UI thread through the block queue.
+        """
+        try:
+            blocks = self.controller.get_match_blocks(self.file1, self.file2)
+        except Exception:
+            blocks = None
+        self.block_queue.put(blocks)
+
+    def poll_match_blocks(self, text1_widget, text2_widget):
+        """
+        Checks whether the background computation of the match blocks has finished,
+        and highlights them if so. Otherwise, checks again a little later.
 
         Args:
             text1_widget (CTkTextbox): The text widget for file 1.
             text2_widget (CTkTextbox): The text widget for file 2.
-            text1 (str): The content of file 1.
-            text2 (str): The content of file 2.
         """
-        sequence_matcher = difflib.SequenceMatcher(None, text1, text2)
-
-        for match in sequence_matcher.get_matching_blocks():
-            start1, start2, length = match
-            if length > 0:
-                # Highlight in file 1 with color #4B5632
-                text1_widget.tag_add("highlight", f"1.0+{start1}c", f"1.0+{start1+length}c")
-                text1_widget.tag_config("highlight", background="#4B5632", foreground="white")
+        if not self.winfo_exists():
+            return
+        try:
+            blocks = self.block_queue.get_nowait()
+        except queue.Empty:
+            self.after(50, self.poll_match_blocks, text1_widget, text2_widget)
+            return
+
+        self.configure(cursor="")
+        if blocks:
+            self.highlight_similarities(text1_widget, text2_widget, blocks)
+
+    def highlight_similarities(self, text1_widget, text2_widget, blocks):
+        """
+        Highlights the similar text segments between the two files.
+        The match blocks are provided by the controller, which reuses those of the similarity
+        engine when available. The blocks are tagged in batches, each text widget getting its
+        ranges as soon as the text they cover is loaded.
 
-                # Highlight in file 2 with the same color
-                text2_widget.tag_add("highlight", f"1.0+{start2}c", f"1.0+{start2+length}c")
-                text2_widget.tag_config("highlight", background="#4B5632", foreground="white")
+        Args:
+            text1_widget (CTkTextbox): The text widget for file 1.
+            text2_widget (CTkTextbox): The text widget for file 2.
+            blocks (list): Matched spans (start1, end1, start2, end2) in character offsets.
+        """
+        text1_widget.tag_config("highlight", background="#4B5632", foreground="white")
+        text2_widget.tag_config("highlight", background="#4B5632", foreground="white")
+        self.loader1.add_tag("highlight", [(start1, end1) for start1, end1, _, _ in blocks])
+        self.loader2.add_tag("highlight", [(start2, end2) for _, _, start2, end2 in blocks])
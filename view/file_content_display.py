@@ -3,6 +3,7 @@
 import customtkinter as ctk
 from tkinter import ttk
 import os
+from view.lazy_text import LazyTextLoader
 
 class FileContentDisplayWindow(ctk.CTkToplevel):
     """
@@ -72,8 +73,9 @@ class FileContentDisplayWindow(ctk.CTkToplevel):
         # Text widget for displaying the file content in a non-editable manner
         text_widget = ctk.CTkTextbox(text_frame, wrap="none")
         text_widget.pack(side="left", fill="both", expand=True)
-        text_widget.insert("1.0", self.content)
-        text_widget.configure(state="disabled")
+        # Read-only; large files are loaded in chunks so the window opens immediately
+        self.loader = LazyTextLoader(text_widget, self.content)
+        self.loader.start()
 
         # Set the appropriate font based on the file type
         self.set_programming_font(text_widget, self.file_name)
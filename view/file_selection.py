@@ -4,7 +4,8 @@ import threading
 import time
 import customtkinter as ctk
 from tkinter import filedialog
-from utils.constants import THRESHOLD_DEFAULT, MAX_REDUCTION_DEFAULT
+from utils.constants import THRESHOLD_DEFAULT, MAX_REDUCTION_DEFAULT, ENGINE_DEFAULT
+from model.similarity_engines import ENGINES
 import os
 
 class FileSelectionFrame(ctk.CTkFrame):
@@ -67,6 +68,36 @@ class FileSelectionFrame(ctk.CTkFrame):
         self.output_button = ctk.CTkButton(self.frame, text=self.main_window.localization.get("browse_button"), command=self.browse_output_location)
         self.output_button.grid(row=3, column=2, padx=5, pady=5, sticky="e")
 
+        # Optional MinHash/LSH candidate stage
+        self.candidate_var = ctk.BooleanVar(value=False)
+        self.candidate_checkbox = ctk.CTkCheckBox(self.frame, text=self.main_window.localization.get("candidate_stage_label"), variable=self.candidate_var)
+        self.candidate_checkbox.grid(row=4, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+
+        # Similarity engine used to score the file pairs
+        self.engine_label = ctk.CTkLabel(self.frame, text=self.main_window.localization.get("engine_label"))
+        self.engine_label.grid(row=5, column=0, padx=5, pady=5, sticky="w")
+        self.selected_engine = ENGINE_DEFAULT
+        self.engine_var = ctk.StringVar(value=self.main_window.localization.get(f"engine_{ENGINE_DEFAULT}"))
+        self.engine_dropdown = ctk.CTkOptionMenu(
+            self.frame,
+            variable=self.engine_var,
+            values=[self.main_window.localization.get(f"engine_{name}") for name in ENGINES],
+            command=self.select_engine
+        )
+        self.engine_dropdown.grid(row=5, column=1, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        # Number of worker processes used to score the file pairs
+        self.workers_label = ctk.CTkLabel(self.frame, text=self.main_window.localization.get("workers_label"))
+        self.workers_label.grid(row=6, column=0, padx=5, pady=5, sticky="w")
+        self.workers_entry = ctk.CTkEntry(self.frame, placeholder_text=self.main_window.localization.get("workers_placeholder"))
+        self.workers_entry.grid(row=6, column=1, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        # Minimum similarity worth an exact score, supported by the sequence engine
+        self.report_floor_label = ctk.CTkLabel(self.frame, text=self.main_window.localization.get("report_floor_label"))
+        self.report_floor_label.grid(row=7, column=0, padx=5, pady=5, sticky="w")
+        self.report_floor_entry = ctk.CTkEntry(self.frame, placeholder_text=self.main_window.localization.get("report_floor_placeholder"))
+        self.report_floor_entry.grid(row=7, column=1, columnspan=2, padx=5, pady=5, sticky="ew")
+
     def update_ui_text(self, localization):
         """
         Update the text of all UI elements when the language changes.
@@ -84,6 +115,25 @@ class FileSelectionFrame(ctk.CTkFrame):
         self.output_label.configure(text=localization.get("select_output"))
         self.output_entry.configure(placeholder_text=localization.get("output_placeholder"))
         self.output_button.configure(text=localization.get("browse_button"))
+        self.candidate_checkbox.configure(text=localization.get("candidate_stage_label"))
+        self.engine_label.configure(text=localization.get("engine_label"))
+        self.workers_label.configure(text=localization.get("workers_label"))
+        self.workers_entry.configure(placeholder_text=localization.get("workers_placeholder"))
+        self.report_floor_label.configure(text=localization.get("report_floor_label"))
+        self.report_floor_entry.configure(placeholder_text=localization.get("report_floor_placeholder"))
+        self.engine_dropdown.configure(values=[localization.get(f"engine_{name}") for name in ENGINES])
+        self.engine_var.set(localization.get(f"engine_{self.selected_engine}"))
+
+    def select_engine(self, selected_label):
+        """
+        Stores the name of the similarity engine chosen in the dropdown.
+
+        Args:
+            selected_label (str): The localized engine label selected in the dropdown.
+        """
+        for name in ENGINES:
+            if self.main_window.localization.get(f"engine_{name}") == selected_label:
+                self.selected_engine = name
 
     def browse_files(self):
         """
@@ -131,18 +181,27 @@ class FileSelectionFrame(ctk.CTkFrame):
 
                 threshold_value = self.threshold_entry.get()
                 reduction_value = self.max_reduction_entry.get()
+                use_candidates = self.candidate_var.get()
+                engine = self.selected_engine
+                workers_value = self.workers_entry.get()
+                report_floor_value = self.report_floor_entry.get()
+                self.main_window.result_frame.show_timings(None)
 
                 # Panggil controller untuk memproses logika plagiarisme
-                result, error = self.controller.run_plagiarism_process(files, threshold_value, reduction_value, output_file)
+                result, error = self.controller.run_plagiarism_process(files, threshold_value, reduction_value, output_file, use_candidates, engine, workers_value, report_floor_value)
 
                 if error:
                     self.main_window.update_result(self.main_window.localization.get(error))
                     return
 
-                df_similarity, df_reduction, file_cluster_mapping = result
-                self.main_window.update_result(f"{self.main_window.localization.get('output_saved_successfully')} {output_file}")
+                similarity_matrix, df_reduction, file_cluster_mapping, stage_timer = result
+                message = f"{self.main_window.localization.get('output_saved_successfully')} {output_file}"
+                for report in (self.controller.get_pruning_report(), self.controller.get_cache_report()):
+                    if report:
+                        message = f"{message}\n{report}"
+                self.main_window.update_result(message)
 
-                self.main_window.result_frame.show_output_window(df_similarity, df_reduction, output_file, file_cluster_mapping)
+                self.main_window.result_frame.show_output_window(similarity_matrix, df_reduction, output_file, file_cluster_mapping, stage_timer)
 
             except Exception as e:
                 self.main_window.update_result(str(e))
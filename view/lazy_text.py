@@ -0,0 +1,81 @@
+# view/lazy_text.py
+
+from utils.constants import LAZY_RENDER_CHARS, LAZY_RENDER_CHUNK_CHARS, TAG_BATCH_SIZE
+from utils.line_index import LineIndex
+
+class LazyTextLoader:
+    """
+    LazyTextLoader fills a read-only text widget with a (possibly very large) text.
+
+    Texts up to LAZY_RENDER_CHARS characters are inserted at once. Larger texts are
+    inserted in chunks of at most LAZY_RENDER_CHUNK_CHARS characters scheduled with after(),
+    so the first screen is shown immediately and the rest is loaded without blocking the UI.
+    Chunks end at a line start where they can; a longer line is split across chunks. Tags given as character
+    offsets are converted with a LineIndex and applied in batches as soon as the text
+    they cover has been loaded.
+    """
+    def __init__(self, widget, text):
+        """
+        Initializes the loader.
+
+        Args:
+            widget (CTkTextbox): The text widget to fill. It is left disabled (read-only).
+            text (str): The text to display.
+        """
+        self.widget = widget
+        self.text = text
+        self.line_index = LineIndex(text)
+        self.chunk_chars = LAZY_RENDER_CHUNK_CHARS if len(text) > LAZY_RENDER_CHARS else max(len(text), 1)
+        self.loaded = 0
+        # Tag ranges waiting for their text to be loaded: (start, end, tag)
+        self.pending = []
+
+    def start(self):
+        """
+        Inserts the first chunk of the text and schedules the remaining chunks.
+        """
+        self.load_chunk()
+
+    def load_chunk(self):
+        """
+        Inserts the next chunk of the text, applies the tags it completes and schedules the next chunk.
+        """
+        if not self.widget.winfo_exists():
+            return
+        end = self.line_index.chunk_end(self.loaded, self.chunk_chars)
+        self.widget.configure(state="normal")
+        self.widget.insert("end", self.text[self.loaded:end])
+        self.widget.configure(state="disabled")
+        self.loaded = end
+        self.apply_pending()
+        if self.loaded < len(self.text):
+            self.widget.after(1, self.load_chunk)
+
+    def add_tag(self, tag, spans):
+        """
+        Tags character ranges of the text, now for the loaded part and later for the rest.
+
+        Args:
+            tag (str): Name of the tag.
+            spans (list): (start, end) character offsets to tag.
+        """
+        self.pending.extend((start, end, tag) for start, end in spans if end > start)
+        self.apply_pending()
+
+    def apply_pending(self):
+        """
+        Applies the pending tag ranges whose text is loaded, with one tag_add call per batch of ranges.
+        """
+        ready = [span for span in self.pending if span[1] <= self.loaded]
+        if not ready:
+            return
+        self.pending = [span for span in self.pending if span[1] > self.loaded]
+
+        indices_by_tag = {}
+        for start, end, tag in ready:
+            indices_by_tag.setdefault(tag, []).extend((self.line_index.tk_index(start), self.line_index.tk_index(end)))
+        # The tk.Text inside a CTkTextbox accepts many ranges per tag_add call
+        textbox = getattr(self.widget, "_textbox", self.widget)
+        for tag, indices in indices_by_tag.items():
+            for batch in range(0, len(indices), 2 * TAG_BATCH_SIZE):
+                textbox.tag_add(tag, *indices[batch:batch + 2 * TAG_BATCH_SIZE])
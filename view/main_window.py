@@ -25,7 +25,7 @@ class MainWindow(ctk.CTk):
 
         # Initialize UI window
         self.title(self.localization.get("app_title"))
-        self.geometry("510x350")
+        self.geometry("510x470")
         self.resizable(False, False)
         ctk.set_appearance_mode("Dark")
         ctk.set_default_color_theme("blue")
@@ -2,11 +2,12 @@
 
 import customtkinter as ctk
 from tkinter import ttk
-import pandas as pd
 import os
-from utils.constants import ASCENDING_ARROW, DESCENDING_ARROW
+from utils.constants import ASCENDING_ARROW, DESCENDING_ARROW, SEARCH_DEBOUNCE_MS
+from utils.table_index import TableSearchIndex, TableSortIndex
 from view.comparison_display import ComparisonDisplayWindow
 from view.file_content_display import FileContentDisplayWindow
+from view.virtual_table import VirtualTable
 
 class ResultsFrame(ctk.CTkFrame):
     """
@@ -22,6 +23,8 @@ class ResultsFrame(ctk.CTkFrame):
         """
         super().__init__(parent)
         self.parent = parent
+        # Scheduled (after id) debounced callbacks, keyed by widget
+        self.debounce_ids = {}
         self.setup_ui()
 
     def setup_ui(self):
@@ -31,6 +34,8 @@ class ResultsFrame(ctk.CTkFrame):
         """
         self.result_label = ctk.CTkLabel(self, text="", wraplength=500)
         self.result_label.pack(padx=5, pady=5)
+        # Time spent in each stage of the last run, shown once the results are saved
+        self.timing_label = ctk.CTkLabel(self, text="", wraplength=500, justify="left")
 
     def update_result(self, message):
         """
@@ -41,25 +46,45 @@ class ResultsFrame(ctk.CTkFrame):
         """
         self.result_label.configure(text=message)
 
-    def show_output_window(self, df_similarity, df_reduction, output_file, file_cluster_mapping):
+    def show_timings(self, stage_timer):
+        """
+        Shows the time spent in each stage of a run below the result message.
+
+        Args:
+            stage_timer (StageTimer): Timings of the run, or None to hide them.
+        """
+        report = stage_timer.report(self.parent.localization) if stage_timer is not None else ""
+        if report:
+            self.timing_label.configure(text=report)
+            self.timing_label.pack(padx=5, pady=5)
+        else:
+            self.timing_label.configure(text="")
+            self.timing_label.pack_forget()
+
+    def show_output_window(self, similarity_matrix, df_reduction, output_file, file_cluster_mapping, stage_timer=None):
         """
         Displays the results of the plagiarism check in a new window, including the similarity
         percentage and score deduction for each file pair. The results are displayed in two tables.
         
         Args:
-            df_similarity (pd.DataFrame): DataFrame containing the similarity percentage between file pairs.
+            similarity_matrix (SimilarityMatrix): Similarity percentage between file pairs.
             df_reduction (pd.DataFrame): DataFrame containing the score deduction for each file.
             output_file (str): The path to the output Excel file containing the results.
             file_cluster_mapping (dict): A dictionary mapping file names to cluster labels.
+            stage_timer (StageTimer, optional): Timings of the run, shown with the export once the results are saved.
         """
-        error = self.parent.controller.save_results_to_excel(df_similarity, df_reduction, output_file, file_cluster_mapping)
+        error = self.parent.controller.save_results_to_excel(similarity_matrix, df_reduction, output_file, file_cluster_mapping)
+        self.show_timings(stage_timer)
 
         if error:
             self.update_result(f"{self.parent.localization.get('error_saving_file')} {error}")
             return
 
+        # The localized similarity table is only built for display
+        df_similarity = similarity_matrix.to_frame(self.parent.localization, file_cluster_mapping)
+
         # Add "Cluster" column to df_reduction
-        df_reduction["Cluster"] = df_reduction["File Name"].apply(lambda file_name: file_cluster_mapping.get(os.path.basename(file_name), 'N/A'))
+        df_reduction["Cluster"] = df_reduction[self.parent.localization.get("file_name")].apply(lambda file_name: file_cluster_mapping.get(os.path.basename(file_name), 'N/A'))
 
         # Create a new window to display the results
         output_window = ctk.CTkToplevel(self)
@@ -91,13 +116,15 @@ class ResultsFrame(ctk.CTkFrame):
             self.parent.localization.get("file_2"),
             self.parent.localization.get("similarity_percent")
         ]
-        similarity_table = ttk.Treeview(similarity_frame, columns=similarity_columns, show='headings', height=8, yscrollcommand=similarity_scroll.set)
-
-        column_mapping = {
-            self.parent.localization.get("file_1"): "File 1",
-            self.parent.localization.get("file_2"): "File 2",
-            self.parent.localization.get("similarity_percent"): "Similarity (%)"
-        }
+        # Show the status column when the candidate stage skipped some pairs
+        if self.parent.localization.get("status") in df_similarity.columns:
+            similarity_columns.append(self.parent.localization.get("status"))
+        # Only the visible rows are materialized, so large results open and sort quickly
+        similarity_view = VirtualTable(similarity_frame, similarity_columns, similarity_scroll)
+        similarity_table = similarity_view.tree
+
+        # The similarity table columns are the localized headings
+        column_mapping = {col: col for col in similarity_columns}
         sort_states_similarity = {col: True for col in similarity_columns}
 
         style = ttk.Style()
@@ -119,18 +146,18 @@ class ResultsFrame(ctk.CTkFrame):
                         font=('Segoe UI', 14))
         style.map("Treeview.Heading", background=[('active', '#3484F0')])
 
-        similarity_scroll.configure(command=similarity_table.yview)
+        # Rows matching the current search (None for all rows) and the current sort (column, ascending)
+        similarity_state = {"positions": None, "sort": None}
+        similarity_sort_index = TableSortIndex(df_similarity)
 
-        def populate_similarity_table(data):
+        def populate_similarity_table():
             """
-            Populate the similarity table with data from the DataFrame.
-
-            Args:
-                data (pd.DataFrame): The DataFrame containing the similarity data
+            Populate the similarity table with the rows matching the current search, in the current sort order.
             """
-            similarity_table.delete(*similarity_table.get_children())  # Clear existing data
-            for index, row in data.iterrows():
-                similarity_table.insert('', 'end', values=list(row))
+            positions, sort = similarity_state["positions"], similarity_state["sort"]
+            if sort is not None:
+                positions = similarity_sort_index.order(sort[0], sort[1], positions)
+            similarity_view.set_data(df_similarity, positions)
 
         def sort_similarity_table(col):
             """
@@ -141,8 +168,8 @@ class ResultsFrame(ctk.CTkFrame):
             """
             internal_col = column_mapping[col]
             ascending = sort_states_similarity[col]
-            sorted_data = df_similarity.sort_values(by=[internal_col], ascending=ascending)
-            populate_similarity_table(sorted_data)
+            similarity_state["sort"] = (internal_col, ascending)
+            populate_similarity_table()
             
             for column in similarity_columns:
                 # Set header text with arrow for the sorted column
@@ -163,7 +190,9 @@ class ResultsFrame(ctk.CTkFrame):
                 similarity_table.column(col, anchor='center', width=150)
 
         # Populate the table with the full data initially
-        populate_similarity_table(df_similarity)
+        populate_similarity_table()
+
+        similarity_index = TableSearchIndex(df_similarity)
 
         def search_similarity_table(*args):
             """
@@ -172,17 +201,12 @@ class ResultsFrame(ctk.CTkFrame):
             Args:
                 *args: Additional arguments passed to the function.
             """
-            query = search_entry_similarity.get().lower()
-            if query == "":  # If the search box is empty, show all data
-                populate_similarity_table(df_similarity)
-            else:
-                filtered_data = df_similarity[
-                    df_similarity.apply(lambda row: any(query in str(val).lower() for val in row), axis=1)
-                ]
-                populate_similarity_table(filtered_data)
+            query = search_entry_similarity.get()
+            similarity_state["positions"] = similarity_index.search(query) if query else None
+            populate_similarity_table()
 
-        # Bind the search function to the search entry
-        search_entry_similarity.bind('<KeyRelease>', search_similarity_table)
+        # Bind the search function to the search entry, searching once typing pauses
+        search_entry_similarity.bind('<KeyRelease>', lambda event: self.debounce(search_entry_similarity, search_similarity_table))
 
         similarity_table.pack(fill="both", expand=True)
 
@@ -213,14 +237,13 @@ class ResultsFrame(ctk.CTkFrame):
         ]
 
         reduction_column_mapping = {
-            self.parent.localization.get("file_name"): "File Name",
-            self.parent.localization.get("score_reduction_percentage"): "Score Reduction Percentage (%)",
+            self.parent.localization.get("file_name"): self.parent.localization.get("file_name"),
+            self.parent.localization.get("score_reduction_percentage"): self.parent.localization.get("score_reduction_percentage"),
             self.parent.localization.get("cluster"): "Cluster"
         }
 
-        reduction_table = ttk.Treeview(reduction_frame, columns=reduction_columns, show='headings', height=8, yscrollcommand=reduction_scroll.set)
-
-        reduction_scroll.configure(command=reduction_table.yview)
+        reduction_view = VirtualTable(reduction_frame, reduction_columns, reduction_scroll)
+        reduction_table = reduction_view.tree
 
         sort_states_reduction = {col: True for col in reduction_columns}
 
@@ -228,16 +251,18 @@ class ResultsFrame(ctk.CTkFrame):
             reduction_table.heading(col, text=col, command=lambda _col=col: sort_reduction_table(_col))
             reduction_table.column(col, anchor='w' if col == self.parent.localization.get("file_name") else 'center', width=150)
 
-        def populate_reduction_table(data):
-            """
-            Populate the score deduction table with data from the DataFrame.
+        # Rows matching the current search (None for all rows) and the current sort (column, ascending)
+        reduction_state = {"positions": None, "sort": None}
+        reduction_sort_index = TableSortIndex(df_reduction)
 
-            Args:
-                data (pd.DataFrame): The DataFrame containing the score deduction data
+        def populate_reduction_table():
             """
-            reduction_table.delete(*reduction_table.get_children())
-            for index, row in data.iterrows():
-                reduction_table.insert('', 'end', values=list(row))
+            Populate the score deduction table with the rows matching the current search, in the current sort order.
+            """
+            positions, sort = reduction_state["positions"], reduction_state["sort"]
+            if sort is not None:
+                positions = reduction_sort_index.order(sort[0], sort[1], positions)
+            reduction_view.set_data(df_reduction, positions)
 
         def sort_reduction_table(col):
             """
@@ -248,8 +273,8 @@ class ResultsFrame(ctk.CTkFrame):
             """
             internal_col = reduction_column_mapping[col]
             ascending = sort_states_reduction[col]
-            sorted_data = df_reduction.sort_values(by=[internal_col], ascending=ascending)
-            populate_reduction_table(sorted_data)
+            reduction_state["sort"] = (internal_col, ascending)
+            populate_reduction_table()
 
             for column in reduction_columns:
                 # Set header text with arrow for the sorted column
@@ -262,7 +287,9 @@ class ResultsFrame(ctk.CTkFrame):
             sort_states_reduction[col] = not ascending
 
         # Populate the table with the full data initially
-        populate_reduction_table(df_reduction)
+        populate_reduction_table()
+
+        reduction_index = TableSearchIndex(df_reduction)
 
         # Function to filter data based on search query in reduction table
         def search_reduction_table(*args):
@@ -272,23 +299,31 @@ class ResultsFrame(ctk.CTkFrame):
             Args:
                 *args: Additional arguments passed to the function.
             """
-            query = search_entry_reduction.get().lower()
-            if query == "":  # If the search box is empty, show all data
-                populate_reduction_table(df_reduction)
-            else:
-                filtered_data = df_reduction[
-                    df_reduction.apply(lambda row: any(query in str(val).lower() for val in row), axis=1)
-                ]
-                populate_reduction_table(filtered_data)
+            query = search_entry_reduction.get()
+            reduction_state["positions"] = reduction_index.search(query) if query else None
+            populate_reduction_table()
 
-        # Bind the search function to the search entry
-        search_entry_reduction.bind('<KeyRelease>', search_reduction_table)
+        # Bind the search function to the search entry, searching once typing pauses
+        search_entry_reduction.bind('<KeyRelease>', lambda event: self.debounce(search_entry_reduction, search_reduction_table))
         reduction_table.pack(fill="both", expand=True)
 
         # Double click event to display text comparison
         similarity_table.bind("<Double-1>", lambda event: self.open_comparison_window(event))
         reduction_table.bind("<Double-1>", lambda event: self.open_file_content_window(event))
 
+    def debounce(self, widget, callback):
+        """
+        Runs a callback once no new call was made for the same widget during SEARCH_DEBOUNCE_MS milliseconds.
+
+        Args:
+            widget (ctk.CTkBaseClass): The widget whose events are debounced, also used to schedule the callback.
+            callback (callable): The function to run.
+        """
+        pending = self.debounce_ids.pop(widget, None)
+        if pending is not None:
+            widget.after_cancel(pending)
+        self.debounce_ids[widget] = widget.after(SEARCH_DEBOUNCE_MS, lambda: (self.debounce_ids.pop(widget, None), callback()))
+
     def open_comparison_window(self, event):
         """
         Opens a new window to display the comparison between two files when a row is double-clicked.
@@ -320,7 +355,7 @@ class ResultsFrame(ctk.CTkFrame):
 
         # Get the file name from the selected row
         item = event.widget.item(selected_item)
-        file_name = item['values'][0]  # Assuming "File Name" is in the first column
+        file_name = item['values'][0]  # The file name is in the first column
 
         # Get the file content from the controller
         try:
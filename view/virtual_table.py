@@ -0,0 +1,188 @@
+# view/virtual_table.py
+
+import numpy as np
+import pandas as pd
+from tkinter import ttk
+
+class VirtualTable:
+    """
+    VirtualTable displays a DataFrame in a ttk.Treeview without inserting every row.
+
+    Only as many Treeview items as fit in the widget are created, and scrolling rewrites
+    their values with the matching slice of the DataFrame. The rows are displayed through
+    an order of row positions, so sorted or filtered views never copy the DataFrame. The
+    scrollbar is driven by the position in that order, so memory use and redraw time
+    depend on the height of the widget rather than on the number of rows.
+    """
+    def __init__(self, parent, columns, scrollbar, rowheight=35):
+        """
+        Creates the Treeview and connects it to the scrollbar.
+
+        Args:
+            parent (ctk.CTkFrame): The frame holding the table.
+            columns (list): Column headings of the table.
+            scrollbar (ctk.CTkScrollbar): Vertical scrollbar controlling the table.
+            rowheight (int, optional): Height of a row in pixels, as configured in the Treeview style. Default is 35.
+        """
+        self.tree = ttk.Treeview(parent, columns=columns, show='headings', height=8)
+        self.scrollbar = scrollbar
+        self.rowheight = rowheight
+        self.data = pd.DataFrame()
+        self.order = np.arange(0)
+        self.offset = 0
+        self.visible_rows = 8
+        self.items = []
+        # Row of the DataFrame that is selected, kept while it is scrolled out of view
+        self.selected_row = None
+        self.restoring_selection = False
+
+        scrollbar.configure(command=self.on_scroll)
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", self.on_mousewheel)
+        self.tree.bind("<Button-5>", self.on_mousewheel)
+        self.tree.bind("<Up>", lambda event: self.on_arrow_key(-1))
+        self.tree.bind("<Down>", lambda event: self.on_arrow_key(1))
+        self.tree.bind("<Prior>", lambda event: self.scroll_to(self.offset - self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.scroll_to(self.offset + self.visible_rows))
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+
+    def set_data(self, data, order=None):
+        """
+        Replaces the displayed rows, e.g. after sorting or filtering, and scrolls back to the top.
+
+        Args:
+            data (pd.DataFrame): The rows to display.
+            order (np.ndarray, optional): Positions of the rows of data to display, in display order. Default is all rows.
+        """
+        self.data = data
+        self.order = np.arange(len(data)) if order is None else order
+        self.offset = 0
+        self.selected_row = None
+        self.refresh()
+
+    def refresh(self):
+        """
+        Writes the visible slice of the DataFrame into the Treeview items and updates the scrollbar.
+        """
+        rows = [
+            ['' if pd.isna(value) else value for value in row]
+            for row in self.data.iloc[self.order[self.offset:self.offset + self.visible_rows]].itertuples(index=False)
+        ]
+        while len(self.items) < len(rows):
+            self.items.append(self.tree.insert('', 'end'))
+        while len(self.items) > len(rows):
+            self.tree.delete(self.items.pop())
+        for item, values in zip(self.items, rows):
+            self.tree.item(item, values=values)
+
+        # Keep the selection on the same DataFrame row, not on the same Treeview item
+        self.restoring_selection = True
+        if self.selected_row is not None and 0 <= self.selected_row - self.offset < len(self.items):
+            self.tree.selection_set(self.items[self.selected_row - self.offset])
+        else:
+            self.tree.selection_set(())
+        self.tree.after_idle(self.end_restoring_selection)
+
+        total = len(self.order)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def end_restoring_selection(self):
+        """
+        Re-enables the selection tracking once the selection events caused by refresh() are handled.
+        """
+        self.restoring_selection = False
+
+    def scroll_to(self, offset):
+        """
+        Shows the rows starting at the given offset.
+
+        Args:
+            offset (int): Index of the first visible row, clamped to the valid range.
+
+        Returns:
+            str: "break", to stop the default Treeview handling of the event that triggered the scroll.
+        """
+        offset = max(0, min(int(offset), len(self.order) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+        return "break"
+
+    def on_scroll(self, *args):
+        """
+        Handles the scrollbar commands ("moveto", fraction) and ("scroll", count, "units" or "pages").
+
+        Args:
+            *args: Arguments of the scrollbar command.
+        """
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.order))
+        elif args[0] == "scroll":
+            step = self.visible_rows if len(args) > 2 and args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(float(args[1])) * step)
+
+    def on_mousewheel(self, event):
+        """
+        Scrolls the table with the mouse wheel.
+
+        Args:
+            event (tk.Event): The mouse wheel event.
+
+        Returns:
+            str: "break", to stop the default Treeview scrolling.
+        """
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            return self.scroll_to(self.offset - 3)
+        return self.scroll_to(self.offset + 3)
+
+    def on_arrow_key(self, step):
+        """
+        Moves the selection one row up or down, scrolling when it leaves the visible rows.
+
+        Args:
+            step (int): -1 to move up, 1 to move down.
+
+        Returns:
+            str: "break", to stop the default Treeview handling of the key.
+        """
+        if not len(self.order):
+            return "break"
+        row = 0 if self.selected_row is None else max(0, min(self.selected_row + step, len(self.order) - 1))
+        self.selected_row = row
+        if row < self.offset:
+            self.offset = row
+        elif row >= self.offset + self.visible_rows:
+            self.offset = row - self.visible_rows + 1
+        self.refresh()
+        return "break"
+
+    def on_resize(self, event):
+        """
+        Adapts the number of Treeview items to the height of the widget.
+
+        Args:
+            event (tk.Event): The configure event.
+        """
+        # One row height is taken by the headings
+        visible_rows = max(1, event.height // self.rowheight - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.offset = max(0, min(self.offset, len(self.order) - visible_rows))
+            self.refresh()
+
+    def on_select(self, event):
+        """
+        Records which DataFrame row the user selected.
+
+        Args:
+            event (tk.Event): The selection event.
+        """
+        if self.restoring_selection:
+            return
+        selection = self.tree.selection()
+        if selection and selection[0] in self.items:
+            self.selected_row = self.offset + self.items.index(selection[0])